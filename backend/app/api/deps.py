@@ -1,14 +1,23 @@
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.db import session as db_session
 from app.db.session import SessionLocal # Assuming you created this
 from app.models.base import User
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import SECRET_KEY, ALGORITHM
 from app.schemas.auth import TokenPayload
 import uuid
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 def get_db():
     db = SessionLocal()
@@ -17,30 +26,130 @@ def get_db():
     finally:
         db.close()
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
-    credentials_exception = HTTPException(
+async def get_async_db():
+    # Only available when settings.DB_ASYNC is on
+    async with db_session.AsyncSessionLocal() as db:
+        yield db
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_token_subject(token: str, token_type: str = "access") -> uuid.UUID:
+    # Signature, expiry and type are checked on every call, cached or not
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("type") != token_type:
+            raise credentials_exception()
         user_id_str: str = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
-        
+            raise credentials_exception()
+
         # Convert string to UUID object to match DB type
         try:
-            user_uuid = uuid.UUID(user_id_str)
+            return uuid.UUID(user_id_str)
         except ValueError:
-            raise credentials_exception
-            
+            raise credentials_exception()
+
     except JWTError:
-        raise credentials_exception
-    
+        raise credentials_exception()
+
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+    user_uuid = decode_token_subject(token)
+
     # Query using the UUID object
     user = db.query(User).filter(User.id == user_uuid).first()
-    
+
     if user is None:
-        raise credentials_exception
-    return user
\ No newline at end of file
+        raise credentials_exception()
+    return user
+
+
+# --- CACHED PRINCIPAL ---
+# Most endpoints only need to know who is calling and which company they
+# belong to. The principal is a detached snapshot of those fields, cached per
+# token subject so authenticated calls don't query the users table each time.
+
+@dataclass(frozen=True)
+class Principal:
+    id: uuid.UUID
+    company_id: uuid.UUID
+    role: str
+    team_id: Optional[uuid.UUID] = None
+
+principal_cache = TTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+def invalidate_principals(*user_ids):
+    """Call after changing a user's team, role or company."""
+    principal_cache.delete(*user_ids)
+
+def principal_columns():
+    return select(User.id, User.company_id, User.role, User.team_id)
+
+def cache_principal(user_uuid: uuid.UUID, row) -> Principal:
+    if row is None:
+        raise credentials_exception()
+
+    principal = Principal(
+        id=row.id,
+        company_id=row.company_id,
+        role=row.role.value if hasattr(row.role, 'value') else str(row.role),
+        team_id=row.team_id
+    )
+    principal_cache.set(user_uuid, principal)
+    return principal
+
+def get_current_principal(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    user_uuid = decode_token_subject(token)
+
+    principal = principal_cache.get(user_uuid)
+    if principal is not None:
+        return principal
+
+    # Cache miss: load only the columns we keep (the session is shared with
+    # the endpoint and does not touch the pool on cache hits)
+    row = db.execute(principal_columns().where(User.id == user_uuid)).first()
+    return cache_principal(user_uuid, row)
+
+async def get_current_principal_async(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> Principal:
+    user_uuid = decode_token_subject(token)
+
+    principal = principal_cache.get(user_uuid)
+    if principal is not None:
+        return principal
+
+    row = (await db.execute(principal_columns().where(User.id == user_uuid))).first()
+    return cache_principal(user_uuid, row)
+
+def get_stream_principal(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    ticket: Optional[str] = Query(None, description="Stream ticket, for clients that can't set headers (EventSource)")
+) -> Principal:
+    """
+    Principal for long-lived streams. Holds no session of its own: a cache
+    miss uses a short one, so an open stream doesn't keep a pooled connection.
+
+    Access tokens are only taken from the Authorization header. A query
+    string lands in proxy and access logs, so it carries a short-lived
+    stream ticket (POST .../events/ticket) instead.
+    """
+    if header_token:
+        user_uuid = decode_token_subject(header_token)
+    elif ticket:
+        user_uuid = decode_token_subject(ticket, token_type="stream")
+    else:
+        raise credentials_exception()
+
+    principal = principal_cache.get(user_uuid)
+    if principal is not None:
+        return principal
+
+    with SessionLocal() as db:
+        row = db.execute(principal_columns().where(User.id == user_uuid)).first()
+    return cache_principal(user_uuid, row)
@@ -1,14 +1,26 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, dashboard, requests, teams, equipment, categories
+from app.core.config import settings
+from app.api.v1.endpoints import auth, dashboard, requests, teams, equipment, categories, metrics, reports, schedules, search
 
 api_router = APIRouter()
 
+# Async read variants go first so they take precedence over the sync handlers
+# for the same paths (settings.DB_ASYNC)
+if settings.DB_ASYNC:
+    api_router.include_router(dashboard.async_router, prefix="/dashboard", tags=["Dashboard"])
+    api_router.include_router(requests.async_router, prefix="/maintenance/requests", tags=["Maintenance"])
+    api_router.include_router(equipment.async_router, prefix="/equipment", tags=["Equipment"])
+
 # Prefixed Auth endpoints: /api/v1/auth/login, /api/v1/auth/signup, etc.
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
 api_router.include_router(requests.router, prefix="/maintenance/requests", tags=["Maintenance"])
+api_router.include_router(schedules.router, prefix="/maintenance/schedules", tags=["Maintenance"])
 api_router.include_router(teams.router, prefix="/teams", tags=["Teams"])
 api_router.include_router(equipment.router, prefix="/equipment", tags=["Equipment"])
 api_router.include_router(categories.router, prefix="/equipment-categories", tags=["Equipment Categories"])
+api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
+api_router.include_router(search.router, prefix="/search", tags=["Search"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 # Future endpoints will be added here like this:
 # api_router.include_router(equipment.router, prefix="/equipment", tags=["Equipment"])
\ No newline at end of file
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
 
-from app.api.deps import get_db
+from app.api.deps import get_db, invalidate_principals
 from app.models.base import User, Company
 from app.schemas.auth import Token, LoginRequest, RefreshRequest, LoginResponse
 from app.core.security import (
-    verify_password, 
+    verify_password_async,
     create_access_token, 
     create_refresh_token,
     REFRESH_SECRET_KEY,
@@ -14,19 +15,25 @@ from app.core.security import (
 )
 
 from app.schemas.user import UserCreate, UserOut
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_async
 
 router = APIRouter()
 
+# Login and signup are async so the Argon2 work can be awaited on the hashing
+# pool (app.core.security) instead of holding a request worker thread.
+# Their short DB calls go through run_in_threadpool.
+
 @router.post("/login", response_model=LoginResponse)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     # 1. Check User
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == login_data.email).first()
+    )
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     
-    # 2. Verify Argon2 Password
-    if not verify_password(login_data.password, user.hashed_password):
+    # 2. Verify Argon2 Password (503 if the hashing pool is saturated)
+    if not await verify_password_async(login_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     
     # # 3. Generate Tokens
@@ -36,6 +43,9 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     #     "token_type": "bearer",
     # }
 
+    # A fresh login always reloads the principal (role/team/company may have changed)
+    invalidate_principals(user.id)
+
     access_token = create_access_token(subject=user.id)
     refresh_token = create_refresh_token(subject=user.id)
 
@@ -65,6 +75,8 @@ def refresh_token(data: RefreshRequest, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    invalidate_principals(user.id)
+
     return {
         "access_token": create_access_token(subject=user.id),
         "refresh_token": data.refresh_token, # Send same refresh token back or rotate it
@@ -73,12 +85,14 @@ def refresh_token(data: RefreshRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def signup(user_in: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_in: UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user and link them to a company.
     """
     # 1. Check if user already exists
-    user_exists = db.query(User).filter(User.email == user_in.email).first()
+    user_exists = await run_in_threadpool(
+        lambda: db.query(User).filter(User.email == user_in.email).first()
+    )
     if user_exists:
         raise HTTPException(
             status_code=400,
@@ -86,7 +100,9 @@ def signup(user_in: UserCreate, db: Session = Depends(get_db)):
         )
 
     # 2. Verify Company exists
-    company = db.query(Company).filter(Company.id == user_in.company_id).first()
+    company = await run_in_threadpool(
+        lambda: db.query(Company).filter(Company.id == user_in.company_id).first()
+    )
     if not company:
         raise HTTPException(
             status_code=404,
@@ -94,7 +110,7 @@ def signup(user_in: UserCreate, db: Session = Depends(get_db)):
         )
 
     # 3. Hash the password with Argon2
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash_async(user_in.password)
 
     # 4. Create User Record
     new_user = User(
@@ -106,8 +122,11 @@ def signup(user_in: UserCreate, db: Session = Depends(get_db)):
         department_id=user_in.department_id
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    
+    def save():
+        db.add(new_user)
+        db.commit()
+        db.refresh(new_user)
+
+    await run_in_threadpool(save)
+
     return new_user
\ No newline at end of file
@@ -1,40 +1,88 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, false
 from uuid import UUID, uuid4
 from datetime import datetime
 from typing import Optional
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_principal, Principal
 from app.models.base import User, EquipmentCategory, Equipment
+from app.services.etag_logic import CATEGORIES_SCOPE, scope_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
 # --- 1. GET ALL CATEGORIES ---
 @router.get("")
-def get_categories(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    categories = db.query(EquipmentCategory).all()
-    
+def get_categories(
+    response: Response,
+    search: Optional[str] = None,
+    isActive: Optional[bool] = None,
+    page: int = Query(1, ge=1),
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # Shared by every company: versioned by category and equipment writes
+    etag = scope_etag(db, "categories", CATEGORIES_SCOPE, search, isActive, page, limit)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    conditions = []
+    if search:
+        conditions.append(EquipmentCategory.name.ilike(f"%{search}%"))
+
+    # Categories have no soft delete, so they are all active
+    if isActive is False:
+        conditions.append(false())
+
+    # Equipment counts for every category in one GROUP BY join
+    query = db.query(
+        EquipmentCategory.id,
+        EquipmentCategory.name,
+        func.count(Equipment.id).label("equipment_count")
+    ).outerjoin(
+        Equipment, Equipment.category_id == EquipmentCategory.id
+    ).filter(*conditions).group_by(
+        EquipmentCategory.id, EquipmentCategory.name
+    ).order_by(EquipmentCategory.name)
+
+    # Pagination is optional: without a limit the full list is returned
+    pagination = None
+    if limit:
+        total = db.query(func.count(EquipmentCategory.id)).filter(*conditions).scalar()
+        query = query.offset((page - 1) * limit).limit(limit)
+        pagination = {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "totalPages": math.ceil(total / limit) if total > 0 else 0
+        }
+
+    now = datetime.now()
     result = []
-    for cat in categories:
-        # Calculate equipment count on the fly
-        count = db.query(Equipment).filter(Equipment.category_id == cat.id).count()
-        
+    for cat in query.all():
         result.append({
             "id": str(cat.id),
             "name": cat.name,
             "description": "Asset category for " + cat.name,
             "parentCategory": None,
             "icon": "📁",
-            "equipmentCount": count,
+            "equipmentCount": cat.equipment_count,
             "isActive": True,
-            "createdAt": datetime.now(),
-            "updatedAt": datetime.now()
+            "createdAt": now,
+            "updatedAt": now
         })
 
+    data = {"categories": result}
+    if pagination:
+        data["pagination"] = pagination
+
     return {
         "success": True,
-        "data": {"categories": result}
+        "data": data
     }
 
 # --- 2. CREATE CATEGORY ---
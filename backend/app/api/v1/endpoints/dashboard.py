@@ -1,82 +1,60 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timezone
 
-from app.api.deps import get_db, get_current_user
-from app.models.base import User, Equipment, MaintenanceRequest, MaintenanceStage, UserRole
+from app.api.deps import get_db, get_async_db, get_current_principal, get_current_principal_async, Principal
 from app.schemas.dashboard import DashboardResponse
+from app.services.maintenance_logic import (
+    dashboard_version, dashboard_version_async, cached_dashboard_data, cached_dashboard_data_async, utc_now
+)
+from app.services.etag_logic import make_etag, etag_matches, not_modified, set_etag
 
 router = APIRouter()
 
 @router.get("/metrics", response_model=DashboardResponse)
 def get_dashboard_metrics(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    company_id = current_user.company_id
-    now = datetime.now(timezone.utc)
-
-    # 1. Critical Equipment (Out of Service / Scrapped)
-    critical_query = db.query(Equipment).filter(
-        Equipment.company_id == company_id,
-        Equipment.is_unusable == True
-    ).all()
-    
-    critical_items = [
-        {"id": eq.id, "name": eq.name, "status": "Out of Service"} 
-        for eq in critical_query
-    ]
-
-    # 2. Open Requests Metrics
-    # Count requests by stage for this company
-    all_requests = db.query(MaintenanceRequest).filter(
-        MaintenanceRequest.company_id == company_id
-    ).all()
+    # Pollers that already have the current numbers get a 304 after two
+    # index lookups, without running the aggregation
+    version = dashboard_version(db, current_user.company_id, utc_now())
+    etag = make_etag("dashboard", current_user.company_id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    # All counters (stages, overdue, critical equipment, technicians) are
+    # aggregated by the database in a single statement instead of loading
+    # every request of the company into Python, and shared between the
+    # company's dashboards until the next write.
+    return {
+        "success": True,
+        "data": cached_dashboard_data(db, current_user.company_id, version)
+    }
 
-    new_count = len([r for r in all_requests if r.stage == MaintenanceStage.NEW])
-    in_progress_count = len([r for r in all_requests if r.stage == MaintenanceStage.IN_PROGRESS])
-    
-    # Overdue = Not Repaired/Scrapped AND Scheduled Date is in the past
-    overdue_count = len([
-        r for r in all_requests 
-        if r.stage not in [MaintenanceStage.REPAIRED, MaintenanceStage.SCRAP]
-        and r.scheduled_date and r.scheduled_date.replace(tzinfo=timezone.utc) < now
-    ])
 
-    # 3. Technician Load
-    total_techs = db.query(User).filter(
-        User.company_id == company_id,
-        User.role == UserRole.TECHNICIAN
-    ).count()
+# --- ASYNC READ VARIANT (settings.DB_ASYNC) ---
+async_router = APIRouter()
 
-    active_requests_count = new_count + in_progress_count
-    
-    # Logic for load percentage: (Active Tasks / (Capacity per tech * Total Techs))
-    # Assuming 1 technician can comfortably handle 3 active tasks
-    capacity_multiplier = 3
-    if total_techs > 0:
-        load_percentage = min(int((active_requests_count / (total_techs * capacity_multiplier)) * 100), 100)
-    else:
-        load_percentage = 0
+@async_router.get("/metrics", response_model=DashboardResponse)
+async def get_dashboard_metrics_async(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    version = await dashboard_version_async(db, current_user.company_id, utc_now())
+    etag = make_etag("dashboard", current_user.company_id, version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
 
     return {
         "success": True,
-        "data": {
-            "criticalEquipment": {
-                "count": len(critical_items),
-                "items": critical_items
-            },
-            "technicianLoad": {
-                "percentage": load_percentage,
-                "totalTechnicians": total_techs,
-                "activeRequests": active_requests_count
-            },
-            "openRequests": {
-                "total": active_requests_count,
-                "overdue": overdue_count,
-                "new": new_count,
-                "inProgress": in_progress_count
-            }
-        }
-    }
\ No newline at end of file
+        "data": await cached_dashboard_data_async(db, current_user.company_id, version)
+    }
@@ -1,13 +1,20 @@
+import io
 import math
 from uuid import UUID
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_
 
 from typing import Optional
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_async_db, get_current_user, get_current_principal, get_current_principal_async, Principal
+from app.core.responses import prebuilt
 from app.models.base import Equipment, EquipmentCategory, Department, MaintenanceRequest, User, Company, MaintenanceStage
+from app.services.equipment_logic import (
+    equipment_list_filters, equipment_list_order, equipment_count_statement, equipment_page_statement,
+    equipment_list_data, import_equipment_csv
+)
 
 router = APIRouter()
 
@@ -20,63 +27,23 @@ def get_equipment(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    query = db.query(Equipment).filter(Equipment.company_id == current_user.company_id)
-
-    # Filters
-    if category:
-        query = query.join(EquipmentCategory).filter(EquipmentCategory.name == category)
-    if search:
-        query = query.filter(or_(
-            Equipment.name.ilike(f"%{search}%"),
-            Equipment.serial_number.ilike(f"%{search}%")
-        ))
-    
-    total = query.count()
-    items = query.offset((page - 1) * limit).limit(limit).all()
-
-    # Map to requested JSON format with default fallbacks
-    equipment_list = []
-    for eq in items:
-        equipment_list.append({
-            "id": str(eq.id),
-            "name": eq.name,
-            "category": eq.category.name if eq.category else "General",
-            "serialNumber": eq.serial_number,
-            "model": "Standard Model", # Fallback
-            "manufacturer": "Generic Vendor", # Fallback
-            "purchaseDate": eq.purchase_date.strftime("%Y-%m-%d") if eq.purchase_date else "2024-01-01",
-            "warrantyExpiry": "2026-01-01", # Fallback
-            "purchaseCost": 0.0, # Fallback
-            "assignedEmployeeId": str(eq.employee_id) if eq.employee_id else None,
-            "assignedEmployeeName": eq.employee.full_name if eq.employee else "Unassigned",
-            "department": eq.department.name if eq.department else "General",
-            "technicianId": str(eq.technician_id) if eq.technician_id else None,
-            "technicianName": eq.technician.full_name if eq.technician else "None",
-            "location": eq.location or "Main Facility",
-            "status": "Out of Service" if eq.is_unusable else "Active",
-            "company": current_user.company.name,
-            "notes": "Maintenance tracking active",
-            "maintenanceTeam": eq.maintenance_team.name if eq.maintenance_team else "Default Team",
-            "documents": [], # Placeholder
-            "isActive": True,
-            "createdAt": eq.created_at,
-            "updatedAt": eq.created_at
-        })
-
-    return {
+    # search: substring of name/location or serial number prefix (plus fuzzy
+    # matches on PostgreSQL), ranked by relevance and served by trigram indexes
+    dialect = db.get_bind().dialect.name
+    conditions = equipment_list_filters(current_user.company_id, category=category, search=search, dialect=dialect)
+    total = db.execute(equipment_count_statement(conditions, category=category)).scalar_one()
+
+    # Rows come back with category/employee/department/technician/team/company
+    # names already joined in, so no lazy loads happen while formatting
+    order_by = equipment_list_order(search, dialect)
+    rows = db.execute(equipment_page_statement(conditions, (page - 1) * limit, limit, order_by)).all()
+
+    return prebuilt({
         "success": True,
-        "data": {
-            "equipment": equipment_list,
-            "pagination": {
-                "page": page,
-                "limit": limit,
-                "total": total,
-                "totalPages": math.ceil(total / limit)
-            }
-        }
-    }
+        "data": equipment_list_data(rows, page, limit, total)
+    })
 
 # --- 2. GET SINGLE EQUIPMENT ---
 @router.get("/{id}")
@@ -116,7 +83,7 @@ def get_single_equipment(id: UUID, db: Session = Depends(get_db), current_user:
 
 # --- 3. CREATE EQUIPMENT ---
 @router.post("")
-def create_equipment(data: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def create_equipment(data: dict, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     # Auto-resolve Category and Department from Names
     cat = db.query(EquipmentCategory).filter(EquipmentCategory.name == data.get("category")).first()
     dept = db.query(Department).filter(Department.name == data.get("department")).first()
@@ -150,9 +117,30 @@ def create_equipment(data: dict, db: Session = Depends(get_db), current_user: Us
         "message": "Equipment created successfully"
     }
 
+# --- 3b. CSV IMPORT ---
+@router.post("/import")
+def import_equipment(file: UploadFile = File(...), db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
+    # Parsed straight from the spooled upload, line by line; category,
+    # department and team names resolve against maps loaded once per import
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        result = import_equipment_csv(db, lines, current_user.company_id, current_user.team_id)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded CSV")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        lines.detach() # leave closing the upload to FastAPI
+
+    return {
+        "success": True,
+        "data": result,
+        "message": f"{result['created']} equipment imported, {result['errorCount']} rows failed"
+    }
+
 # --- 4. PATCH EQUIPMENT ---
 @router.patch("/{id}")
-def update_equipment(id: UUID, data: dict, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def update_equipment(id: UUID, data: dict, db: Session = Depends(get_db), current_user: Principal = Depends(get_current_principal)):
     eq = db.query(Equipment).filter(Equipment.id == id).first()
     if not eq: raise HTTPException(404, "Not found")
 
@@ -183,4 +171,29 @@ async def upload_document(id: UUID, type: str = Form(...), name: str = Form(...)
             }
         },
         "message": "Document uploaded successfully"
-    }
\ No newline at end of file
+    }
+
+
+# --- ASYNC READ VARIANT (settings.DB_ASYNC) ---
+async_router = APIRouter()
+
+@async_router.get("")
+async def get_equipment_async(
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    search: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    dialect = db.bind.dialect.name
+    conditions = equipment_list_filters(current_user.company_id, category=category, search=search, dialect=dialect)
+    total = (await db.execute(equipment_count_statement(conditions, category=category))).scalar_one()
+    order_by = equipment_list_order(search, dialect)
+    rows = (await db.execute(equipment_page_statement(conditions, (page - 1) * limit, limit, order_by))).all()
+
+    return prebuilt({
+        "success": True,
+        "data": equipment_list_data(rows, page, limit, total)
+    })
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from app.api.deps import get_current_principal, Principal
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+@router.get("")
+def get_metrics(current_user: Principal = Depends(get_current_principal)):
+    # Pool and cache internals: signed-in users only.
+    # Per-process numbers: with several workers, each one reports its own
+    return {
+        "success": True,
+        "data": metrics.snapshot()
+    }
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_principal, Principal
+from app.schemas.report import PivotResponse
+from app.services.maintenance_logic import as_naive_utc
+from app.services.report_logic import parse_group_by, parse_measures, get_pivot_data
+
+router = APIRouter()
+
+@router.get("/pivot", response_model=PivotResponse)
+def get_pivot_report(
+    groupBy: str = "team",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    measures: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # 1. groupBy is a comma separated list, e.g. "team,stage" or "category,month"
+    try:
+        dimensions, bucket = parse_group_by(groupBy)
+        measure_names = parse_measures(measures)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if start and end and as_naive_utc(start) >= as_naive_utc(end):
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    # 2. Aggregated by the database; only the grouped rows come back. Served
+    # from the daily rollup when it covers the request (whole-day range, no
+    # technician); overdue/completion time then come from the matching rows only
+    return {
+        "success": True,
+        "data": get_pivot_data(db, current_user.company_id, dimensions, bucket, start, end, measure_names)
+    }
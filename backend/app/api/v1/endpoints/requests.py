@@ -1,12 +1,26 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
-from datetime import datetime, timezone
-import math
-
-from app.api.deps import get_db, get_current_user
-from app.models.base import User, MaintenanceRequest, MaintenanceStage, RequestType, Equipment
-from app.schemas.maintenance import MaintenanceListResponse, RequestDetailResponse, RequestCreate, RequestCreateResponse, RequestDeleteResponse, RequestUpdateResponse, RequestUpdate
+from fastapi import APIRouter, Depends, Query, Header, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta
+
+from app.api.deps import get_db, get_async_db, get_current_principal, get_current_principal_async, get_stream_principal, Principal
+from app.core.responses import prebuilt
+from app.core.security import create_stream_ticket, STREAM_TICKET_EXPIRE_SECONDS
+from app.models.base import MaintenanceRequest, MaintenanceStage, Equipment, PRIORITY_MAP
+from app.schemas.maintenance import MaintenanceListResponse, CalendarResponse, RequestDetailResponse, RequestCreate, RequestCreateResponse, RequestDeleteResponse, RequestUpdateResponse, RequestUpdate, BulkRequestCreate, BulkCreateResponse, BulkRequestUpdate, BulkRequestTarget, BulkWriteResponse, RequestChangesResponse, StreamTicketResponse
+from app.services.rollup_logic import rollup_entry, apply_rollup
+from app.services.change_feed import record_changes, change_stream
+from app.services.etag_logic import scope_etag, scope_etag_async, etag_matches, not_modified, set_etag
+from app.services.export_logic import EXPORT_FORMATS, export_statement, export_chunks
+from app.services.maintenance_logic import (
+    request_list_filters, newest_first_keyset, estimated_count,
+    offset_list_data, cursor_list_data, changes_statement, changes_data, request_detail_options, format_request_detail,
+    CALENDAR_MAX_DAYS, calendar_statement, format_calendar_event, as_naive_utc, utc_now,
+    request_create_values, bulk_create_requests, STATUS_STAGE_MAP,
+    bulk_target_conditions, bulk_update_values, bulk_update_requests, bulk_delete_requests
+)
 
 from typing import Optional
 from uuid import UUID
@@ -22,88 +36,167 @@ def get_maintenance_requests(
     isActive: bool = True,
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
+    useCursor: bool = False,
+    cursor: Optional[str] = None,
+    countMode: str = Query("exact", pattern="^(exact|estimated|none)$"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    # Base query filtered by Company
-    query = db.query(MaintenanceRequest).filter(
-        MaintenanceRequest.company_id == current_user.company_id,
-        MaintenanceRequest.is_active == isActive
-    )
+    # Base query filtered by Company + the optional status/priority/id filters
+    query = db.query(MaintenanceRequest).filter(*request_list_filters(
+        current_user.company_id,
+        is_active=isActive,
+        status=status,
+        priority=priority,
+        equipment_id=equipmentId,
+        team_id=teamId
+    ))
+
+    # Total is optional: exact COUNT, planner estimate, or skipped entirely
+    total_count = None
+    if countMode == "exact":
+        total_count = query.count()
+    elif countMode == "estimated":
+        total_count = estimated_count(db, query)
+
+    # Cursor mode: seek on (created_at, id) instead of OFFSET, so deep pages
+    # cost the same as the first one
+    if useCursor or cursor:
+        try:
+            keyset_query = newest_first_keyset(query, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Fetch one extra row to know whether there is a next page
+        requests_raw = keyset_query.limit(limit + 1).all()
+        return prebuilt({
+            "success": True,
+            "data": cursor_list_data(requests_raw, limit, total_count, countMode)
+        })
 
-    # 1. Filter by Status (Handling the "Overdue" special case)
-    if status:
-        if status == "overdue":
-            now = datetime.now(timezone.utc)
-            query = query.filter(
-                MaintenanceRequest.stage.in_([MaintenanceStage.NEW, MaintenanceStage.IN_PROGRESS]),
-                MaintenanceRequest.scheduled_date < now
-            )
-        elif status == "completed":
-            query = query.filter(MaintenanceRequest.stage == MaintenanceStage.REPAIRED)
-        else:
-            # Maps "new", "in-progress" to MaintenanceStage enums
-            status_map = {"new": MaintenanceStage.NEW, "in-progress": MaintenanceStage.IN_PROGRESS}
-            if status in status_map:
-                query = query.filter(MaintenanceRequest.stage == status_map[status])
-
-    # 2. Filter by Priority (Map string to Integer)
-    if priority:
-        priority_map = {"high": 3, "medium": 2, "low": 1}
-        if priority in priority_map:
-            query = query.filter(MaintenanceRequest.priority == priority_map[priority])
-
-    # 3. Specific ID Filters
-    if equipmentId:
-        query = query.filter(MaintenanceRequest.equipment_id == equipmentId)
-    if teamId:
-        query = query.filter(MaintenanceRequest.team_id == teamId)
-
-    # 4. Pagination Calculation
-    total_count = query.count()
-    total_pages = math.ceil(total_count / limit) if total_count > 0 else 0
+    # Classic page/limit pagination (kept for existing clients)
     requests_raw = query.offset((page - 1) * limit).limit(limit).all()
 
-    # 5. Format Response to match JSON example
-    formatted_requests = []
-    priority_rev_map = {3: "high", 2: "medium", 1: "low"}
-    
-    for req in requests_raw:
-        formatted_requests.append({
-            "id": str(req.id),
-            "subject": req.subject,
-            "equipmentId": req.equipment_id,
-            "teamId": req.team_id,
-            "technicianId": req.technician_id,
-            "categoryId": req.category_id,
-            "companyId": req.company_id,
-            "maintenanceFor": "equipment" if req.equipment_id else "workcenter",
-            "workCenter": req.workcenter_id,
-            "maintenanceType": req.request_type.value,
-            "priority": priority_rev_map.get(req.priority, "low"),
-            "status": "completed" if req.stage == MaintenanceStage.REPAIRED else req.stage.value,
-            "requestDate": req.created_at,
-            "scheduledDate": req.scheduled_date,
-            "duration": req.duration,
-            "notes": req.description,
-            "instructions": req.instructions,
-            "isBlocked": req.is_blocked,
-            "isArchived": req.is_archived,
-            "isActive": req.is_active,
-            "createdAt": req.created_at,
-            "updatedAt": req.updated_at,
-        })
+    return prebuilt({
+        "success": True,
+        "data": offset_list_data(requests_raw, page, limit, total_count)
+    })
+
+
+# Registered before "/{request_id}" so "calendar" isn't parsed as an id
+@router.get("/calendar", response_model=CalendarResponse)
+def get_maintenance_calendar(
+    start: datetime,
+    end: datetime,
+    teamId: Optional[UUID] = None,
+    technicianId: Optional[UUID] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # 1. Validate the window (no paging: the whole range comes back at once)
+    start, end = as_naive_utc(start), as_naive_utc(end)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    if end - start > timedelta(days=CALENDAR_MAX_DAYS):
+        raise HTTPException(status_code=400, detail=f"Calendar range is limited to {CALENDAR_MAX_DAYS} days")
+
+    # 2. Index range scan on (company_id, scheduled_date) for preventive requests
+    rows = db.execute(calendar_statement(
+        current_user.company_id, start, end, team_id=teamId, technician_id=technicianId
+    )).all()
 
     return {
         "success": True,
         "data": {
-            "requests": formatted_requests,
-            "pagination": {
-                "page": page,
-                "limit": limit,
-                "total": total_count,
-                "totalPages": total_pages
-            }
+            "start": start,
+            "end": end,
+            "events": [format_calendar_event(row) for row in rows]
+        }
+    }
+
+
+@router.get("/export")
+def export_maintenance_requests(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    equipmentId: Optional[UUID] = None,
+    teamId: Optional[UUID] = None,
+    isActive: bool = True,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # Same filters as the list endpoint, oldest first, streamed in batches
+    # from a server-side cursor so memory stays flat for any export size.
+    # The session (and its connection) is released once the stream ends.
+    stmt = export_statement(request_list_filters(
+        current_user.company_id,
+        is_active=isActive,
+        status=status,
+        priority=priority,
+        equipment_id=equipmentId,
+        team_id=teamId
+    ))
+    filename = f"maintenance-requests-{utc_now():%Y%m%d}.{format}"
+    return StreamingResponse(
+        export_chunks(db, stmt, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/changes", response_model=RequestChangesResponse)
+def get_request_changes(
+    since: Optional[str] = Query(None, description="nextToken of the previous sync; omit for a full sync"),
+    limit: int = Query(200, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # Created, updated and soft-deleted requests after `since`, in
+    # (updated_at, id) order: an index range scan on (company_id, updated_at, id)
+    try:
+        stmt = changes_statement(current_user.company_id, since, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since token")
+
+    rows = db.execute(stmt).scalars().all()
+    return prebuilt({
+        "success": True,
+        "data": changes_data(rows, limit, since)
+    })
+
+
+@router.get("/events")
+async def stream_request_changes(
+    teamId: Optional[UUID] = None,
+    since: Optional[int] = Query(None, ge=0, description="Last seen event seq; missed events are replayed"),
+    last_event_id: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_stream_principal)
+):
+    # Server-sent events for the Kanban board. Browsers resend the last
+    # event id on reconnect, which takes precedence over ?since=.
+    # Holds no database session: the shared broadcaster polls for everyone.
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    return StreamingResponse(
+        change_stream(current_user.company_id, teamId, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/events/ticket", response_model=StreamTicketResponse)
+def create_request_stream_ticket(
+    current_user: Principal = Depends(get_current_principal)
+):
+    # EventSource can't send the Authorization header, so /events takes this
+    # ticket in the query string instead of the (long-lived) access token
+    return {
+        "success": True,
+        "data": {
+            "ticket": create_stream_ticket(current_user.id),
+            "expiresIn": STREAM_TICKET_EXPIRE_SECONDS
         }
     }
 
@@ -111,16 +204,21 @@ def get_maintenance_requests(
 @router.get("/{request_id}", response_model=RequestDetailResponse)
 def get_maintenance_request_detail(
     request_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
+    # The detail embeds equipment, team and technician, so it is versioned
+    # with the whole company rather than the request's updated_at
+    etag = scope_etag(db, "request", current_user.company_id, request_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     # Fetch request with eager loading for nested objects
     # We filter by company_id to ensure a user can't see requests from other companies
-    request = db.query(MaintenanceRequest).options(
-        joinedload(MaintenanceRequest.equipment),
-        joinedload(MaintenanceRequest.team),
-        joinedload(MaintenanceRequest.technician)
-    ).filter(
+    request = db.query(MaintenanceRequest).options(*request_detail_options()).filter(
         MaintenanceRequest.id == request_id,
         MaintenanceRequest.company_id == current_user.company_id
     ).first()
@@ -131,41 +229,9 @@ def get_maintenance_request_detail(
             detail="Maintenance request not found"
         )
 
-    # Priority mapping logic
-    priority_map = {3: "high", 2: "medium", 1: "low"}
-    
-    # Status mapping logic (Matching your JSON example)
-    status_str = "new"
-    if request.stage == MaintenanceStage.REPAIRED:
-        status_str = "completed"
-    else:
-        status_str = request.stage.value
-
-    # Construct the response
     return {
         "success": True,
-        "data": {
-            "id": request.id,
-            "subject": request.subject,
-            "equipmentId": request.equipment_id,
-            "equipment": request.equipment,
-            "teamId": request.team_id,
-            "team": request.team,
-            "technicianId": request.technician_id,
-            # For the technician, we map our User model fields to match your JSON
-            "technician": {
-                "id": request.technician.id,
-                "userId": request.technician.id, # Using ID as userId
-                "full_name": request.technician.full_name,
-                "email": request.technician.email
-            } if request.technician else None,
-            "priority": priority_map.get(request.priority, "low"),
-            "status": status_str,
-            "request_type": request.request_type.value,
-            "created_at": request.created_at,
-            "description": request.description,
-            "updated_at": request.updated_at
-        }
+        "data": format_request_detail(request)
     }
 
 
@@ -173,67 +239,33 @@ def get_maintenance_request_detail(
 def create_maintenance_request(
     req_in: RequestCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    # 1. Logic: Must have either Equipment or Workcenter
-    if not req_in.equipmentId and not req_in.workcenterId:
-        raise HTTPException(status_code=400, detail="Must provide either an Equipment ID or a Workcenter ID")
-
-    # 2. AUTO-FILL LOGIC (The PDF Requirement)
-    # If Equipment is selected, fetch defaults from it
-    final_team_id = req_in.teamId
-    final_category_id = req_in.categoryId
-    
+    # 1. AUTO-FILL LOGIC (The PDF Requirement)
+    # If Equipment is selected, its Team and Category are the defaults
+    equipment = None
     if req_in.equipmentId:
         equipment = db.query(Equipment).filter(Equipment.id == req_in.equipmentId).first()
         if not equipment:
             raise HTTPException(status_code=404, detail="Equipment not found")
-        
-        # If user didn't provide a Team or Category, grab from Equipment
-        if not final_team_id:
-            final_team_id = equipment.team_id
-        if not final_category_id:
-            final_category_id = equipment.category_id
-
-    # Check if we finally have a Team and Category (required for DB)
-    if not final_team_id or not final_category_id:
-        raise HTTPException(status_code=400, detail="Maintenance Team and Category are required.")
-
-    # 3. MAPPING
-    priority_map = {"high": 3, "medium": 2, "low": 1}
-    
-    # Duration Parsing: "01:30" -> 90 minutes or just 1 hour
-    # For simplicity, we convert to total hours (integer) as per our schema
+
+    # 2. MAPPING (shared with the bulk endpoint)
     try:
-        hours, minutes = map(int, req_in.duration.split(":"))
-        total_hours = hours + (1 if minutes > 30 else 0)
-    except:
-        total_hours = 0
-
-    # 4. CREATE RECORD
-    new_request = MaintenanceRequest(
-        subject=req_in.subject,
-        description=req_in.notes,
-        instructions=req_in.instructions,
-        request_type=RequestType.CORRECTIVE if req_in.maintenanceType == "corrective" else RequestType.PREVENTIVE,
-        stage=MaintenanceStage.NEW,
-        priority=priority_map.get(req_in.priority, 2),
-        scheduled_date=req_in.scheduledDate,
-        duration=total_hours,
-        equipment_id=req_in.equipmentId,
-        workcenter_id=req_in.workcenterId,
-        team_id=final_team_id,
-        category_id=final_category_id,
-        technician_id=req_in.technicianId,
-        company_id=current_user.company_id,
-        created_by_id=current_user.id
-    )
+        values = request_create_values(req_in, current_user.company_id, current_user.id, equipment)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 3. CREATE RECORD
+    new_request = MaintenanceRequest(**values)
 
     db.add(new_request)
+    db.flush() # fills created_at for the rollup key
+    apply_rollup(db, added=[rollup_entry(new_request)])
+    record_changes(db, "created", [new_request])
     db.commit()
     db.refresh(new_request)
 
-    # 5. RESPONSE
+    # 4. RESPONSE
     return {
         "success": True,
         "data": {
@@ -252,32 +284,92 @@ def create_maintenance_request(
     }
 
 
+@router.post("/bulk", response_model=BulkCreateResponse)
+def bulk_create_maintenance_requests(
+    bulk_in: BulkRequestCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # Items are validated one by one: bad items are reported by index and the
+    # valid ones are still created (one IN query per referenced table, chunked
+    # multi-row INSERTs and a single commit)
+    result = bulk_create_requests(db, bulk_in.items, current_user.company_id, current_user.id)
+    return {
+        "success": True,
+        "data": result,
+        "message": f"{result['createdCount']} maintenance requests created, {result['errorCount']} failed"
+    }
+
+
+def bulk_write_data(target: BulkRequestTarget, ids: list) -> dict:
+    matched = set(ids)
+    return {
+        "ids": ids,
+        "count": len(ids),
+        "notFound": [i for i in target.ids if i not in matched] if target.ids else []
+    }
+
+
+@router.patch("/bulk", response_model=BulkWriteResponse)
+def bulk_update_maintenance_requests(
+    bulk_in: BulkRequestUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # 1. Same fields as the single update, applied with set-based UPDATEs
+    try:
+        values = bulk_update_values(bulk_in.changes)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # 2. Scrapping marks the equipment unusable in the same transaction
+    conditions = bulk_target_conditions(current_user.company_id, bulk_in.ids, bulk_in.filter)
+    ids = bulk_update_requests(db, current_user.company_id, conditions, values)
+    return {
+        "success": True,
+        "data": bulk_write_data(bulk_in, ids),
+        "message": f"{len(ids)} maintenance requests updated"
+    }
+
+
+@router.delete("/bulk", response_model=BulkWriteResponse)
+def bulk_delete_maintenance_requests(
+    bulk_in: BulkRequestTarget,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # Soft delete of every matching active request in one UPDATE
+    conditions = bulk_target_conditions(current_user.company_id, bulk_in.ids, bulk_in.filter)
+    ids = bulk_delete_requests(db, conditions)
+    return {
+        "success": True,
+        "data": bulk_write_data(bulk_in, ids),
+        "message": f"{len(ids)} maintenance requests deleted"
+    }
+
+
 @router.patch("/{request_id}", response_model=RequestUpdateResponse)
 def update_maintenance_request(
     request_id: UUID,
     req_in: RequestUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    # 1. Fetch Request
+    # 1. Fetch Request, locked: the rollup bucket it leaves is read here, so a
+    # concurrent update must wait for this one instead of leaving it too
     request = db.query(MaintenanceRequest).filter(
         MaintenanceRequest.id == request_id,
         MaintenanceRequest.company_id == current_user.company_id
-    ).first()
+    ).with_for_update().first()
 
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
 
+    rollup_before = rollup_entry(request)
+
     # 2. Status Mapping & Scrap Logic
     if req_in.status:
-        status_map = {
-            "new": MaintenanceStage.NEW,
-            "in-progress": MaintenanceStage.IN_PROGRESS,
-            "completed": MaintenanceStage.REPAIRED,
-            "scrap": MaintenanceStage.SCRAP
-        }
-        
-        new_stage = status_map.get(req_in.status)
+        new_stage = STATUS_STAGE_MAP.get(req_in.status)
         if new_stage:
             request.stage = new_stage
             
@@ -296,10 +388,11 @@ def update_maintenance_request(
     if req_in.notes:
         request.description = req_in.notes
     if req_in.priority:
-        p_map = {"high": 3, "medium": 2, "low": 1}
-        request.priority = p_map.get(req_in.priority, 1)
+        request.priority = PRIORITY_MAP.get(req_in.priority, 1)
 
-    request.updated_at = datetime.utcnow()
+    request.updated_at = utc_now()
+    apply_rollup(db, added=[rollup_entry(request)], removed=[rollup_before])
+    record_changes(db, "updated", [request])
     db.commit()
     db.refresh(request)
 
@@ -320,19 +413,22 @@ def update_maintenance_request(
 def delete_maintenance_request(
     request_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    # Soft Delete Implementation
+    # Soft Delete Implementation (row locked for the rollup, as in update)
     request = db.query(MaintenanceRequest).filter(
         MaintenanceRequest.id == request_id,
         MaintenanceRequest.company_id == current_user.company_id
-    ).first()
+    ).with_for_update().first()
 
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
 
+    rollup_before = rollup_entry(request)
     request.is_active = False # Soft delete
-    request.updated_at = datetime.utcnow()
+    request.updated_at = utc_now()
+    apply_rollup(db, removed=[rollup_before])
+    record_changes(db, "deleted", [request])
     db.commit()
 
     return {
@@ -343,4 +439,94 @@ def delete_maintenance_request(
             "updatedAt": request.updated_at
         },
         "message": "Maintenance request deleted successfully"
-    }
\ No newline at end of file
+    }
+
+
+# --- ASYNC READ VARIANTS (settings.DB_ASYNC) ---
+# Included ahead of `router` in api.py when async mode is on. The detail path
+# uses the :uuid convertor so it never shadows static paths of `router`.
+async_router = APIRouter()
+
+@async_router.get("", response_model=MaintenanceListResponse)
+async def get_maintenance_requests_async(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    equipmentId: Optional[UUID] = None,
+    teamId: Optional[UUID] = None,
+    isActive: bool = True,
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=100),
+    useCursor: bool = False,
+    cursor: Optional[str] = None,
+    countMode: str = Query("exact", pattern="^(exact|estimated|none)$"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    conditions = request_list_filters(
+        current_user.company_id,
+        is_active=isActive,
+        status=status,
+        priority=priority,
+        equipment_id=equipmentId,
+        team_id=teamId
+    )
+    query = select(MaintenanceRequest).where(*conditions)
+
+    total_count = None
+    if countMode == "exact":
+        total_count = await db.scalar(select(func.count()).select_from(MaintenanceRequest).where(*conditions))
+    elif countMode == "estimated":
+        total_count = await db.run_sync(
+            lambda sync_db: estimated_count(sync_db, sync_db.query(MaintenanceRequest).filter(*conditions))
+        )
+
+    if useCursor or cursor:
+        try:
+            keyset_query = newest_first_keyset(query, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        requests_raw = (await db.execute(keyset_query.limit(limit + 1))).scalars().all()
+        return prebuilt({
+            "success": True,
+            "data": cursor_list_data(requests_raw, limit, total_count, countMode)
+        })
+
+    requests_raw = (await db.execute(query.offset((page - 1) * limit).limit(limit))).scalars().all()
+    return prebuilt({
+        "success": True,
+        "data": offset_list_data(requests_raw, page, limit, total_count)
+    })
+
+
+@async_router.get("/{request_id:uuid}", response_model=RequestDetailResponse)
+async def get_maintenance_request_detail_async(
+    request_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_principal_async)
+):
+    etag = await scope_etag_async(db, "request", current_user.company_id, request_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    result = await db.execute(
+        select(MaintenanceRequest).options(*request_detail_options()).where(
+            MaintenanceRequest.id == request_id,
+            MaintenanceRequest.company_id == current_user.company_id
+        )
+    )
+    request = result.unique().scalars().first()
+
+    if not request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Maintenance request not found"
+        )
+
+    return {
+        "success": True,
+        "data": format_request_detail(request)
+    }
@@ -0,0 +1,127 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_principal, Principal
+from app.models.base import MaintenanceSchedule, Equipment, EquipmentCategory, ScheduleFrequency, PRIORITY_MAP
+from app.schemas.schedule import (
+    ScheduleCreate, ScheduleResponse, ScheduleListResponse, ScheduleGenerate, ScheduleGenerateResponse
+)
+from app.services.maintenance_logic import as_naive_utc
+from app.services.schedule_logic import generate_schedule_requests, format_schedule
+
+router = APIRouter()
+
+# --- 1. LIST SCHEDULES ---
+@router.get("", response_model=ScheduleListResponse)
+def get_schedules(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    schedules = db.query(MaintenanceSchedule).filter(
+        MaintenanceSchedule.company_id == current_user.company_id,
+        MaintenanceSchedule.is_active == True
+    ).order_by(MaintenanceSchedule.created_at).all()
+
+    return {
+        "success": True,
+        "data": [format_schedule(s) for s in schedules]
+    }
+
+
+# --- 2. CREATE SCHEDULE ---
+@router.post("", response_model=ScheduleResponse, status_code=status.HTTP_201_CREATED)
+def create_schedule(
+    schedule_in: ScheduleCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # 1. The target must exist (equipment within the caller's company)
+    if schedule_in.equipmentId:
+        equipment = db.query(Equipment.id).filter(
+            Equipment.id == schedule_in.equipmentId,
+            Equipment.company_id == current_user.company_id
+        ).first()
+        if not equipment:
+            raise HTTPException(status_code=404, detail="Equipment not found")
+    elif not db.query(EquipmentCategory.id).filter(EquipmentCategory.id == schedule_in.categoryId).first():
+        raise HTTPException(status_code=404, detail="Category not found")
+
+    starts_at = as_naive_utc(schedule_in.startsAt)
+    until = as_naive_utc(schedule_in.until)
+    if until and until < starts_at:
+        raise HTTPException(status_code=400, detail="until must not be before startsAt")
+
+    # 2. Create the recurrence (requests are materialized by /generate)
+    schedule = MaintenanceSchedule(
+        company_id=current_user.company_id,
+        equipment_id=schedule_in.equipmentId,
+        category_id=schedule_in.categoryId,
+        subject=schedule_in.subject,
+        instructions=schedule_in.instructions,
+        frequency=ScheduleFrequency(schedule_in.frequency),
+        interval=schedule_in.interval,
+        starts_at=starts_at,
+        until=until,
+        duration=schedule_in.duration,
+        priority=PRIORITY_MAP[schedule_in.priority],
+        team_id=schedule_in.teamId,
+        technician_id=schedule_in.technicianId,
+        created_by_id=current_user.id
+    )
+    db.add(schedule)
+    db.commit()
+    db.refresh(schedule)
+
+    return {
+        "success": True,
+        "data": format_schedule(schedule),
+        "message": "Maintenance schedule created successfully"
+    }
+
+
+# --- 3. DELETE SCHEDULE ---
+@router.delete("/{schedule_id}", response_model=ScheduleResponse)
+def delete_schedule(
+    schedule_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    schedule = db.query(MaintenanceSchedule).filter(
+        MaintenanceSchedule.id == schedule_id,
+        MaintenanceSchedule.company_id == current_user.company_id
+    ).first()
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
+    # Stops future generation; requests already created are kept
+    schedule.is_active = False
+    db.commit()
+    db.refresh(schedule)
+
+    return {
+        "success": True,
+        "data": format_schedule(schedule),
+        "message": "Maintenance schedule deleted successfully"
+    }
+
+
+# --- 4. GENERATE REQUESTS ---
+@router.post("/generate", response_model=ScheduleGenerateResponse)
+def generate_schedules(
+    generate_in: ScheduleGenerate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # Safe to call repeatedly: existing occurrences are skipped
+    stats = generate_schedule_requests(
+        db,
+        company_id=current_user.company_id,
+        schedule_ids=generate_in.scheduleIds,
+        horizon_days=generate_in.horizonDays
+    )
+    return {
+        "success": True,
+        "data": stats
+    }
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, get_current_principal, Principal
+from app.core.config import settings
+from app.schemas.search import SearchResponse
+from app.services.search_logic import parse_types, run_search, SearchTimeout
+
+router = APIRouter()
+
+@router.get("", response_model=SearchResponse)
+def global_search(
+    q: str = Query(..., min_length=1, max_length=200),
+    types: Optional[str] = None,
+    limit: int = Query(5, ge=1),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # 1. types is a comma separated subset of request,equipment,team,user
+    try:
+        type_names = parse_types(types)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q must not be blank")
+
+    # 2. Every type in one UNION ALL query, cut off at the latency budget
+    try:
+        data = run_search(
+            db, current_user.company_id, q.strip(), type_names,
+            min(limit, settings.SEARCH_MAX_LIMIT), settings.SEARCH_TIMEOUT_MS
+        )
+    except SearchTimeout:
+        raise HTTPException(status_code=503, detail="Search took too long, try a more specific query")
+
+    return {"success": True, "data": data}
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlalchemy.orm import Session, Query
 from uuid import UUID
 from datetime import datetime
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_principal, Principal, invalidate_principals
 from app.models.base import User, Team, Company
 from app.schemas.team import TeamCreate, TeamCreateResponse
 from app.schemas.team import TeamUpdate, TeamUpdateResponse, TeamMembersResponse
 from app.models.base import Equipment, MaintenanceRequest, MaintenanceStage
+from app.services.maintenance_logic import technician_stats_statement
+from app.services.etag_logic import scope_etag, etag_matches, not_modified, set_etag, mark_changed
 
 
 router = APIRouter()
@@ -16,7 +20,7 @@ router = APIRouter()
 def create_team(
     team_in: TeamCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     # 1. Verify/Find Company
     # We use the current_user's company_id for security, 
@@ -57,6 +61,9 @@ def create_team(
     db.commit()
     db.refresh(new_team)
 
+    # Members moved to a new team: drop their cached principals
+    invalidate_principals(*[m["userId"] for m in member_data_out])
+
     return {
         "success": True,
         "data": {
@@ -78,7 +85,7 @@ def update_team(
     team_id: UUID,
     team_in: TeamUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     team = db.query(Team).filter(Team.id == team_id, Team.company_id == current_user.company_id).first()
     if not team:
@@ -88,15 +95,20 @@ def update_team(
     if team_in.description: team.description = team_in.description
 
     member_out = []
+    changed_user_ids = []
     if team_in.members:
         # First, remove existing members from this team (unlink them)
+        changed_user_ids = [row.id for row in db.query(User.id).filter(User.team_id == team.id)]
         db.query(User).filter(User.team_id == team.id).update({User.team_id: None})
+        # Bulk UPDATE: flush events don't see it, so bump the ETag scope by hand
+        mark_changed(db, current_user.company_id)
         
         # Link the new members provided in the request
         for m in team_in.members:
-            user = db.query(User).filter(User.id == m['userId']).first()
+            user = db.query(User).filter(User.id == UUID(str(m['userId']))).first()
             if user:
                 user.team_id = team.id
+                changed_user_ids.append(user.id)
                 member_out.append({
                     "id": str(user.id)[:8],
                     "userId": user.id,
@@ -107,6 +119,7 @@ def update_team(
 
     db.commit()
     db.refresh(team)
+    invalidate_principals(*changed_user_ids)
 
     return {
         "success": True,
@@ -126,7 +139,7 @@ def delete_team(
     team_id: UUID,
     force: bool = Query(False),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     team = db.query(Team).filter(Team.id == team_id, Team.company_id == current_user.company_id).first()
     if not team:
@@ -166,28 +179,34 @@ def delete_team(
 @router.get("/{team_id}/members", response_model=TeamMembersResponse)
 def get_team_members(
     team_id: UUID,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    members = db.query(User).filter(User.team_id == team_id).all()
-    
+    # Members and their request statistics only change with a write in the company
+    etag = scope_etag(db, "team-members", current_user.company_id, team_id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    members = db.query(User).filter(
+        User.team_id == team_id,
+        User.company_id == current_user.company_id
+    ).all()
+
+    # Statistics for every member in one grouped query
+    stats_by_member = {}
+    if members:
+        stats_rows = db.execute(technician_stats_statement([m.id for m in members])).all()
+        stats_by_member = {row.technician_id: row for row in stats_rows}
+
     member_details = []
     for member in members:
-        # Active: New or In-Progress
-        active = db.query(MaintenanceRequest).filter(
-            MaintenanceRequest.technician_id == member.id,
-            MaintenanceRequest.stage.in_([MaintenanceStage.NEW, MaintenanceStage.IN_PROGRESS])
-        ).count()
-
-        # Completed: Repaired
-        completed_reqs = db.query(MaintenanceRequest).filter(
-            MaintenanceRequest.technician_id == member.id,
-            MaintenanceRequest.stage == MaintenanceStage.REPAIRED
-        ).all()
-
-        # Average duration calculation
-        durations = [r.duration for r in completed_reqs if r.duration > 0]
-        avg_time = sum(durations) / len(durations) if durations else 0
+        stats = stats_by_member.get(member.id)
+        active = stats.active if stats else 0
+        completed = stats.completed if stats else 0
+        avg_time = float(stats.avg_duration) if stats and stats.avg_duration is not None else 0
 
         member_details.append({
             "id": member.id,
@@ -197,7 +216,7 @@ def get_team_members(
             "role": member.role.value if hasattr(member.role, 'value') else str(member.role),
             "statistics": {
                 "activeRequests": active,
-                "completedRequests": len(completed_reqs),
+                "completedRequests": completed,
                 "averageCompletionTime": f"{avg_time:.1f} hours"
             }
         })
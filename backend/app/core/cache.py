@@ -0,0 +1,195 @@
+import copy
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache with a per-entry time-to-live and a bounded
+    size. When full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: Hashable):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# --- SHARED RESPONSE CACHE ---
+# Backends store computed response data under string keys with a TTL. Keys
+# must embed everything the data depends on, including a version that
+# changes on every write (see ResponseCache), so entries are never
+# invalidated in place: a write makes the old keys unreachable and they
+# expire or get evicted.
+
+class LocalCacheBackend:
+    """
+    Per-process LRU (TTLCache). Values are copied in and out rather than
+    serialized, so a caller mutating what it got can't corrupt the cache.
+    """
+
+    # In memory: safe to call from the event loop
+    blocking = False
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.entries = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.entries.get(key)
+        return None if value is None else copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        self.entries.set(key, copy.deepcopy(value), ttl_seconds)
+
+    def stats(self) -> dict:
+        return {"backend": "local", "entries": len(self.entries)}
+
+
+class RedisCacheBackend:
+    """
+    Shared by every worker. `client` is anything with redis-py's get(key) and
+    set(key, value, ex=seconds), e.g. redis.Redis or a local stand-in in tests.
+    Values are stored as JSON, so UUIDs and datetimes come back as strings.
+    """
+
+    # Network round trip: async callers run it in the threadpool
+    blocking = True
+
+    def __init__(self, client, prefix: str = "gearguard:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        self.client.set(self.prefix + key, json.dumps(value, default=str), ex=max(1, int(ttl_seconds)))
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+
+def build_cache_backend(backend: str, url: Optional[str], max_entries: int, ttl_seconds: float):
+    if backend == "local":
+        return LocalCacheBackend(max_entries, ttl_seconds)
+    if backend == "redis":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the redis package (pip install redis)") from exc
+        return RedisCacheBackend(redis.Redis.from_url(url or "redis://localhost:6379/0"))
+    raise ValueError(f"Unknown cache backend '{backend}' (use local or redis)")
+
+
+class ResponseCache:
+    """
+    Named view on a backend with hit/miss counters. Backend errors count as a
+    miss (the caller recomputes), so an unreachable Redis slows requests down
+    but doesn't fail them.
+    """
+
+    def __init__(self, name: str, backend, ttl_seconds: float):
+        self.name = name
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            value = self.backend.get(f"{self.name}:{key}")
+        except Exception:
+            value = self._read_failed()
+        return self._counted(value)
+
+    def set(self, key: str, value: Any):
+        try:
+            self.backend.set(f"{self.name}:{key}", value, self.ttl_seconds)
+        except Exception:
+            self._write_failed()
+
+    # Async handlers use these so a blocking backend (Redis) never runs on the event loop
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        try:
+            value = await self._call(self.backend.get, f"{self.name}:{key}")
+        except Exception:
+            value = self._read_failed()
+        return self._counted(value)
+
+    async def set_async(self, key: str, value: Any):
+        try:
+            await self._call(self.backend.set, f"{self.name}:{key}", value, self.ttl_seconds)
+        except Exception:
+            self._write_failed()
+
+    async def _call(self, fn, *args):
+        if self.backend.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    def _counted(self, value):
+        metrics.inc(f"response_cache_{self.name}_{'misses' if value is None else 'hits'}_total")
+        return value
+
+    def _read_failed(self):
+        logger.exception("Response cache read failed")
+        metrics.inc(f"response_cache_{self.name}_errors_total")
+        return None
+
+    def _write_failed(self):
+        logger.exception("Response cache write failed")
+        metrics.inc(f"response_cache_{self.name}_errors_total")
+
+
+response_cache_backend = build_cache_backend(
+    settings.RESPONSE_CACHE_BACKEND,
+    settings.RESPONSE_CACHE_URL,
+    settings.RESPONSE_CACHE_MAX_ENTRIES,
+    settings.RESPONSE_CACHE_TTL_SECONDS
+)
+metrics.register_gauges("response_cache", response_cache_backend.stats)
@@ -0,0 +1,85 @@
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """
+    Runtime configuration. Every field can be overridden with an environment
+    variable of the same name (or a line in backend/.env).
+    """
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # --- Database ---
+    # DB_ASYNC serves the read-heavy endpoints (request list/detail, dashboard,
+    # equipment list) through an AsyncEngine. ASYNC_DATABASE_URL defaults to
+    # DATABASE_URL with the async driver (asyncpg / aiosqlite) swapped in.
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Connection pool (per worker process; total = workers x (size + overflow))
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0 # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800 # seconds; -1 never recycles
+    # True pings the server on every checkout (one extra round trip). With it
+    # off, dead connections are only detected when a query fails, so keep
+    # DB_POOL_RECYCLE below the server/proxy idle timeout.
+    DB_POOL_PRE_PING: bool = True
+    # Running behind pgbouncer in transaction-pooling mode: no app-side pool
+    # and no server-side prepared statements
+    DB_PGBOUNCER: bool = False
+
+    # --- Serialization ---
+    # Render JSON with orjson (ORJSONResponse as the default response class)
+    # and let list endpoints send their already built rows without FastAPI
+    # re-validating and re-encoding them (app/core/responses.py)
+    FAST_JSON: bool = False
+
+    # --- Global search (GET /search) ---
+    # Latency budget for the search query; enforced as statement_timeout on
+    # PostgreSQL (SQLite has no equivalent and runs to completion)
+    SEARCH_TIMEOUT_MS: int = 500
+    SEARCH_MAX_LIMIT: int = 20 # hits per type
+
+    # --- Maintenance schedules ---
+    # How far ahead generate_schedules.py and POST .../generate create requests
+    SCHEDULE_HORIZON_DAYS: int = 90
+
+    # --- Live request change feed (GET /maintenance/requests/events) ---
+    # Each worker polls the event table once per interval for all of its
+    # streams (commits made by the same worker are pushed immediately)
+    CHANGE_FEED_POLL_SECONDS: float = 1.0
+    CHANGE_FEED_KEEPALIVE_SECONDS: float = 15.0
+    CHANGE_FEED_RETENTION_HOURS: int = 24
+    # A reconnect that missed more events than this gets a "reset" (refetch) instead
+    CHANGE_FEED_REPLAY_LIMIT: int = 1000
+    # Events buffered per stream before a slow client is cut off with a "reset"
+    CHANGE_FEED_QUEUE_SIZE: int = 1000
+
+    # --- Response cache (GET /dashboard/metrics) ---
+    # "local" keeps entries per worker process; "redis" shares them between
+    # workers (needs the redis package). Entries are keyed by the company's
+    # data version, so a write never leaves a stale entry reachable; the TTL
+    # only bounds how long unused entries stay around.
+    RESPONSE_CACHE_BACKEND: str = "local"
+    RESPONSE_CACHE_URL: Optional[str] = None # e.g. redis://localhost:6379/0
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10_000
+
+    # --- Auth: cached principals for get_current_principal ---
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10_000
+
+    # --- Password hashing (Argon2) ---
+    # None keeps passlib's defaults. memory_cost is in KiB.
+    ARGON2_TIME_COST: Optional[int] = None
+    ARGON2_MEMORY_COST: Optional[int] = None
+    ARGON2_PARALLELISM: Optional[int] = None
+    # Dedicated hashing threads, and how many calls may wait for one before
+    # login/signup answer 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+
+
+settings = Settings()
@@ -0,0 +1,45 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics: monotonically increasing counters, timing
+    summaries (count/sum/max) and gauges read from a callback at snapshot time.
+    Values are per worker process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._summaries: Dict[str, dict] = {}
+        self._gauges: Dict[str, Callable[[], dict]] = {}
+
+    def inc(self, name: str, amount: float = 1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def observe(self, name: str, value: float):
+        with self._lock:
+            summary = self._summaries.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+
+    def register_gauges(self, name: str, read: Callable[[], dict]):
+        # read() is called on every snapshot and must return a flat dict
+        self._gauges[name] = read
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            summaries = {
+                name: {**s, "avg": (s["sum"] / s["count"]) if s["count"] else 0.0}
+                for name, s in self._summaries.items()
+            }
+        gauges = {name: read() for name, read in self._gauges.items()}
+        return {"counters": counters, "timings": summaries, "gauges": gauges}
+
+
+metrics = MetricsRegistry()
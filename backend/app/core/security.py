@@ -1,18 +1,36 @@
+import asyncio
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union
 from jose import jwt
 from passlib.context import CryptContext
 
+from app.core.config import settings
+from app.core.metrics import metrics
+
 # Configuration (In production, these come from .env)
 SECRET_KEY = "SUPER_SECRET_GEAR_GUARD_KEY" 
 REFRESH_SECRET_KEY = "REFRESH_SECRET_GEAR_GUARD_KEY"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
+# Stream tickets end up in URLs (and so in proxy/access logs); keep them brief
+STREAM_TICKET_EXPIRE_SECONDS = 60
 
-# Using Argon2 as requested
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Using Argon2 as requested. Cost parameters left unset keep passlib's defaults.
+argon2_costs = {
+    "argon2__time_cost": settings.ARGON2_TIME_COST,
+    "argon2__memory_cost": settings.ARGON2_MEMORY_COST,
+    "argon2__parallelism": settings.ARGON2_PARALLELISM,
+}
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    **{key: value for key, value in argon2_costs.items() if value is not None}
+)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -20,6 +38,67 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+
+# --- PASSWORD HASHING POOL ---
+# Argon2 is deliberately slow and memory-hard. Running it on the request
+# threads lets a burst of logins starve every other endpoint, so hashing gets
+# its own small executor. Once every worker is busy and the wait queue is full,
+# new calls fail fast with PasswordHashingBusy (served as 503) instead of piling up.
+
+class PasswordHashingBusy(Exception):
+    pass
+
+class PasswordHashPool:
+    def __init__(self, workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="argon2")
+        # One slot per running or waiting job
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._capacity = workers + max_queue
+        self._pending = 0
+        self._lock = threading.Lock()
+        metrics.register_gauges("password_hash_pool", self.stats)
+
+    def stats(self) -> dict:
+        return {"pending": self._pending, "capacity": self._capacity}
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            metrics.inc("password_hash_rejected_total")
+            raise PasswordHashingBusy()
+        with self._lock:
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+
+        def job():
+            started_at = time.perf_counter()
+            metrics.observe("password_hash_queue_wait_seconds", started_at - submitted_at)
+            try:
+                return fn(*args)
+            finally:
+                metrics.observe("password_hash_seconds", time.perf_counter() - started_at)
+
+        future = self._executor.submit(job)
+        # The slot is freed when the hash finishes, even if the client went away
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hash_pool.run(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -39,4 +118,10 @@ def create_refresh_token(subject: Union[str, Any], expires_delta: timedelta = No
     
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
     encoded_jwt = jwt.encode(to_encode, REFRESH_SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
+
+def create_stream_ticket(subject: Union[str, Any]) -> str:
+    # Opens an event stream only; EventSource can't send the Authorization header
+    expire = datetime.now(timezone.utc) + timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS)
+    to_encode = {"exp": expire, "sub": str(subject), "type": "stream"}
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
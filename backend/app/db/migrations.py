@@ -0,0 +1,283 @@
+"""
+Versioned schema migrations.
+
+Each migration is a function that receives an open Connection and is registered
+with @migration(revision, description). Revisions are applied in order and
+recorded in the schema_migrations table, so running upgrade() twice is a no-op.
+
+Migrations must be safe on a database created by Base.metadata.create_all()
+(init_db.py / populate_db.py), which already has the newest tables and indexes.
+Use the *_if_missing helpers below instead of raw DDL.
+
+Migrations registered with transactional=False run on an AUTOCOMMIT connection
+(CREATE INDEX CONCURRENTLY is refused inside a transaction). They must be
+idempotent: one that fails halfway is not recorded and reruns in full.
+"""
+from datetime import datetime
+
+from sqlalchemy import Table, Column, ForeignKey, Integer, String, DateTime, MetaData, inspect, select, text, update
+
+from app.models.base import Base, Equipment, MaintenanceRequest, User, Team, RequestDailyRollup, RequestRollupCoverage, MaintenanceSchedule, RequestChangeEvent, DataVersion
+
+# Kept out of Base.metadata so drop_all/create_all never touch the history
+migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("revision", Integer, primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+MIGRATIONS = []
+
+
+def migration(revision: int, description: str, transactional: bool = True):
+    def register(fn):
+        fn.transactional = transactional
+        MIGRATIONS.append((revision, description, fn))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return fn
+    return register
+
+
+# --- DDL HELPERS ---
+
+def add_column_if_missing(conn, model, column_name: str):
+    table = model.__table__
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    if column_name in existing:
+        return
+    column = table.c[column_name]
+    column_type = column.type.compile(dialect=conn.dialect)
+    # Same foreign keys as create_all (SQLite accepts them for nullable columns)
+    references = "".join(
+        f" REFERENCES {fk.column.table.name} ({fk.column.name})" for fk in column.foreign_keys
+    )
+    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{references}"))
+
+
+def create_table_if_missing(conn, model):
+    model.__table__.create(conn, checkfirst=True)
+
+
+def create_index_if_missing(conn, model, index_name: str, concurrently: bool = False):
+    index = next(i for i in model.__table__.indexes if i.name == index_name)
+    if concurrently and conn.dialect.name == "postgresql":
+        # Builds without locking out writes (needs a transactional=False migration).
+        # Set on a copy of the table so the model keeps the plain definition.
+        drop_invalid_index(conn, index_name)
+        table = model.__table__.to_metadata(MetaData())
+        index = next(i for i in table.indexes if i.name == index_name)
+        index.dialect_kwargs["postgresql_concurrently"] = True
+    index.create(conn, checkfirst=True)
+
+
+def drop_invalid_index(conn, index_name: str):
+    # A failed CREATE INDEX CONCURRENTLY leaves an invalid index behind, which
+    # checkfirst would take for a finished one
+    invalid = conn.execute(text(
+        "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+        "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+    ), {"name": index_name}).first()
+    if invalid:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+
+# --- BASELINE ---
+
+# The schema migrations started from. Tables, columns and indexes added since
+# are created by the migration that introduced them, not by revision 1.
+BASELINE_TABLES = (
+    "companies", "departments", "equipment_categories", "teams", "workcenters",
+    "users", "equipment", "maintenance_requests",
+)
+LATER_COLUMNS = {
+    "equipment": ("created_at",),             # revision 2
+    "maintenance_requests": ("schedule_id",), # revision 6
+}
+
+
+def baseline_metadata() -> MetaData:
+    metadata = MetaData()
+    for name in BASELINE_TABLES:
+        later = LATER_COLUMNS.get(name, ())
+        Table(name, metadata, *[
+            Column(
+                column.name, column.type,
+                *[ForeignKey(fk.target_fullname) for fk in column.foreign_keys],
+                primary_key=column.primary_key, nullable=column.nullable, unique=column.unique
+            )
+            for column in Base.metadata.tables[name].columns
+            if column.name not in later
+        ])
+    return metadata
+
+
+# --- MIGRATIONS ---
+
+@migration(1, "baseline schema")
+def baseline(conn):
+    baseline_metadata().create_all(conn, checkfirst=True)
+
+
+@migration(2, "equipment.created_at")
+def equipment_created_at(conn):
+    add_column_if_missing(conn, Equipment, "created_at")
+    # Rows that predate the column get the upgrade time instead of NULL
+    conn.execute(
+        update(Equipment.__table__)
+        .where(Equipment.__table__.c.created_at.is_(None))
+        .values(created_at=datetime.utcnow())
+    )
+
+
+@migration(3, "indexes for hot query paths", transactional=False)
+def hot_path_indexes(conn):
+    for name in (
+        "ix_users_company_role",
+        "ix_users_team",
+    ):
+        create_index_if_missing(conn, User, name, concurrently=True)
+
+    for name in (
+        "ix_equipment_company_category",
+        "ix_equipment_category",
+        "ix_equipment_company_unusable",
+    ):
+        create_index_if_missing(conn, Equipment, name, concurrently=True)
+
+    for name in (
+        "ix_maintenance_requests_company_active_stage",
+        "ix_maintenance_requests_company_active_created",
+        "ix_maintenance_requests_open_created",
+        "ix_maintenance_requests_open_scheduled",
+        "ix_maintenance_requests_technician_stage",
+        "ix_maintenance_requests_team_stage",
+        "ix_maintenance_requests_equipment",
+    ):
+        create_index_if_missing(conn, MaintenanceRequest, name, concurrently=True)
+
+
+@migration(4, "daily request rollups")
+def request_rollups(conn):
+    # Starts empty and uncovered (reports read raw data) until rebuild_rollups.py runs
+    create_table_if_missing(conn, RequestDailyRollup)
+    create_table_if_missing(conn, RequestRollupCoverage)
+
+
+@migration(5, "calendar index", transactional=False)
+def calendar_index(conn):
+    create_index_if_missing(conn, MaintenanceRequest, "ix_maintenance_requests_company_type_scheduled", concurrently=True)
+
+
+@migration(6, "recurring maintenance schedules")
+def maintenance_schedules(conn):
+    create_table_if_missing(conn, MaintenanceSchedule)
+    add_column_if_missing(conn, MaintenanceRequest, "schedule_id")
+
+
+@migration(7, "trigram indexes for equipment search", transactional=False)
+def equipment_search_indexes(conn):
+    # PostgreSQL only: SQLite searches without an index
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for name in ("ix_equipment_name_trgm", "ix_equipment_serial_trgm", "ix_equipment_location_trgm"):
+        create_index_if_missing(conn, Equipment, name, concurrently=True)
+
+
+@migration(8, "trigram indexes for global search", transactional=False)
+def global_search_indexes(conn):
+    if conn.dialect.name != "postgresql":
+        return
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for model, name in (
+        (MaintenanceRequest, "ix_maintenance_requests_subject_trgm"),
+        (MaintenanceRequest, "ix_maintenance_requests_description_trgm"),
+        (Team, "ix_teams_name_trgm"),
+        (User, "ix_users_full_name_trgm"),
+        (User, "ix_users_email_trgm"),
+    ):
+        create_index_if_missing(conn, model, name, concurrently=True)
+
+
+@migration(9, "request change events")
+def request_change_events(conn):
+    create_table_if_missing(conn, RequestChangeEvent)
+
+
+@migration(10, "backfill updated_at for delta sync")
+def delta_sync_backfill(conn):
+    # Rows written before updated_at was always set would be invisible to the sync
+    conn.execute(
+        update(MaintenanceRequest.__table__)
+        .where(MaintenanceRequest.__table__.c.updated_at.is_(None))
+        .values(updated_at=MaintenanceRequest.__table__.c.created_at)
+    )
+
+
+@migration(11, "data versions for ETags")
+def data_versions(conn):
+    create_table_if_missing(conn, DataVersion)
+
+
+@migration(12, "delta sync index", transactional=False)
+def delta_sync_index(conn):
+    # Split from revision 10 so the index builds outside its transaction
+    create_index_if_missing(conn, MaintenanceRequest, "ix_maintenance_requests_company_updated", concurrently=True)
+
+
+@migration(13, "schedule occurrence index", transactional=False)
+def schedule_occurrence_index(conn):
+    # Moved out of revision 6 to build without locking out writes. Schedule
+    # generation (ON CONFLICT on these columns) needs it, so run to head first.
+    create_index_if_missing(conn, MaintenanceRequest, "ux_maintenance_requests_schedule_occurrence", concurrently=True)
+
+
+# --- RUNNER ---
+
+def head_revision() -> int:
+    return MIGRATIONS[-1][0]
+
+
+def applied_revisions(conn) -> set:
+    migration_metadata.create_all(conn, checkfirst=True)
+    return set(conn.execute(select(schema_migrations.c.revision)).scalars())
+
+
+def current_revision(engine) -> int:
+    with engine.begin() as conn:
+        applied = applied_revisions(conn)
+    return max(applied) if applied else 0
+
+
+def upgrade(engine, target: int = None) -> list:
+    """Applies every pending migration up to target (default: latest). Returns the applied revisions."""
+    target = head_revision() if target is None else target
+    done = []
+    for revision, description, fn in MIGRATIONS:
+        if revision > target:
+            break
+        # One transaction per migration so a failure leaves earlier ones recorded
+        with engine.connect() as conn:
+            if not fn.transactional:
+                conn.execution_options(isolation_level="AUTOCOMMIT")
+            with conn.begin():
+                if revision in applied_revisions(conn):
+                    continue
+                fn(conn)
+                conn.execute(schema_migrations.insert().values(revision=revision, description=description))
+        done.append(revision)
+    return done
+
+
+def stamp(engine, target: int = None):
+    """Marks migrations as applied without running them (after create_all)."""
+    target = head_revision() if target is None else target
+    with engine.begin() as conn:
+        applied = applied_revisions(conn)
+        for revision, description, _ in MIGRATIONS:
+            if revision <= target and revision not in applied:
+                conn.execute(schema_migrations.insert().values(revision=revision, description=description))
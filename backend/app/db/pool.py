@@ -0,0 +1,98 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool, NullPool, AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+# --- METERED POOLS ---
+# Pool wait   = time spent in the pool's _do_get (waiting for a free slot or
+#               opening a new connection).
+# Checkout    = wait + pre-ping, measured up to the "checkout" event.
+
+# Key in the connection record's info dict. Kept on the record rather than
+# per thread: under asyncio every checkout runs on the same thread.
+CHECKOUT_STARTED = "checkout_started"
+
+
+class MeteredPoolMixin:
+    metric_prefix = "db_pool"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        finally:
+            metrics.observe(f"{self.metric_prefix}_wait_seconds", time.perf_counter() - started)
+        record.info[CHECKOUT_STARTED] = started
+        return record
+
+
+class MeteredQueuePool(MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredNullPool(MeteredPoolMixin, NullPool):
+    pass
+
+
+class MeteredAsyncQueuePool(MeteredPoolMixin, AsyncAdaptedQueuePool):
+    metric_prefix = "db_async_pool"
+
+
+def pool_options(url: str, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for the configured pool strategy."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    backend = make_url(url).get_backend_name()
+
+    if settings.DB_PGBOUNCER:
+        # pgbouncer in transaction mode does the pooling; keeping our own pool
+        # would pin server connections. Prepared statements don't survive a
+        # transaction-pooled connection either, so asyncpg must not cache them.
+        options["poolclass"] = MeteredNullPool
+        if is_async and backend == "postgresql":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        return options
+
+    if backend == "sqlite" and make_url(url).database in (None, "", ":memory:"):
+        # In-memory SQLite needs its default single-connection pool
+        return options
+
+    options.update(
+        poolclass=MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def instrument_engine(sync_engine, name: str):
+    """Checkout latency + in-use/overflow gauges for an engine's pool."""
+    pool = sync_engine.pool
+    prefix = getattr(pool, "metric_prefix", name)
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        started = connection_record.info.pop(CHECKOUT_STARTED, None)
+        if started is not None:
+            metrics.observe(f"{prefix}_checkout_seconds", time.perf_counter() - started)
+        metrics.inc(f"{prefix}_checkouts_total")
+
+    def stats() -> dict:
+        if not isinstance(pool, QueuePool):
+            return {"pool": type(pool).__name__}
+        return {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "inUse": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # Negative until the pool has opened pool_size connections
+            "overflow": pool.overflow(),
+            "maxOverflow": settings.DB_MAX_OVERFLOW,
+        }
+
+    metrics.register_gauges(name, stats)
@@ -1,12 +1,16 @@
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.api.v1.api import api_router
+from app.core.responses import default_response_class
+from app.core.security import PasswordHashingBusy
 
 app = FastAPI(
     title="GearGuard: The Ultimate Maintenance Tracker",
     description="Backend API for the GearGuard hackathon solution (Inspired by Odoo)",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=default_response_class()
 )
 
 # --- CORS CONFIGURATION ---
@@ -23,6 +27,16 @@ app.add_middleware(
 # All API endpoints will be prefixed with /api/v1
 app.include_router(api_router, prefix="/api/v1")
 
+# --- BACKPRESSURE ---
+# Password hashing pool is full: tell the client to retry shortly
+@app.exception_handler(PasswordHashingBusy)
+def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication service is busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
 @app.get("/")
 def root():
     return {
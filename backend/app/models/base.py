@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Boolean, Enum, Text
+from sqlalchemy import Column, String, Integer, BigInteger, ForeignKey, Date, DateTime, Boolean, Enum, Text, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship, declarative_base
 
@@ -17,6 +17,28 @@ PRIORITY_MAP = {
 # Reverse map for GET requests
 PRIORITY_REVERSE_MAP = {v: k for k, v in PRIORITY_MAP.items()}
 
+# Index predicates are raw SQL: enums are stored by name ('NEW', 'IN_PROGRESS').
+# Queries must spell the stages as literals too (maintenance_logic.open_stage_filter),
+# a bound "stage IN (?, ?)" never matches the predicate.
+OPEN_STAGE_PREDICATE = "stage IN ('NEW', 'IN_PROGRESS')"
+
+
+def partial_index(name, *columns, where):
+    # Same predicate for PostgreSQL and SQLite, other dialects get a full index
+    return Index(name, *columns, postgresql_where=text(where), sqlite_where=text(where))
+
+
+def trigram_index(name, column):
+    # pg_trgm GIN index (serves ILIKE '%term%' and fuzzy matches); PostgreSQL only
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}).ddl_if(dialect="postgresql")
+
+
+# Trigram indexes need the extension before create_all builds them
+event.listen(
+    Base.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 
 class UserRole(str, enum.Enum):
     MANAGER = "manager"
@@ -27,6 +49,12 @@ class RequestType(str, enum.Enum):
     CORRECTIVE = "corrective"
     PREVENTIVE = "preventive"
 
+class ScheduleFrequency(str, enum.Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    YEARLY = "yearly"
+
 class MaintenanceStage(str, enum.Enum):
     NEW = "new"
     IN_PROGRESS = "in_progress"
@@ -74,6 +102,11 @@ class Team(Base):
     members = relationship("User", back_populates="team")
     requests = relationship("MaintenanceRequest", back_populates="team")
 
+    __table_args__ = (
+        # Global search (GET /search)
+        trigram_index("ix_teams_name_trgm", "name"),
+    )
+
 class Workcenter(Base):
     __tablename__ = "workcenters"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -114,6 +147,16 @@ class User(Base):
     # 4. Maintenance Requests this user CREATED
     created_requests = relationship("MaintenanceRequest", back_populates="creator", foreign_keys="MaintenanceRequest.created_by_id")
 
+    __table_args__ = (
+        # Technician head count on the dashboard
+        Index("ix_users_company_role", "company_id", "role"),
+        # Team member listing
+        Index("ix_users_team", "team_id"),
+        # Global search (GET /search)
+        trigram_index("ix_users_full_name_trgm", "full_name"),
+        trigram_index("ix_users_email_trgm", "email"),
+    )
+
 class Equipment(Base):
     __tablename__ = "equipment"
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -133,6 +176,7 @@ class Equipment(Base):
     purchase_date = Column(DateTime, nullable=True)
     location = Column(String(255), nullable=True)
     is_unusable = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
     
     company = relationship("Company", back_populates="equipment")
     category = relationship("EquipmentCategory", back_populates="equipment")
@@ -142,6 +186,19 @@ class Equipment(Base):
     requests = relationship("MaintenanceRequest", back_populates="equipment")
     workcenter = relationship("Workcenter", back_populates="equipment")
 
+    __table_args__ = (
+        # Equipment list (company scope + category filter)
+        Index("ix_equipment_company_category", "company_id", "category_id"),
+        # Per-category equipment counts
+        Index("ix_equipment_category", "category_id"),
+        # Critical equipment card on the dashboard
+        partial_index("ix_equipment_company_unusable", "company_id", where="is_unusable"),
+        # Equipment search box (name/location substrings, serial prefixes)
+        trigram_index("ix_equipment_name_trgm", "name"),
+        trigram_index("ix_equipment_serial_trgm", "serial_number"),
+        trigram_index("ix_equipment_location_trgm", "location"),
+    )
+
 class MaintenanceRequest(Base):
     __tablename__ = "maintenance_requests"
 
@@ -186,6 +243,9 @@ class MaintenanceRequest(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     instructions = Column(Text, nullable=True)
+
+    # Set on requests materialized from a MaintenanceSchedule
+    schedule_id = Column(UUID(as_uuid=True), ForeignKey("maintenance_schedules.id"), nullable=True)
     is_blocked = Column(Boolean, default=False)
     is_archived = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
@@ -208,4 +268,139 @@ class MaintenanceRequest(Base):
     # Link to Category (for the Pivot/Graph reports)
     category = relationship("EquipmentCategory")
 
-    workcenter = relationship("Workcenter", back_populates="requests")
\ No newline at end of file
+    workcenter = relationship("Workcenter", back_populates="requests")
+
+    __table_args__ = (
+        # Dashboard counters and status-filtered lists
+        Index("ix_maintenance_requests_company_active_stage", "company_id", "is_active", "stage"),
+        # Request list ordered newest first (keyset pagination)
+        Index("ix_maintenance_requests_company_active_created", "company_id", "is_active", "created_at", "id"),
+        # Delta sync: everything a company changed since a (updated_at, id) position
+        Index("ix_maintenance_requests_company_updated", "company_id", "updated_at", "id"),
+        # Open work per company ordered by created_at (Kanban board)
+        partial_index(
+            "ix_maintenance_requests_open_created", "company_id", "created_at",
+            where=f"is_active AND {OPEN_STAGE_PREDICATE}"
+        ),
+        # Overdue checks: open requests with a scheduled date in the past
+        partial_index(
+            "ix_maintenance_requests_open_scheduled", "company_id", "scheduled_date",
+            where=f"{OPEN_STAGE_PREDICATE} AND scheduled_date IS NOT NULL"
+        ),
+        # Calendar: preventive requests of a company by scheduled date
+        Index("ix_maintenance_requests_company_type_scheduled", "company_id", "request_type", "scheduled_date"),
+        # Technician workload / statistics
+        Index("ix_maintenance_requests_technician_stage", "technician_id", "stage"),
+        # Team dependency checks
+        Index("ix_maintenance_requests_team_stage", "team_id", "stage"),
+        # Equipment history and smart button counts
+        Index("ix_maintenance_requests_equipment", "equipment_id"),
+        # One request per schedule occurrence and equipment (idempotent generator)
+        Index(
+            "ux_maintenance_requests_schedule_occurrence", "schedule_id", "equipment_id", "scheduled_date",
+            unique=True
+        ),
+        # Global search (GET /search)
+        trigram_index("ix_maintenance_requests_subject_trgm", "subject"),
+        trigram_index("ix_maintenance_requests_description_trgm", "description"),
+    )
+
+
+class MaintenanceSchedule(Base):
+    """
+    Recurring preventive maintenance, RRULE-like: every `interval` days, weeks,
+    months or years from `starts_at`. Applies to one piece of equipment or to
+    every piece in a category. See app/services/schedule_logic.py.
+    """
+    __tablename__ = "maintenance_schedules"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
+
+    # Target: exactly one of these
+    equipment_id = Column(UUID(as_uuid=True), ForeignKey("equipment.id"), nullable=True)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("equipment_categories.id"), nullable=True)
+
+    subject = Column(String(255), nullable=False)
+    instructions = Column(Text, nullable=True)
+    frequency = Column(Enum(ScheduleFrequency), nullable=False)
+    interval = Column(Integer, default=1, nullable=False)
+    starts_at = Column(DateTime, nullable=False) # First occurrence, anchors the series
+    until = Column(DateTime, nullable=True)
+
+    # Copied onto generated requests (team/technician fall back to the equipment's)
+    duration = Column(Integer, default=0)
+    priority = Column(Integer, default=2, nullable=False)
+    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id"), nullable=True)
+    technician_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+
+    is_active = Column(Boolean, default=True)
+    created_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_maintenance_schedules_company_active", "company_id", "is_active"),
+    )
+
+
+# --- REPORTING ROLLUPS ---
+# Maintained by app/services/rollup_logic.py alongside request writes and
+# rebuilt from scratch by rebuild_rollups.py. Only active requests are counted.
+
+class RequestDailyRollup(Base):
+    __tablename__ = "request_daily_rollups"
+
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), primary_key=True)
+    day = Column(Date, primary_key=True) # created_at date (UTC)
+    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id"), primary_key=True)
+    category_id = Column(UUID(as_uuid=True), ForeignKey("equipment_categories.id"), primary_key=True)
+    stage = Column(Enum(MaintenanceStage), primary_key=True)
+    request_type = Column(Enum(RequestType), primary_key=True)
+
+    request_count = Column(Integer, default=0, nullable=False)
+    duration_sum = Column(Integer, default=0, nullable=False)
+
+class RequestRollupCoverage(Base):
+    # A row here means the company's rollups were rebuilt and are kept current
+    __tablename__ = "request_rollup_coverage"
+
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), primary_key=True)
+    rebuilt_at = Column(DateTime, default=datetime.utcnow)
+
+
+class RequestChangeEvent(Base):
+    """
+    Append-only log of request changes, written in the same transaction as the
+    change. Feeds the live Kanban stream (GET /maintenance/requests/events);
+    seq doubles as the resume position. Pruned after CHANGE_FEED_RETENTION_HOURS.
+    """
+    __tablename__ = "request_change_events"
+
+    # INTEGER on SQLite so it aliases the rowid and autoincrements
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id"), nullable=False)
+    team_id = Column(UUID(as_uuid=True), nullable=True)
+    request_id = Column(UUID(as_uuid=True), nullable=False)
+    action = Column(String(20), nullable=False) # created, updated, deleted
+    stage = Column(Enum(MaintenanceStage), nullable=False)
+    is_active = Column(Boolean, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Replay for a reconnecting client
+        Index("ix_request_change_events_company_seq", "company_id", "seq"),
+        # Retention pruning
+        Index("ix_request_change_events_created", "created_at"),
+    )
+
+
+class DataVersion(Base):
+    """
+    Change counter per scope (a company id, or "categories" for the shared
+    category list), bumped when a transaction that wrote to the scope commits.
+    Read endpoints derive their ETag from it (app/services/etag_logic.py).
+    """
+    __tablename__ = "data_versions"
+
+    scope = Column(String(36), primary_key=True)
+    version = Column(BigInteger, default=0, nullable=False)
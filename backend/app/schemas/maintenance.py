@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -38,9 +38,52 @@ class Pagination(BaseModel):
     total: int
     totalPages: int
 
+# Returned instead of Pagination when the list is read with useCursor/cursor
+class CursorPagination(BaseModel):
+    limit: int
+    nextCursor: Optional[str] = None # Pass back as ?cursor= to get the next page
+    hasMore: bool
+    total: Optional[int] = None # None when countMode=none
+    totalIsEstimate: bool = False
+
 class MaintenanceListResponse(BaseModel):
     success: bool = True
-    data: dict # Contains {"requests": [...], "pagination": {...}}
+    data: dict # Contains {"requests": [...], "pagination": Pagination | CursorPagination}
+
+
+# Delta sync: requests changed since a token, tombstones included
+class RequestChangesResponse(BaseModel):
+    success: bool = True
+    data: dict # Contains {"requests": [...list items], "nextToken": str (pass back as ?since=), "hasMore": bool}
+
+# Live changes: short-lived ticket for GET /events?ticket=
+class StreamTicketData(BaseModel):
+    ticket: str
+    expiresIn: int # seconds
+
+class StreamTicketResponse(BaseModel):
+    success: bool = True
+    data: StreamTicketData
+
+# Calendar: one compact event per scheduled preventive request
+class CalendarEvent(BaseModel):
+    id: UUID
+    subject: str
+    scheduledDate: datetime
+    duration: Optional[int] = None
+    priority: str
+    status: str
+    equipmentId: Optional[UUID] = None
+    technicianId: Optional[UUID] = None
+
+class CalendarData(BaseModel):
+    start: datetime
+    end: datetime
+    events: List[CalendarEvent]
+
+class CalendarResponse(BaseModel):
+    success: bool = True
+    data: CalendarData
 
 
 
@@ -137,6 +180,30 @@ class RequestCreateResponse(BaseModel):
     message: str = "Maintenance request created successfully"
 
 
+# Bulk create: items are raw objects so one invalid item doesn't reject the batch
+class BulkRequestCreate(BaseModel):
+    items: List[dict] = Field(..., min_length=1, max_length=10000) # each one a RequestCreate
+
+class BulkCreatedItem(BaseModel):
+    index: int # position in `items`
+    id: UUID
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+class BulkCreateData(BaseModel):
+    created: List[BulkCreatedItem]
+    errors: List[BulkItemError]
+    createdCount: int
+    errorCount: int
+
+class BulkCreateResponse(BaseModel):
+    success: bool = True
+    data: BulkCreateData
+    message: str
+
+
 class RequestUpdate(BaseModel):
     status: Optional[str] = None # new, in-progress, completed, scrap
     technicianId: Optional[UUID] = None
@@ -157,6 +224,43 @@ class RequestUpdateResponse(BaseModel):
     data: RequestUpdateDataOut
     message: str
 
+# Bulk update / delete: target explicit ids or the list endpoint's filters
+class BulkRequestFilter(BaseModel):
+    status: Optional[str] = None # new, in-progress, completed, overdue
+    priority: Optional[str] = None
+    equipmentId: Optional[UUID] = None
+    teamId: Optional[UUID] = None
+    isActive: bool = True
+
+    @model_validator(mode='after')
+    def validate_not_empty(self):
+        if not (self.status or self.priority or self.equipmentId or self.teamId):
+            raise ValueError("filter needs at least one of status, priority, equipmentId or teamId")
+        return self
+
+class BulkRequestTarget(BaseModel):
+    ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=10000)
+    filter: Optional[BulkRequestFilter] = None
+
+    @model_validator(mode='after')
+    def validate_target(self):
+        if bool(self.ids) == bool(self.filter):
+            raise ValueError("Provide either ids or filter")
+        return self
+
+class BulkRequestUpdate(BulkRequestTarget):
+    changes: RequestUpdate
+
+class BulkWriteData(BaseModel):
+    ids: List[UUID]
+    count: int
+    notFound: List[UUID] = [] # requested ids that matched nothing
+
+class BulkWriteResponse(BaseModel):
+    success: bool = True
+    data: BulkWriteData
+    message: str
+
 class RequestDeleteResponse(BaseModel):
     success: bool = True
     data: dict
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List
+
+class PivotData(BaseModel):
+    groupBy: List[str]
+    rowCount: int
+    # Column name -> values, one entry per grouped row
+    columns: Dict[str, List[Any]]
+
+class PivotResponse(BaseModel):
+    success: bool = True
+    data: PivotData
@@ -0,0 +1,79 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
+from uuid import UUID
+from datetime import datetime
+
+from app.core.config import settings
+
+class ScheduleCreate(BaseModel):
+    subject: str
+    # Exactly one target: a single piece of equipment or a whole category
+    equipmentId: Optional[UUID] = None
+    categoryId: Optional[UUID] = None
+    frequency: str # daily, weekly, monthly, yearly
+    interval: int = Field(1, ge=1) # e.g. monthly + 3 = quarterly
+    startsAt: datetime
+    until: Optional[datetime] = None
+    duration: int = Field(0, ge=0) # hours
+    priority: str = "medium" # low, medium, high
+    teamId: Optional[UUID] = None
+    technicianId: Optional[UUID] = None
+    instructions: Optional[str] = None
+
+    @field_validator('frequency')
+    def validate_frequency(cls, v):
+        if v not in ["daily", "weekly", "monthly", "yearly"]:
+            raise ValueError("frequency must be daily, weekly, monthly or yearly")
+        return v
+
+    @field_validator('priority')
+    def validate_priority(cls, v):
+        if v not in ["low", "medium", "high"]:
+            return "medium"
+        return v
+
+    @model_validator(mode='after')
+    def validate_target(self):
+        if bool(self.equipmentId) == bool(self.categoryId):
+            raise ValueError("Provide either equipmentId or categoryId")
+        return self
+
+class ScheduleData(BaseModel):
+    id: UUID
+    subject: str
+    equipmentId: Optional[UUID]
+    categoryId: Optional[UUID]
+    frequency: str
+    interval: int
+    startsAt: datetime
+    until: Optional[datetime]
+    duration: Optional[int]
+    priority: str
+    teamId: Optional[UUID]
+    technicianId: Optional[UUID]
+    isActive: bool
+    createdAt: datetime
+
+class ScheduleResponse(BaseModel):
+    success: bool = True
+    data: ScheduleData
+    message: Optional[str] = None
+
+class ScheduleListResponse(BaseModel):
+    success: bool = True
+    data: List[ScheduleData]
+
+class ScheduleGenerate(BaseModel):
+    horizonDays: int = Field(settings.SCHEDULE_HORIZON_DAYS, ge=1, le=730)
+    scheduleIds: Optional[List[UUID]] = None # default: every active schedule of the company
+
+class GenerateStats(BaseModel):
+    schedules: int
+    occurrences: int # created + existing
+    created: int # new requests
+    existing: int # occurrences that already had a request
+    skipped: int # occurrences on equipment without a maintenance team or category (not in occurrences)
+
+class ScheduleGenerateResponse(BaseModel):
+    success: bool = True
+    data: GenerateStats
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from uuid import UUID
+
+class SearchHit(BaseModel):
+    type: str # request, equipment, team, user
+    id: UUID
+    title: str
+    subtitle: Optional[str] = None
+    score: float
+
+class SearchData(BaseModel):
+    query: str
+    hits: List[SearchHit] # best first, across all types
+    counts: Dict[str, int] # hits per searched type
+
+class SearchResponse(BaseModel):
+    success: bool = True
+    data: SearchData
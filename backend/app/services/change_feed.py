@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, func, delete, event
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.models.base import RequestChangeEvent, MaintenanceStage
+from app.services.etag_logic import mark_changed
+
+logger = logging.getLogger(__name__)
+
+# Set on a session that wrote change events; its commit wakes the broadcaster
+PENDING_KEY = "change_feed_pending"
+
+# Events fetched per poll round (more rounds follow right away when full)
+POLL_BATCH_SIZE = 1000
+
+# A sequence number missing from the table (PostgreSQL transaction still
+# running, or rolled back) is waited for this long before it is skipped
+GAP_TIMEOUT_SECONDS = 5.0
+
+PRUNE_INTERVAL_SECONDS = 600
+
+
+# --- WRITING ---
+
+def record_changes(db, action: str, requests):
+    """
+    Appends a change event per request (anything with id, company_id, team_id,
+    stage and is_active) in the caller's transaction, so events exist exactly
+    when the change commits. action: created, updated or deleted.
+    """
+    now = datetime.utcnow()
+    rows = [
+        {
+            "company_id": req.company_id,
+            "team_id": req.team_id,
+            "request_id": req.id,
+            "action": action,
+            "stage": req.stage,
+            "is_active": req.is_active,
+            "created_at": now,
+        }
+        for req in requests
+    ]
+    if rows:
+        db.execute(RequestChangeEvent.__table__.insert(), rows)
+        db.info[PENDING_KEY] = True
+        # Core writes (bulk, schedules) don't pass through the ORM flush
+        mark_changed(db, *{row["company_id"] for row in rows})
+
+
+@event.listens_for(Session, "after_commit")
+def wake_after_commit(session):
+    if session.info.pop(PENDING_KEY, False):
+        broadcaster.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_after_rollback(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+# --- READING ---
+
+def format_change_event(row) -> dict:
+    return {
+        "seq": row.seq,
+        "action": row.action,
+        "id": str(row.request_id),
+        "teamId": str(row.team_id) if row.team_id else None,
+        "status": "completed" if row.stage == MaintenanceStage.REPAIRED else row.stage.value,
+        "isActive": row.is_active,
+        "at": row.created_at.isoformat(),
+    }
+
+
+def sse_message(event_name: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event_name}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def latest_seq() -> int:
+    with db_session.SessionLocal() as db:
+        return db.scalar(select(func.max(RequestChangeEvent.seq))) or 0
+
+
+def replay_events(company_id: UUID, team_id: Optional[UUID], since: int) -> Optional[list]:
+    """
+    Events after `since` in the stream's scope, or None when the client has to
+    refetch instead: it missed more than CHANGE_FEED_REPLAY_LIMIT events, or
+    some of them were already pruned.
+    """
+    with db_session.SessionLocal() as db:
+        oldest = db.scalar(select(func.min(RequestChangeEvent.seq)))
+        if since and (oldest is None or since < oldest - 1):
+            return None
+
+        stmt = select(RequestChangeEvent).where(
+            RequestChangeEvent.company_id == company_id,
+            RequestChangeEvent.seq > since
+        )
+        if team_id:
+            stmt = stmt.where(RequestChangeEvent.team_id == team_id)
+        rows = db.execute(
+            stmt.order_by(RequestChangeEvent.seq).limit(settings.CHANGE_FEED_REPLAY_LIMIT + 1)
+        ).scalars().all()
+    return None if len(rows) > settings.CHANGE_FEED_REPLAY_LIMIT else rows
+
+
+# --- FAN-OUT ---
+
+class Subscriber:
+    def __init__(self, company_id: UUID, team_id: Optional[UUID]):
+        self.company_id = company_id
+        self.team_id = team_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHANGE_FEED_QUEUE_SIZE)
+        self.overflowed = False
+
+    def matches(self, row) -> bool:
+        return row.company_id == self.company_id and (self.team_id is None or row.team_id == self.team_id)
+
+
+class ChangeBroadcaster:
+    """
+    One poller per worker process reads new events and fans them out to every
+    open stream, so the event table is queried once per interval however many
+    clients listen. Commits from this process wake it immediately; commits
+    from other workers are picked up by the next poll.
+    """
+
+    def __init__(self):
+        self.subscribers = set()
+        self.loop = None
+        self.wake_event = None
+        self.task = None
+        self.floor = 0 # every seq <= floor was dispatched (or given up on)
+        self.seen = set() # dispatched seqs above floor
+        self.gaps = {} # missing seq -> when it was first noticed
+        self.last_prune = 0.0
+
+    def wake(self):
+        # Called from request threads after a commit
+        loop, wake_event = self.loop, self.wake_event
+        if loop is None or wake_event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake_event.set)
+        except RuntimeError:
+            pass # event loop already closed
+
+    async def subscribe(self, company_id: UUID, team_id: Optional[UUID]) -> Subscriber:
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop, self.wake_event, self.task = loop, asyncio.Event(), None
+
+        subscriber = Subscriber(company_id, team_id)
+        self.subscribers.add(subscriber)
+        if self.task is None or self.task.done():
+            self.floor, self.seen, self.gaps = await run_in_threadpool(latest_seq), set(), {}
+            self.task = loop.create_task(self.run())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    async def run(self):
+        # Ends with the last subscriber; the next subscribe() starts a new run
+        while self.subscribers:
+            try:
+                await asyncio.wait_for(self.wake_event.wait(), settings.CHANGE_FEED_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self.wake_event.clear()
+            try:
+                while await run_in_threadpool(self.poll) >= POLL_BATCH_SIZE:
+                    pass
+            except Exception:
+                logger.exception("Change feed poll failed")
+
+    def fetch(self) -> list:
+        with db_session.SessionLocal() as db:
+            if time.monotonic() - self.last_prune > PRUNE_INTERVAL_SECONDS:
+                self.last_prune = time.monotonic()
+                cutoff = datetime.utcnow() - timedelta(hours=settings.CHANGE_FEED_RETENTION_HOURS)
+                db.execute(delete(RequestChangeEvent).where(RequestChangeEvent.created_at < cutoff))
+                db.commit()
+            return db.execute(
+                select(RequestChangeEvent).where(RequestChangeEvent.seq > self.floor)
+                .order_by(RequestChangeEvent.seq).limit(POLL_BATCH_SIZE)
+            ).scalars().all()
+
+    def poll(self) -> int:
+        """Runs in a worker thread; hands new events to the loop. Returns the number fetched."""
+        rows = self.fetch()
+        fresh = [row for row in rows if row.seq not in self.seen]
+        if fresh:
+            self.loop.call_soon_threadsafe(self.dispatch, fresh)
+        self.seen.update(row.seq for row in fresh)
+        self.advance_floor()
+        return len(rows)
+
+    def advance_floor(self):
+        now = time.monotonic()
+        highest = max(self.seen, default=self.floor)
+        while self.floor < highest:
+            expected = self.floor + 1
+            if expected in self.seen:
+                self.seen.discard(expected)
+            elif now - self.gaps.setdefault(expected, now) < GAP_TIMEOUT_SECONDS:
+                break # may still commit
+            self.gaps.pop(expected, None)
+            self.floor = expected
+
+    def dispatch(self, rows: list):
+        for row in rows:
+            message = (row.seq, sse_message("change", format_change_event(row), row.seq))
+            for subscriber in list(self.subscribers):
+                if subscriber.overflowed or not subscriber.matches(row):
+                    continue
+                try:
+                    subscriber.queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    subscriber.overflowed = True
+
+
+broadcaster = ChangeBroadcaster()
+
+
+async def change_stream(company_id: UUID, team_id: Optional[UUID], since: Optional[int]):
+    """
+    Server-sent events for one client: missed events after `since` first,
+    then live ones. Events: "change" (id = seq), "ready" once caught up, and
+    "reset" when the client must refetch the list (too far behind).
+    """
+    subscriber = await broadcaster.subscribe(company_id, team_id)
+    try:
+        yield "retry: 3000\n\n"
+
+        replayed = set()
+        missed = await run_in_threadpool(replay_events, company_id, team_id, since) if since is not None else []
+        if missed is None:
+            position = await run_in_threadpool(latest_seq)
+            yield sse_message("reset", {"seq": position}, position)
+        else:
+            for row in missed:
+                replayed.add(row.seq)
+                yield sse_message("change", format_change_event(row), row.seq)
+            position = max(replayed, default=None) or await run_in_threadpool(latest_seq)
+            yield sse_message("ready", {"seq": position}, position)
+
+        while True:
+            if subscriber.overflowed:
+                position = await run_in_threadpool(latest_seq)
+                yield sse_message("reset", {"seq": position}, position)
+                return
+            try:
+                seq, message = await asyncio.wait_for(subscriber.queue.get(), settings.CHANGE_FEED_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if seq not in replayed:
+                yield message
+    finally:
+        broadcaster.unsubscribe(subscriber)
@@ -0,0 +1,302 @@
+import csv
+import math
+import uuid
+from datetime import datetime
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select, func, or_, case, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
+
+from app.models.base import Equipment, EquipmentCategory, Department, User, Team, Company
+from app.services.etag_logic import CATEGORIES_SCOPE, mark_changed
+
+# Shorter terms match too many trigrams to be selective; substring/prefix only
+SEARCH_FUZZY_MIN_LENGTH = 3
+
+# Equipment has two links to users (the employee using it and its default technician)
+Employee = aliased(User)
+Technician = aliased(User)
+
+
+def like_escape(value: str) -> str:
+    # Literal %, _ and \ in user input (matched with escape="\\")
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def equipment_search_condition(search: str, dialect: str):
+    """
+    Name/location substring, serial number prefix and, on PostgreSQL, fuzzy
+    word matches (typos). ILIKE and <% are served by the pg_trgm GIN indexes
+    on equipment; SQLite has no equivalent and scans the company's rows.
+    """
+    term = like_escape(search)
+    conditions = [
+        Equipment.name.ilike(f"%{term}%", escape="\\"),
+        Equipment.location.ilike(f"%{term}%", escape="\\"),
+        Equipment.serial_number.ilike(f"{term}%", escape="\\"),
+    ]
+    if dialect == "postgresql" and len(search) >= SEARCH_FUZZY_MIN_LENGTH:
+        conditions.append(literal(search).op("<%")(Equipment.name))
+    return or_(*conditions)
+
+
+def equipment_search_rank(search: str, dialect: str):
+    """Relevance, higher first: serial matches, then name matches, then location."""
+    term = like_escape(search)
+    exact_and_prefix = [
+        (func.lower(Equipment.serial_number) == search.lower(), 1.0),
+        (Equipment.serial_number.ilike(f"{term}%", escape="\\"), 0.9),
+        (Equipment.name.ilike(f"{term}%", escape="\\"), 0.8),
+    ]
+    if dialect == "postgresql":
+        # word_similarity: 1.0 when the term is a whole word of the name, less for partial/typo matches
+        fallback = func.greatest(
+            func.word_similarity(search, Equipment.name) * 0.7,
+            func.word_similarity(search, func.coalesce(Equipment.location, "")) * 0.3,
+        )
+    else:
+        fallback = case(
+            (Equipment.name.ilike(f"%{term}%", escape="\\"), 0.6),
+            (Equipment.location.ilike(f"%{term}%", escape="\\"), 0.3),
+            else_=0.0,
+        )
+    return case(*exact_and_prefix, else_=fallback)
+
+
+def equipment_list_filters(
+    company_id: UUID, category: Optional[str] = None, search: Optional[str] = None, dialect: str = "postgresql"
+) -> list:
+    conditions = [Equipment.company_id == company_id]
+    if category:
+        conditions.append(EquipmentCategory.name == category)
+    if search and search.strip():
+        conditions.append(equipment_search_condition(search.strip(), dialect))
+    return conditions
+
+
+def equipment_list_order(search: Optional[str] = None, dialect: str = "postgresql") -> list:
+    # Searches are ranked by relevance, plain listings stay alphabetical
+    if search and search.strip():
+        return [equipment_search_rank(search.strip(), dialect).desc(), Equipment.name, Equipment.id]
+    return [Equipment.name, Equipment.id]
+
+
+def equipment_count_statement(conditions: list, category: Optional[str] = None):
+    stmt = select(func.count()).select_from(Equipment)
+    if category:
+        stmt = stmt.join(EquipmentCategory, Equipment.category_id == EquipmentCategory.id)
+    return stmt.where(*conditions)
+
+
+def equipment_page_statement(conditions: list, offset: int, limit: int, order_by: Optional[list] = None):
+    """
+    One page of equipment plus every display name the list shows, resolved
+    with outer joins so the page costs a single query however many rows it has.
+    """
+    return (
+        select(
+            Equipment,
+            EquipmentCategory.name.label("category_name"),
+            Employee.full_name.label("employee_name"),
+            Department.name.label("department_name"),
+            Technician.full_name.label("technician_name"),
+            Team.name.label("team_name"),
+            Company.name.label("company_name"),
+        )
+        .outerjoin(EquipmentCategory, Equipment.category_id == EquipmentCategory.id)
+        .outerjoin(Employee, Equipment.employee_id == Employee.id)
+        .outerjoin(Department, Equipment.department_id == Department.id)
+        .outerjoin(Technician, Equipment.technician_id == Technician.id)
+        .outerjoin(Team, Equipment.team_id == Team.id)
+        .outerjoin(Company, Equipment.company_id == Company.id)
+        .where(*conditions)
+        .order_by(*(order_by or [Equipment.name, Equipment.id]))
+        .offset(offset)
+        .limit(limit)
+    )
+
+
+def format_equipment_row(row) -> dict:
+    eq = row.Equipment
+    return {
+        "id": str(eq.id),
+        "name": eq.name,
+        "category": row.category_name or "General",
+        "serialNumber": eq.serial_number,
+        "model": "Standard Model", # Fallback
+        "manufacturer": "Generic Vendor", # Fallback
+        "purchaseDate": eq.purchase_date.strftime("%Y-%m-%d") if eq.purchase_date else "2024-01-01",
+        "warrantyExpiry": "2026-01-01", # Fallback
+        "purchaseCost": 0.0, # Fallback
+        "assignedEmployeeId": str(eq.employee_id) if eq.employee_id else None,
+        "assignedEmployeeName": row.employee_name or "Unassigned",
+        "department": row.department_name or "General",
+        "technicianId": str(eq.technician_id) if eq.technician_id else None,
+        "technicianName": row.technician_name or "None",
+        "location": eq.location or "Main Facility",
+        "status": "Out of Service" if eq.is_unusable else "Active",
+        "company": row.company_name,
+        "notes": "Maintenance tracking active",
+        "maintenanceTeam": row.team_name or "Default Team",
+        "documents": [], # Placeholder
+        "isActive": True,
+        "createdAt": eq.created_at,
+        "updatedAt": eq.created_at
+    }
+
+
+def equipment_list_data(rows, page: int, limit: int, total: int) -> dict:
+    return {
+        "equipment": [format_equipment_row(row) for row in rows],
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "totalPages": math.ceil(total / limit)
+        }
+    }
+
+
+# --- CSV IMPORT ---
+
+# Rows buffered per INSERT round
+IMPORT_CHUNK_SIZE = 1000
+
+# Error details kept in the report; the count still covers every failed row
+IMPORT_MAX_ERRORS = 1000
+
+IMPORT_REQUIRED_COLUMNS = ("name", "serialNumber", "category", "department")
+
+
+def name_key(value: Optional[str]) -> str:
+    # Names are matched ignoring case and surrounding whitespace
+    return (value or "").strip().casefold()
+
+
+def import_lookups(db, company_id: UUID) -> dict:
+    """Name -> id maps for everything a CSV row may reference, loaded once per import."""
+    def by_name(stmt):
+        names = {}
+        for row_id, name in db.execute(stmt):
+            names.setdefault(name_key(name), row_id)
+        return names
+
+    return {
+        "category": by_name(select(EquipmentCategory.id, EquipmentCategory.name)),
+        "department": by_name(select(Department.id, Department.name).where(Department.company_id == company_id)),
+        "team": by_name(select(Team.id, Team.name).where(Team.company_id == company_id)),
+    }
+
+
+def parse_purchase_date(value: str) -> datetime:
+    # Accepts "2024-05-31" as well as full ISO timestamps
+    return datetime.fromisoformat(value.strip().replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def insert_equipment_statement(dialect: str):
+    """
+    INSERT that skips rows whose serial number is already taken (by any
+    company: serial_number is globally unique) and returns the serials it
+    did insert, so collisions are found in bulk without a lookup query.
+    """
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    table = Equipment.__table__
+    return insert(table).on_conflict_do_nothing(index_elements=["serial_number"]).returning(table.c.serial_number)
+
+
+def import_equipment_csv(db, lines: Iterable[str], company_id: UUID, default_team_id: Optional[UUID] = None) -> dict:
+    """
+    Creates equipment from CSV text (header: name, serialNumber, category,
+    department and optionally team, location, purchaseDate). The input is read
+    row by row and inserted in chunks, so memory doesn't grow with the file.
+    Serial numbers that are taken, in the database or by an earlier row of the
+    file, are found by the unique index (insert_equipment_statement) rather
+    than remembered. Bad rows are reported by their line number and skipped;
+    the rest are committed together at the end.
+    """
+    reader = csv.DictReader(lines)
+    missing = [column for column in IMPORT_REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Missing CSV columns: {', '.join(missing)}")
+
+    lookups = import_lookups(db, company_id)
+    dialect = db.get_bind().dialect.name
+    statement = insert_equipment_statement(dialect)
+    stats = {"rows": 0, "created": 0, "errorCount": 0, "errors": []}
+    now = datetime.utcnow()
+
+    def error(line: int, detail: str):
+        stats["errorCount"] += 1
+        if len(stats["errors"]) < IMPORT_MAX_ERRORS:
+            stats["errors"].append({"row": line, "detail": detail})
+
+    def flush(chunk):
+        # chunk: [(line, row values)]. A serial repeated within the chunk is
+        # inserted once, for its first line; the later lines are errors.
+        inserted = set(db.execute(statement, [values for _, values in chunk]).scalars())
+        stats["created"] += len(inserted)
+        if inserted:
+            mark_changed(db, company_id, CATEGORIES_SCOPE)
+        for line, values in chunk:
+            serial = values["serial_number"]
+            if serial in inserted:
+                inserted.discard(serial)
+            else:
+                error(line, f"Serial number '{serial}' already exists or appears earlier in the file")
+
+    pending = []
+    for row in reader:
+        stats["rows"] += 1
+        line = reader.line_num
+        name = (row.get("name") or "").strip()
+        serial = (row.get("serialNumber") or "").strip()
+
+        # 1. Required values (duplicates are caught on insert)
+        if not name or not serial:
+            error(line, "name and serialNumber are required")
+            continue
+
+        # 2. Names -> ids from the in-memory maps
+        category_id = lookups["category"].get(name_key(row.get("category")))
+        department_id = lookups["department"].get(name_key(row.get("department")))
+        team_id = lookups["team"].get(name_key(row.get("team"))) if row.get("team") else default_team_id
+        if not category_id:
+            error(line, f"Unknown category '{row.get('category')}'")
+            continue
+        if not department_id:
+            error(line, f"Unknown department '{row.get('department')}'")
+            continue
+        if not team_id:
+            error(line, f"Unknown team '{row.get('team')}'" if row.get("team") else "team is required")
+            continue
+
+        try:
+            purchase_date = parse_purchase_date(row["purchaseDate"]) if row.get("purchaseDate") else now
+        except ValueError:
+            error(line, f"Invalid purchaseDate '{row['purchaseDate']}'")
+            continue
+
+        pending.append((line, {
+            "id": uuid.uuid4(),
+            "name": name,
+            "serial_number": serial,
+            "category_id": category_id,
+            "department_id": department_id,
+            "company_id": company_id,
+            "team_id": team_id,
+            "location": (row.get("location") or "").strip() or None,
+            "purchase_date": purchase_date,
+            "is_unusable": False,
+            "created_at": now,
+        }))
+        if len(pending) >= IMPORT_CHUNK_SIZE:
+            flush(pending)
+            pending = []
+
+    if pending:
+        flush(pending)
+    db.commit()
+    stats["errors"].sort(key=lambda e: e["row"])
+    return stats
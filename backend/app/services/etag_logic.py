@@ -0,0 +1,114 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+from sqlalchemy import select, func, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.base import DataVersion, Equipment, EquipmentCategory
+
+# Scopes a session wrote to; bumped right before it commits
+CHANGED_KEY = "etag_changed_scopes"
+
+# Scope of the category list, which counts equipment of every company
+CATEGORIES_SCOPE = "categories"
+
+# Browsers and proxies must revalidate, which is what makes the 304 path useful
+REVALIDATE = "private, no-cache"
+
+
+# --- WRITING ---
+
+def mark_changed(db, *scopes):
+    """Registers scopes (company ids or CATEGORIES_SCOPE) whose version this transaction bumps."""
+    db.info.setdefault(CHANGED_KEY, set()).update(str(scope) for scope in scopes if scope)
+
+
+def object_scopes(obj) -> list:
+    scopes = [getattr(obj, "company_id", None)]
+    if isinstance(obj, (Equipment, EquipmentCategory)):
+        scopes.append(CATEGORIES_SCOPE)
+    return scopes
+
+
+@event.listens_for(Session, "before_flush")
+def collect_flushed_scopes(session, flush_context, instances):
+    # ORM writes register themselves; Core INSERT/UPDATE paths call mark_changed
+    for obj in [*session.new, *session.deleted, *session.dirty]:
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        mark_changed(session, *object_scopes(obj))
+
+
+@event.listens_for(Session, "before_commit")
+def bump_before_commit(session):
+    # Flush first: commit() only flushes after this hook, and pending ORM
+    # objects register their scopes while flushing
+    session.flush()
+    scopes = session.info.pop(CHANGED_KEY, None)
+    if scopes:
+        # Last statement of the transaction, so the version rows stay locked
+        # only briefly. Sorted to take the locks in the same order everywhere.
+        connection = session.connection()
+        for scope in sorted(scopes):
+            connection.execute(bump_version_statement(connection.dialect.name, scope))
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_after_rollback(session):
+    session.info.pop(CHANGED_KEY, None)
+
+
+def bump_version_statement(dialect: str, scope: str):
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(DataVersion).values(scope=scope, version=1)
+    return stmt.on_conflict_do_update(
+        index_elements=["scope"],
+        set_={"version": DataVersion.version + 1}
+    )
+
+
+# --- READING ---
+
+def version_statement(scope):
+    return select(func.coalesce(func.max(DataVersion.version), 0)).where(DataVersion.scope == str(scope))
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode(), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are the same validator
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": REVALIDATE})
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE
+
+
+def scope_etag(db, name: str, scope, *parts) -> str:
+    """
+    ETag for a read that only depends on data of one scope. Call it before
+    loading the data: a write committing in between then leaves an ETag older
+    than the body, which costs one extra full response but is never stale.
+    """
+    version = db.execute(version_statement(scope)).scalar_one()
+    return make_etag(name, scope, version, *parts)
+
+
+async def scope_etag_async(db, name: str, scope, *parts) -> str:
+    version = (await db.execute(version_statement(scope))).scalar_one()
+    return make_etag(name, scope, version, *parts)
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+from typing import Iterator
+
+from sqlalchemy import select
+
+from app.models.base import MaintenanceRequest, MaintenanceStage, PRIORITY_REVERSE_MAP
+
+# Rows per server-side cursor fetch; also the size of each streamed chunk
+EXPORT_BATCH_SIZE = 2000
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Export field -> column, in output order (same names as the list endpoint)
+EXPORT_COLUMNS = {
+    "id": MaintenanceRequest.id,
+    "subject": MaintenanceRequest.subject,
+    "status": MaintenanceRequest.stage,
+    "maintenanceType": MaintenanceRequest.request_type,
+    "priority": MaintenanceRequest.priority,
+    "equipmentId": MaintenanceRequest.equipment_id,
+    "workCenter": MaintenanceRequest.workcenter_id,
+    "teamId": MaintenanceRequest.team_id,
+    "technicianId": MaintenanceRequest.technician_id,
+    "categoryId": MaintenanceRequest.category_id,
+    "scheduledDate": MaintenanceRequest.scheduled_date,
+    "duration": MaintenanceRequest.duration,
+    "notes": MaintenanceRequest.description,
+    "instructions": MaintenanceRequest.instructions,
+    "isBlocked": MaintenanceRequest.is_blocked,
+    "isArchived": MaintenanceRequest.is_archived,
+    "isActive": MaintenanceRequest.is_active,
+    "createdAt": MaintenanceRequest.created_at,
+    "updatedAt": MaintenanceRequest.updated_at,
+}
+
+
+def export_statement(conditions: list):
+    # Plain columns instead of ORM entities: nothing to track in the session
+    # and no identity map growing with the export
+    return select(*EXPORT_COLUMNS.values()).where(*conditions).order_by(
+        MaintenanceRequest.created_at, MaintenanceRequest.id
+    )
+
+
+def format_export_row(row) -> dict:
+    (request_id, subject, stage, request_type, priority, equipment_id, workcenter_id, team_id,
+     technician_id, category_id, scheduled_date, duration, notes, instructions,
+     is_blocked, is_archived, is_active, created_at, updated_at) = row
+    return {
+        "id": str(request_id),
+        "subject": subject,
+        "status": "completed" if stage == MaintenanceStage.REPAIRED else stage.value,
+        "maintenanceType": request_type.value,
+        "priority": PRIORITY_REVERSE_MAP.get(priority, "low"),
+        "equipmentId": str(equipment_id) if equipment_id else None,
+        "workCenter": str(workcenter_id) if workcenter_id else None,
+        "teamId": str(team_id),
+        "technicianId": str(technician_id) if technician_id else None,
+        "categoryId": str(category_id),
+        "scheduledDate": scheduled_date.isoformat() if scheduled_date else None,
+        "duration": duration,
+        "notes": notes,
+        "instructions": instructions,
+        "isBlocked": is_blocked,
+        "isArchived": is_archived,
+        "isActive": is_active,
+        "createdAt": created_at.isoformat() if created_at else None,
+        "updatedAt": updated_at.isoformat() if updated_at else None,
+    }
+
+
+def export_batches(db, stmt) -> Iterator[list]:
+    """
+    Formatted rows, EXPORT_BATCH_SIZE at a time. yield_per turns on
+    stream_results, so PostgreSQL reads through a server-side cursor and
+    only one batch is ever held in memory.
+    """
+    result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    try:
+        for partition in result.partitions():
+            yield [format_export_row(row) for row in partition]
+    finally:
+        # Also runs when the client disconnects mid-download
+        result.close()
+
+
+def csv_chunks(batches: Iterator[list]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(EXPORT_COLUMNS))
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(batches: Iterator[list]) -> Iterator[bytes]:
+    for batch in batches:
+        yield "".join(json.dumps(item) + "\n" for item in batch).encode()
+
+
+def export_chunks(db, stmt, export_format: str) -> Iterator[bytes]:
+    batches = export_batches(db, stmt)
+    return csv_chunks(batches) if export_format == "csv" else ndjson_chunks(batches)
@@ -0,0 +1,792 @@
+import base64
+import json
+import math
+import uuid
+from types import SimpleNamespace
+from datetime import datetime, timezone, timedelta
+from typing import Optional
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import select, update, func, tuple_, and_, bindparam
+from sqlalchemy.exc import CompileError
+from sqlalchemy.orm import joinedload
+
+from app.core.cache import ResponseCache, response_cache_backend
+from app.core.config import settings
+from app.models.base import (
+    User, Team, Equipment, EquipmentCategory, Workcenter, MaintenanceRequest, MaintenanceStage, RequestType,
+    RequestDailyRollup, UserRole, PRIORITY_MAP, PRIORITY_REVERSE_MAP
+)
+from app.schemas.maintenance import RequestCreate
+from app.services.rollup_logic import rollup_covered, rollup_covered_async, rollup_entry, apply_rollup
+from app.services.change_feed import record_changes
+from app.services.etag_logic import version_statement
+
+# Stages that still need work (used by "open" and "overdue" metrics)
+OPEN_STAGES = [MaintenanceStage.NEW, MaintenanceStage.IN_PROGRESS]
+
+# Assuming 1 technician can comfortably handle 3 active tasks
+TECHNICIAN_CAPACITY = 3
+
+# Dashboard numbers per company and data version (see cached_dashboard_data)
+dashboard_cache = ResponseCache("dashboard", response_cache_backend, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+def open_stage_filter():
+    """
+    stage IN ('NEW', 'IN_PROGRESS') with the stages rendered inline instead of
+    bound, so the planner can match the open_* partial indexes' predicate.
+    """
+    return MaintenanceRequest.stage.in_(bindparam(
+        "open_stages", OPEN_STAGES, type_=MaintenanceRequest.stage.type,
+        expanding=True, literal_execute=True, unique=True
+    ))
+
+
+def utc_now() -> datetime:
+    # Our DateTime columns are naive and hold UTC values
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Our DateTime columns are naive UTC; accept "...Z" / "+02:00" bounds too
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# --- DASHBOARD AGGREGATION ---
+
+def dashboard_counts_statement(company_id: UUID, now: datetime, use_rollup: bool = False):
+    """
+    Single SELECT returning every dashboard counter for a company.
+    Stage/overdue counts use COUNT(*) FILTER (...) over one scan of the company's
+    requests; critical equipment and technicians ride along as scalar subqueries.
+    With use_rollup the stage counts are summed from the daily rollup instead
+    and only overdue (which depends on now) still reads open requests.
+    """
+    critical_count = select(func.count()).select_from(Equipment).where(
+        Equipment.company_id == company_id,
+        Equipment.is_unusable == True
+    ).scalar_subquery()
+
+    technician_count = select(func.count()).select_from(User).where(
+        User.company_id == company_id,
+        User.role == UserRole.TECHNICIAN
+    ).scalar_subquery()
+
+    overdue = and_(
+        open_stage_filter(),
+        MaintenanceRequest.scheduled_date < now
+    )
+    active_requests = [
+        MaintenanceRequest.company_id == company_id,
+        MaintenanceRequest.is_active == True
+    ]
+
+    if use_rollup:
+        def rollup_stage_count(stage):
+            return select(func.coalesce(func.sum(RequestDailyRollup.request_count), 0)).where(
+                RequestDailyRollup.company_id == company_id,
+                RequestDailyRollup.stage == stage
+            ).scalar_subquery()
+
+        overdue_count = select(func.count()).select_from(MaintenanceRequest).where(
+            *active_requests, overdue
+        ).scalar_subquery()
+
+        return select(
+            rollup_stage_count(MaintenanceStage.NEW).label("new"),
+            rollup_stage_count(MaintenanceStage.IN_PROGRESS).label("in_progress"),
+            overdue_count.label("overdue"),
+            critical_count.label("critical"),
+            technician_count.label("technicians"),
+        )
+
+    return select(
+        func.count().filter(MaintenanceRequest.stage == MaintenanceStage.NEW).label("new"),
+        func.count().filter(MaintenanceRequest.stage == MaintenanceStage.IN_PROGRESS).label("in_progress"),
+        func.count().filter(overdue).label("overdue"),
+        critical_count.label("critical"),
+        technician_count.label("technicians"),
+    ).where(*active_requests)
+
+
+def critical_items_statement(company_id: UUID):
+    # Only the columns the dashboard card shows, no ORM entities
+    return select(Equipment.id, Equipment.name).where(
+        Equipment.company_id == company_id,
+        Equipment.is_unusable == True
+    )
+
+
+def build_dashboard_data(counts, critical_rows) -> dict:
+    new_count = counts.new or 0
+    in_progress_count = counts.in_progress or 0
+    total_techs = counts.technicians or 0
+    active_requests_count = new_count + in_progress_count
+
+    # Logic for load percentage: (Active Tasks / (Capacity per tech * Total Techs))
+    if total_techs > 0:
+        load_percentage = min(int((active_requests_count / (total_techs * TECHNICIAN_CAPACITY)) * 100), 100)
+    else:
+        load_percentage = 0
+
+    return {
+        "criticalEquipment": {
+            "count": counts.critical or 0,
+            "items": [
+                {"id": row.id, "name": row.name, "status": "Out of Service"}
+                for row in critical_rows
+            ]
+        },
+        "technicianLoad": {
+            "percentage": load_percentage,
+            "totalTechnicians": total_techs,
+            "activeRequests": active_requests_count
+        },
+        "openRequests": {
+            "total": active_requests_count,
+            "overdue": counts.overdue or 0,
+            "new": new_count,
+            "inProgress": in_progress_count
+        }
+    }
+
+
+def get_dashboard_data(db, company_id: UUID) -> dict:
+    use_rollup = rollup_covered(db, company_id)
+    counts = db.execute(dashboard_counts_statement(company_id, utc_now(), use_rollup)).one()
+
+    # The item list is only fetched when there is something to show
+    critical_rows = []
+    if counts.critical:
+        critical_rows = db.execute(critical_items_statement(company_id)).all()
+
+    return build_dashboard_data(counts, critical_rows)
+
+
+async def get_dashboard_data_async(db, company_id: UUID) -> dict:
+    use_rollup = await rollup_covered_async(db, company_id)
+    counts = (await db.execute(dashboard_counts_statement(company_id, utc_now(), use_rollup))).one()
+
+    critical_rows = []
+    if counts.critical:
+        critical_rows = (await db.execute(critical_items_statement(company_id))).all()
+
+    return build_dashboard_data(counts, critical_rows)
+
+
+def next_overdue_statement(company_id: UUID, now: datetime):
+    """
+    When the overdue count changes next without any write: the earliest open
+    request still scheduled in the future (open_scheduled index).
+    """
+    return select(func.min(MaintenanceRequest.scheduled_date)).where(
+        MaintenanceRequest.company_id == company_id,
+        MaintenanceRequest.is_active == True,
+        open_stage_filter(),
+        MaintenanceRequest.scheduled_date >= now
+    )
+
+
+def dashboard_version(db, company_id: UUID, now: datetime) -> str:
+    """
+    Changes whenever the dashboard numbers may: on any write in the company
+    (data version) and when the next open request turns overdue. Read it
+    before the data, see etag_logic.scope_etag.
+    """
+    version = db.execute(version_statement(company_id)).scalar_one()
+    next_overdue = db.execute(next_overdue_statement(company_id, now)).scalar()
+    return f"{version}:{next_overdue.isoformat() if next_overdue else '-'}"
+
+
+async def dashboard_version_async(db, company_id: UUID, now: datetime) -> str:
+    version = (await db.execute(version_statement(company_id))).scalar_one()
+    next_overdue = (await db.execute(next_overdue_statement(company_id, now))).scalar()
+    return f"{version}:{next_overdue.isoformat() if next_overdue else '-'}"
+
+
+def cached_dashboard_data(db, company_id: UUID, version: str) -> dict:
+    # Keyed by the version, so a write makes the old entry unreachable
+    key = f"{company_id}:{version}"
+    data = dashboard_cache.get(key)
+    if data is None:
+        data = get_dashboard_data(db, company_id)
+        dashboard_cache.set(key, data)
+    return data
+
+
+async def cached_dashboard_data_async(db, company_id: UUID, version: str) -> dict:
+    key = f"{company_id}:{version}"
+    data = await dashboard_cache.get_async(key)
+    if data is None:
+        data = await get_dashboard_data_async(db, company_id)
+        await dashboard_cache.set_async(key, data)
+    return data
+
+
+# --- TECHNICIAN STATISTICS ---
+
+def technician_stats_statement(technician_ids: list):
+    """
+    Active/completed counts and average completion time for many technicians,
+    grouped by technician_id in one pass over maintenance_requests.
+    """
+    return select(
+        MaintenanceRequest.technician_id,
+        func.count().filter(open_stage_filter()).label("active"),
+        func.count().filter(MaintenanceRequest.stage == MaintenanceStage.REPAIRED).label("completed"),
+        # Requests closed without logged hours don't drag the average down
+        func.avg(MaintenanceRequest.duration).filter(and_(
+            MaintenanceRequest.stage == MaintenanceStage.REPAIRED,
+            MaintenanceRequest.duration > 0
+        )).label("avg_duration"),
+    ).where(
+        MaintenanceRequest.technician_id.in_(technician_ids)
+    ).group_by(MaintenanceRequest.technician_id)
+
+
+# --- REQUEST LIST ---
+
+# Status sent by the Kanban board on update -> stage
+STATUS_STAGE_MAP = {
+    "new": MaintenanceStage.NEW,
+    "in-progress": MaintenanceStage.IN_PROGRESS,
+    "completed": MaintenanceStage.REPAIRED,
+    "scrap": MaintenanceStage.SCRAP
+}
+
+# Query-string status -> stage, as used by the list filters
+STATUS_FILTER_MAP = {"new": MaintenanceStage.NEW, "in-progress": MaintenanceStage.IN_PROGRESS}
+
+
+def request_list_filters(
+    company_id: UUID,
+    is_active: bool = True,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    equipment_id: Optional[UUID] = None,
+    team_id: Optional[UUID] = None,
+) -> list:
+    """WHERE clauses shared by every endpoint that lists requests like GET /maintenance/requests."""
+    conditions = [
+        MaintenanceRequest.company_id == company_id,
+        MaintenanceRequest.is_active == is_active
+    ]
+
+    # 1. Filter by Status (Handling the "Overdue" special case)
+    if status:
+        if status == "overdue":
+            conditions.append(open_stage_filter())
+            conditions.append(MaintenanceRequest.scheduled_date < utc_now())
+        elif status == "completed":
+            conditions.append(MaintenanceRequest.stage == MaintenanceStage.REPAIRED)
+        elif status in STATUS_FILTER_MAP:
+            conditions.append(MaintenanceRequest.stage == STATUS_FILTER_MAP[status])
+
+    # 2. Filter by Priority (Map string to Integer)
+    if priority in PRIORITY_MAP:
+        conditions.append(MaintenanceRequest.priority == PRIORITY_MAP[priority])
+
+    # 3. Specific ID Filters
+    if equipment_id:
+        conditions.append(MaintenanceRequest.equipment_id == equipment_id)
+    if team_id:
+        conditions.append(MaintenanceRequest.team_id == team_id)
+
+    return conditions
+
+
+def format_request_item(req) -> dict:
+    return {
+        "id": str(req.id),
+        "subject": req.subject,
+        "equipmentId": req.equipment_id,
+        "teamId": req.team_id,
+        "technicianId": req.technician_id,
+        "categoryId": req.category_id,
+        "companyId": req.company_id,
+        "maintenanceFor": "equipment" if req.equipment_id else "workcenter",
+        "workCenter": req.workcenter_id,
+        "maintenanceType": req.request_type.value,
+        "priority": PRIORITY_REVERSE_MAP.get(req.priority, "low"),
+        "status": "completed" if req.stage == MaintenanceStage.REPAIRED else req.stage.value,
+        "requestDate": req.created_at,
+        "scheduledDate": req.scheduled_date,
+        "duration": req.duration,
+        "notes": req.description,
+        "instructions": req.instructions,
+        "isBlocked": req.is_blocked,
+        "isArchived": req.is_archived,
+        "isActive": req.is_active,
+        "createdAt": req.created_at,
+        "updatedAt": req.updated_at,
+    }
+
+
+# --- CALENDAR ---
+
+# Widest window one calendar call may ask for
+CALENDAR_MAX_DAYS = 366
+
+
+def calendar_statement(
+    company_id: UUID,
+    start: datetime,
+    end: datetime,
+    team_id: Optional[UUID] = None,
+    technician_id: Optional[UUID] = None,
+):
+    """Scheduled preventive requests in [start, end), only the columns an event needs."""
+    conditions = [
+        MaintenanceRequest.company_id == company_id,
+        MaintenanceRequest.is_active == True,
+        MaintenanceRequest.request_type == RequestType.PREVENTIVE,
+        MaintenanceRequest.scheduled_date >= start,
+        MaintenanceRequest.scheduled_date < end,
+    ]
+    if team_id:
+        conditions.append(MaintenanceRequest.team_id == team_id)
+    if technician_id:
+        conditions.append(MaintenanceRequest.technician_id == technician_id)
+
+    return select(
+        MaintenanceRequest.id,
+        MaintenanceRequest.subject,
+        MaintenanceRequest.scheduled_date,
+        MaintenanceRequest.duration,
+        MaintenanceRequest.priority,
+        MaintenanceRequest.stage,
+        MaintenanceRequest.equipment_id,
+        MaintenanceRequest.technician_id,
+    ).where(*conditions).order_by(MaintenanceRequest.scheduled_date, MaintenanceRequest.id)
+
+
+def format_calendar_event(row) -> dict:
+    return {
+        "id": row.id,
+        "subject": row.subject,
+        "scheduledDate": row.scheduled_date,
+        "duration": row.duration,
+        "priority": PRIORITY_REVERSE_MAP.get(row.priority, "low"),
+        "status": "completed" if row.stage == MaintenanceStage.REPAIRED else row.stage.value,
+        "equipmentId": row.equipment_id,
+        "technicianId": row.technician_id,
+    }
+
+
+def request_detail_options():
+    # Nested objects shown on the detail view, loaded in the same query
+    return (
+        joinedload(MaintenanceRequest.equipment),
+        joinedload(MaintenanceRequest.team),
+        joinedload(MaintenanceRequest.technician)
+    )
+
+
+def format_request_detail(request) -> dict:
+    # Status mapping logic (Matching your JSON example)
+    if request.stage == MaintenanceStage.REPAIRED:
+        status_str = "completed"
+    else:
+        status_str = request.stage.value
+
+    return {
+        "id": request.id,
+        "subject": request.subject,
+        "equipmentId": request.equipment_id,
+        "equipment": request.equipment,
+        "teamId": request.team_id,
+        "team": request.team,
+        "technicianId": request.technician_id,
+        # For the technician, we map our User model fields to match your JSON
+        "technician": {
+            "id": request.technician.id,
+            "userId": request.technician.id, # Using ID as userId
+            "full_name": request.technician.full_name,
+            "email": request.technician.email
+        } if request.technician else None,
+        "priority": PRIORITY_REVERSE_MAP.get(request.priority, "low"),
+        "status": status_str,
+        "request_type": request.request_type.value,
+        "created_at": request.created_at,
+        "description": request.description,
+        "updated_at": request.updated_at
+    }
+
+
+def offset_list_data(rows, page: int, limit: int, total: Optional[int]) -> dict:
+    return {
+        "requests": [format_request_item(req) for req in rows],
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "totalPages": math.ceil(total / limit) if total else 0
+        }
+    }
+
+
+def cursor_list_data(rows, limit: int, total: Optional[int], count_mode: str) -> dict:
+    """rows must have been fetched with limit + 1 so we know whether a next page exists."""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return {
+        "requests": [format_request_item(req) for req in rows],
+        "pagination": {
+            "limit": limit,
+            "nextCursor": next_cursor,
+            "hasMore": has_more,
+            "total": total,
+            "totalIsEstimate": count_mode == "estimated"
+        }
+    }
+
+
+# --- KEYSET CURSORS ---
+
+def encode_cursor(timestamp: datetime, row_id: UUID) -> str:
+    """Opaque continuation token for a (timestamp, id) keyset position."""
+    raw = json.dumps([timestamp.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def newest_first_keyset(query, cursor: Optional[str]):
+    """Orders by (created_at, id) DESC and, when given a cursor, seeks past it."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(MaintenanceRequest.created_at, MaintenanceRequest.id) < tuple_(created_at, row_id)
+        )
+    return query.order_by(MaintenanceRequest.created_at.desc(), MaintenanceRequest.id.desc())
+
+
+# --- DELTA SYNC ---
+
+# updated_at is set when the row is written, not when its transaction commits,
+# so a slow commit can land behind a position a client already read. The last
+# page's token therefore never moves past this many seconds ago; the rows
+# inside that window come back again on the next call (clients upsert by id).
+CHANGES_SETTLE_SECONDS = 5
+
+
+def changes_statement(company_id: UUID, since: Optional[str], limit: int):
+    """
+    Requests created, updated or soft-deleted after the `since` token, oldest
+    change first. Tombstones (is_active=False) are included so clients can drop
+    them. Fetches limit + 1 rows. Raises ValueError on a malformed token.
+    """
+    stmt = select(MaintenanceRequest).where(MaintenanceRequest.company_id == company_id)
+    if since:
+        updated_at, row_id = decode_cursor(since)
+        stmt = stmt.where(tuple_(MaintenanceRequest.updated_at, MaintenanceRequest.id) > tuple_(updated_at, row_id))
+    return stmt.order_by(MaintenanceRequest.updated_at, MaintenanceRequest.id).limit(limit + 1)
+
+
+def changes_data(rows, limit: int, since: Optional[str]) -> dict:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if rows:
+        position = (rows[-1].updated_at, rows[-1].id)
+    elif since:
+        position = decode_cursor(since)
+    else:
+        position = None
+    if not has_more:
+        settled = (utc_now() - timedelta(seconds=CHANGES_SETTLE_SECONDS), UUID(int=0))
+        position = min(position, settled) if position else settled
+
+    return {
+        "requests": [format_request_item(req) for req in rows],
+        "nextToken": encode_cursor(*position),
+        "hasMore": has_more,
+    }
+
+
+# --- COUNTS ---
+
+def estimated_count(db, query) -> int:
+    """
+    Planner row estimate for a query (PostgreSQL EXPLAIN), which costs no scan.
+    Other databases have no usable estimate, so they get an exact COUNT instead.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return query.count()
+
+    try:
+        compiled = query.statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    except CompileError:
+        return query.count()
+    plan = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+# --- CREATE (single and bulk) ---
+
+# Rows buffered per INSERT round in bulk creates
+BULK_CHUNK_SIZE = 1000
+
+
+def parse_duration_hours(duration: Optional[str]) -> int:
+    # Duration Parsing: "01:30" -> whole hours, rounding up past the half hour
+    try:
+        hours, minutes = map(int, duration.split(":"))
+        return hours + (1 if minutes > 30 else 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0
+
+
+def request_create_values(req_in, company_id: UUID, created_by_id: UUID, equipment=None) -> dict:
+    """
+    Column values for a new request from a RequestCreate. `equipment` (anything
+    with team_id/category_id) fills in a missing team or category.
+    Raises ValueError with a user-facing message when the input is incomplete.
+    """
+    # 1. Must have either Equipment or Workcenter
+    if not req_in.equipmentId and not req_in.workcenterId:
+        raise ValueError("Must provide either an Equipment ID or a Workcenter ID")
+
+    # 2. AUTO-FILL from the equipment
+    team_id = req_in.teamId or (equipment.team_id if equipment else None)
+    category_id = req_in.categoryId or (equipment.category_id if equipment else None)
+    if not team_id or not category_id:
+        raise ValueError("Maintenance Team and Category are required.")
+
+    return {
+        "subject": req_in.subject,
+        "description": req_in.notes,
+        "instructions": req_in.instructions,
+        "request_type": RequestType.CORRECTIVE if req_in.maintenanceType == "corrective" else RequestType.PREVENTIVE,
+        "stage": MaintenanceStage.NEW,
+        "priority": PRIORITY_MAP.get(req_in.priority, 2),
+        "scheduled_date": req_in.scheduledDate,
+        "duration": parse_duration_hours(req_in.duration),
+        "equipment_id": req_in.equipmentId,
+        "workcenter_id": req_in.workcenterId,
+        "team_id": team_id,
+        "category_id": category_id,
+        "technician_id": req_in.technicianId,
+        "company_id": company_id,
+        "created_by_id": created_by_id,
+    }
+
+
+def existing_ids(db, model, ids: set, company_id: Optional[UUID] = None) -> set:
+    """Which of `ids` exist (optionally within a company), in one IN query."""
+    if not ids:
+        return set()
+    query = select(model.id).where(model.id.in_(ids))
+    if company_id is not None:
+        query = query.where(model.company_id == company_id)
+    return set(db.execute(query).scalars())
+
+
+def bulk_create_requests(db, items: list, company_id: UUID, created_by_id: UUID) -> dict:
+    """
+    Creates many requests in one transaction. Every item is validated on its
+    own and failures are reported by index instead of aborting the batch;
+    references are checked with one IN query per table so the inserts can't
+    hit a foreign key error halfway through.
+    """
+    errors = []
+    parsed = []
+
+    # 1. Schema validation per item
+    for index, item in enumerate(items):
+        try:
+            parsed.append((index, RequestCreate.model_validate(item)))
+        except ValidationError as e:
+            first = e.errors()[0]
+            location = ".".join(str(part) for part in first["loc"])
+            errors.append({"index": index, "detail": f"{location}: {first['msg']}" if location else first["msg"]})
+
+    # 2. Every referenced row, one IN query per table
+    equipment = {
+        row.id: row for row in db.execute(
+            select(Equipment.id, Equipment.team_id, Equipment.category_id).where(
+                Equipment.id.in_({r.equipmentId for _, r in parsed if r.equipmentId}),
+                Equipment.company_id == company_id
+            )
+        )
+    }
+    teams = existing_ids(db, Team, {r.teamId for _, r in parsed if r.teamId}, company_id)
+    technicians = existing_ids(db, User, {r.technicianId for _, r in parsed if r.technicianId}, company_id)
+    workcenters = existing_ids(db, Workcenter, {r.workcenterId for _, r in parsed if r.workcenterId}, company_id)
+    categories = existing_ids(db, EquipmentCategory, {r.categoryId for _, r in parsed if r.categoryId})
+
+    # 3. Build the rows
+    now = utc_now()
+    rows, created = [], []
+    for index, req_in in parsed:
+        problem = None
+        if req_in.equipmentId and req_in.equipmentId not in equipment:
+            problem = "Equipment not found"
+        elif req_in.teamId and req_in.teamId not in teams:
+            problem = "Team not found"
+        elif req_in.technicianId and req_in.technicianId not in technicians:
+            problem = "Technician not found"
+        elif req_in.workcenterId and req_in.workcenterId not in workcenters:
+            problem = "Workcenter not found"
+        elif req_in.categoryId and req_in.categoryId not in categories:
+            problem = "Category not found"
+        if problem:
+            errors.append({"index": index, "detail": problem})
+            continue
+
+        try:
+            values = request_create_values(req_in, company_id, created_by_id, equipment.get(req_in.equipmentId))
+        except ValueError as e:
+            errors.append({"index": index, "detail": str(e)})
+            continue
+
+        request_id = uuid.uuid4()
+        rows.append({**values, "id": request_id, "created_at": now, "updated_at": now, "is_active": True})
+        created.append({"index": index, "id": request_id})
+
+    # 4. Chunked bulk INSERTs (executemany -> multi-row VALUES), one commit
+    table = MaintenanceRequest.__table__
+    for start in range(0, len(rows), BULK_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_CHUNK_SIZE]
+        db.execute(table.insert(), chunk)
+        created_rows = [SimpleNamespace(**row) for row in chunk]
+        apply_rollup(db, added=[rollup_entry(row) for row in created_rows])
+        record_changes(db, "created", created_rows)
+    db.commit()
+
+    return {
+        "created": created,
+        "errors": sorted(errors, key=lambda e: e["index"]),
+        "createdCount": len(created),
+        "errorCount": len(errors),
+    }
+
+
+# --- BULK UPDATE / DELETE ---
+
+# Columns RETURNING-ed by bulk writes: enough for rollup_entry() and the response
+BULK_RETURNING = (
+    MaintenanceRequest.id, MaintenanceRequest.company_id, MaintenanceRequest.created_at,
+    MaintenanceRequest.team_id, MaintenanceRequest.category_id, MaintenanceRequest.stage,
+    MaintenanceRequest.request_type, MaintenanceRequest.duration, MaintenanceRequest.is_active
+)
+
+
+def bulk_target_conditions(company_id: UUID, ids: Optional[list] = None, filters=None) -> list:
+    """WHERE clauses for a bulk write: explicit ids, or the list endpoint's filters."""
+    if ids:
+        return [MaintenanceRequest.company_id == company_id, MaintenanceRequest.id.in_(ids)]
+    return request_list_filters(
+        company_id,
+        is_active=filters.isActive,
+        status=filters.status,
+        priority=filters.priority,
+        equipment_id=filters.equipmentId,
+        team_id=filters.teamId
+    )
+
+
+def bulk_update_values(changes) -> dict:
+    """Column values for a RequestUpdate; ValueError on unknown status/priority."""
+    values = {}
+    if changes.status:
+        if changes.status not in STATUS_STAGE_MAP:
+            raise ValueError(f"Unknown status '{changes.status}'")
+        values["stage"] = STATUS_STAGE_MAP[changes.status]
+    if changes.priority:
+        if changes.priority not in PRIORITY_MAP:
+            raise ValueError(f"Unknown priority '{changes.priority}'")
+        values["priority"] = PRIORITY_MAP[changes.priority]
+    if changes.technicianId:
+        values["technician_id"] = changes.technicianId
+    if changes.scheduledDate:
+        values["scheduled_date"] = as_naive_utc(changes.scheduledDate)
+    if changes.notes:
+        values["description"] = changes.notes
+    if not values:
+        raise ValueError("No changes given")
+    return values
+
+
+def bulk_update_requests(db, company_id: UUID, conditions: list, values: dict) -> list:
+    """
+    Applies `values` to every matching request with set-based UPDATEs and
+    returns the updated ids. A stage change runs one UPDATE per current stage
+    so RETURNING tells the rollup exactly what moved where; scrapping marks
+    the equipment unusable with a single UPDATE ... WHERE id IN (subquery).
+    Commits once at the end.
+    """
+    values = {**values, "updated_at": utc_now()}
+    new_stage = values.get("stage")
+
+    def run(*extra):
+        stmt = update(MaintenanceRequest).where(*conditions, *extra).values(**values)
+        return db.execute(
+            stmt.returning(*BULK_RETURNING).execution_options(synchronize_session=False)
+        ).all()
+
+    # 1. SCRAP LOGIC: the equipment of every targeted request, before the
+    # stage change can take rows out of a status filter
+    if new_stage == MaintenanceStage.SCRAP:
+        db.execute(
+            update(Equipment).where(
+                Equipment.company_id == company_id,
+                Equipment.id.in_(select(MaintenanceRequest.equipment_id).where(*conditions))
+            ).values(is_unusable=True).execution_options(synchronize_session=False)
+        )
+
+    if new_stage is None:
+        updated = run()
+    else:
+        # 2. Rows already in the target stage first, so rows moved by step 3
+        # are never matched (and counted) twice
+        updated = run(MaintenanceRequest.stage == new_stage)
+        for old_stage in MaintenanceStage:
+            if old_stage == new_stage:
+                continue
+            moved = run(MaintenanceRequest.stage == old_stage)
+            apply_rollup(
+                db,
+                added=[rollup_entry(row) for row in moved],
+                removed=[rollup_entry(SimpleNamespace(**{**row._mapping, "stage": old_stage})) for row in moved]
+            )
+            updated += moved
+
+    record_changes(db, "updated", updated)
+    db.commit()
+    return [row.id for row in updated]
+
+
+def bulk_delete_requests(db, conditions: list) -> list:
+    """Soft deletes every matching active request in one UPDATE; returns their ids."""
+    deleted = db.execute(
+        update(MaintenanceRequest).where(*conditions, MaintenanceRequest.is_active == True)
+        .values(is_active=False, updated_at=utc_now())
+        .returning(*BULK_RETURNING)
+        .execution_options(synchronize_session=False)
+    ).all()
+    # RETURNING gives the new is_active, the rollup needs the old one
+    apply_rollup(db, removed=[rollup_entry(SimpleNamespace(**{**row._mapping, "is_active": True})) for row in deleted])
+    record_changes(db, "deleted", deleted)
+    db.commit()
+    return [row.id for row in deleted]
@@ -0,0 +1,287 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, func, case, and_, or_, literal_column
+from sqlalchemy.orm import aliased
+
+from app.models.base import User, Team, EquipmentCategory, MaintenanceRequest, MaintenanceStage, RequestDailyRollup
+from app.services.maintenance_logic import open_stage_filter, utc_now, as_naive_utc
+from app.services.rollup_logic import rollup_covered, is_whole_day
+
+Technician = aliased(User)
+
+# Dimensions a pivot can be grouped by; a time bucket adds a "period" column
+PIVOT_DIMENSIONS = ("team", "category", "stage", "requestType", "technician")
+TIME_BUCKETS = ("day", "week", "month")
+
+MEASURES = ("count", "new", "inProgress", "completed", "scrap", "overdue", "durationHours", "avgCompletionDays")
+
+# What the daily rollup can answer: no technician, nothing time-dependent
+ROLLUP_DIMENSIONS = ("team", "category", "stage", "requestType")
+ROLLUP_MEASURES = ("count", "new", "inProgress", "completed", "scrap", "durationHours")
+# The others are computed from the raw rows they count; value for a group with none
+RAW_MEASURE_DEFAULTS = {"overdue": 0, "avgCompletionDays": None}
+
+
+def parse_group_by(group_by: str) -> tuple[list[str], Optional[str]]:
+    """'team,month' -> (['team'], 'month'). Raises ValueError on unknown names."""
+    dimensions, bucket = [], None
+    for name in filter(None, (part.strip() for part in group_by.split(","))):
+        if name in TIME_BUCKETS:
+            if bucket:
+                raise ValueError("Only one time bucket (day, week or month) can be used")
+            bucket = name
+        elif name in PIVOT_DIMENSIONS:
+            if name not in dimensions:
+                dimensions.append(name)
+        else:
+            raise ValueError(f"Unknown groupBy '{name}'")
+    return dimensions, bucket
+
+
+def parse_measures(measures: Optional[str]) -> tuple:
+    if not measures:
+        return MEASURES
+    names = tuple(dict.fromkeys(part.strip() for part in measures.split(",") if part.strip()))
+    unknown = [name for name in names if name not in MEASURES]
+    if unknown:
+        raise ValueError(f"Unknown measure '{unknown[0]}'")
+    return names
+
+
+def time_bucket(column, bucket: str, dialect: str):
+    """Start of the day/week/month as 'YYYY-MM-DD' (weeks start on Monday)."""
+    # Bucket names are validated, so they can be inlined; bound parameters
+    # would make the SELECT and GROUP BY expressions differ on PostgreSQL
+    if dialect == "postgresql":
+        truncated = func.date_trunc(literal_column(f"'{bucket}'"), column)
+        return func.to_char(truncated, literal_column("'YYYY-MM-DD'"))
+    if bucket == "day":
+        return func.strftime(literal_column("'%Y-%m-%d'"), column)
+    if bucket == "month":
+        return func.strftime(literal_column("'%Y-%m-01'"), column)
+    # SQLite: move to the coming Sunday (or stay on it), then back to Monday
+    return func.date(column, literal_column("'weekday 0'"), literal_column("'-6 days'"))
+
+
+def completion_days(dialect: str):
+    """Days between the scheduled date and the last update, never negative."""
+    if dialect == "postgresql":
+        seconds = func.extract("epoch", MaintenanceRequest.updated_at - MaintenanceRequest.scheduled_date)
+        return func.greatest(seconds / 86400.0, 0)
+    days = func.julianday(MaintenanceRequest.updated_at) - func.julianday(MaintenanceRequest.scheduled_date)
+    return func.max(days, 0)
+
+
+def pivot_keys(source, dimensions: list[str], bucket: Optional[str], dialect: str, time_column):
+    """Dimension columns (ids plus their display names) and the joins they need."""
+    keys, joins = [], []
+    if "team" in dimensions:
+        keys += [source.team_id.label("teamId"), Team.name.label("teamName")]
+        joins.append((Team, source.team_id == Team.id))
+    if "category" in dimensions:
+        keys += [source.category_id.label("categoryId"), EquipmentCategory.name.label("categoryName")]
+        joins.append((EquipmentCategory, source.category_id == EquipmentCategory.id))
+    if "stage" in dimensions:
+        keys.append(source.stage.label("status"))
+    if "requestType" in dimensions:
+        keys.append(source.request_type.label("maintenanceType"))
+    if "technician" in dimensions:
+        keys += [source.technician_id.label("technicianId"), Technician.full_name.label("technicianName")]
+        joins.append((Technician, source.technician_id == Technician.id))
+    if bucket:
+        keys.append(time_bucket(time_column, bucket, dialect).label("period"))
+    return keys, joins
+
+
+def grouped_statement(source, keys: list, joins: list, measures: list, conditions: list, having=None):
+    stmt = select(*keys, *measures).select_from(source)
+    for target, onclause in joins:
+        stmt = stmt.outerjoin(target, onclause)
+    stmt = stmt.where(*conditions)
+    if keys:
+        stmt = stmt.group_by(*keys).order_by(*keys)
+        if having is not None:
+            stmt = stmt.having(having)
+    return stmt
+
+
+def pivot_statement(
+    company_id: UUID,
+    dimensions: list[str],
+    bucket: Optional[str],
+    dialect: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    measures: tuple = MEASURES,
+    now: Optional[datetime] = None,
+    only_matching: bool = False,
+):
+    """
+    GROUP BY over the requested dimensions with every measure computed in the
+    same pass (COUNT ... FILTER for the stage splits).
+
+    only_matching (overdue/avgCompletionDays only) reads just the rows those
+    measures count; groups without any are left out instead of 0/None.
+    """
+    now = now or utc_now()
+    keys, joins = pivot_keys(MaintenanceRequest, dimensions, bucket, dialect, MaintenanceRequest.created_at)
+
+    overdue = and_(
+        open_stage_filter(),
+        MaintenanceRequest.scheduled_date < now
+    )
+    completed_scheduled = and_(
+        MaintenanceRequest.stage == MaintenanceStage.REPAIRED,
+        MaintenanceRequest.scheduled_date.isnot(None)
+    )
+    expressions = {
+        "count": func.count(),
+        "new": func.count().filter(MaintenanceRequest.stage == MaintenanceStage.NEW),
+        "inProgress": func.count().filter(MaintenanceRequest.stage == MaintenanceStage.IN_PROGRESS),
+        "completed": func.count().filter(MaintenanceRequest.stage == MaintenanceStage.REPAIRED),
+        "scrap": func.count().filter(MaintenanceRequest.stage == MaintenanceStage.SCRAP),
+        "overdue": func.count().filter(overdue),
+        "durationHours": func.coalesce(func.sum(MaintenanceRequest.duration), 0),
+        "avgCompletionDays": func.avg(case((completed_scheduled, completion_days(dialect)))),
+    }
+    measure_filters = {"overdue": overdue, "avgCompletionDays": completed_scheduled}
+
+    # Same company/soft-delete rules as the list endpoint
+    conditions = [
+        MaintenanceRequest.company_id == company_id,
+        MaintenanceRequest.is_active == True
+    ]
+    if start:
+        conditions.append(MaintenanceRequest.created_at >= start)
+    if end:
+        conditions.append(MaintenanceRequest.created_at < end)
+    if only_matching:
+        conditions.append(or_(*(measure_filters[name] for name in measures)))
+
+    return grouped_statement(
+        MaintenanceRequest, keys, joins,
+        [expressions[name].label(name) for name in measures], conditions
+    )
+
+
+def rollup_pivot_statement(
+    company_id: UUID,
+    dimensions: list[str],
+    bucket: Optional[str],
+    dialect: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    measures: tuple = ROLLUP_MEASURES,
+):
+    """Same result shape as pivot_statement, summed from the daily rollup."""
+    keys, joins = pivot_keys(RequestDailyRollup, dimensions, bucket, dialect, RequestDailyRollup.day)
+
+    def stage_sum(stage):
+        return func.coalesce(func.sum(RequestDailyRollup.request_count).filter(RequestDailyRollup.stage == stage), 0)
+
+    expressions = {
+        "count": func.coalesce(func.sum(RequestDailyRollup.request_count), 0),
+        "new": stage_sum(MaintenanceStage.NEW),
+        "inProgress": stage_sum(MaintenanceStage.IN_PROGRESS),
+        "completed": stage_sum(MaintenanceStage.REPAIRED),
+        "scrap": stage_sum(MaintenanceStage.SCRAP),
+        "durationHours": func.coalesce(func.sum(RequestDailyRollup.duration_sum), 0),
+    }
+
+    conditions = [RequestDailyRollup.company_id == company_id]
+    if start:
+        conditions.append(RequestDailyRollup.day >= start.date())
+    if end:
+        conditions.append(RequestDailyRollup.day < end.date())
+
+    # Keys whose requests were all removed linger as zero rows
+    return grouped_statement(
+        RequestDailyRollup, keys, joins,
+        [expressions[name].label(name) for name in measures], conditions,
+        having=func.sum(RequestDailyRollup.request_count) > 0
+    )
+
+
+def can_use_rollup(dimensions: list[str], measures: tuple, start: Optional[datetime], end: Optional[datetime]) -> bool:
+    # Measures the rollup can't answer are added from the raw rows (see
+    # rollup_pivot_rows), so at least one has to come from the rollup
+    return (
+        set(dimensions) <= set(ROLLUP_DIMENSIONS)
+        and any(name in ROLLUP_MEASURES for name in measures)
+        and is_whole_day(start) and is_whole_day(end)
+    )
+
+
+def rollup_pivot_rows(db, company_id: UUID, dimensions: list[str], bucket: Optional[str], dialect: str,
+                      start: Optional[datetime], end: Optional[datetime], measures: tuple) -> tuple[list, list[str]]:
+    """
+    Groups and rollup measures from the daily rollup; overdue and
+    avgCompletionDays from a second query over only the open-overdue and
+    completed-scheduled requests, merged in by group key.
+    """
+    rolled = tuple(name for name in measures if name in ROLLUP_MEASURES)
+    raw = tuple(name for name in measures if name in RAW_MEASURE_DEFAULTS)
+
+    result = db.execute(rollup_pivot_statement(company_id, dimensions, bucket, dialect, start, end, rolled))
+    columns = list(result.keys())
+    key_count = len(columns) - len(rolled)
+    rows = [dict(zip(columns, row)) for row in result]
+
+    if raw:
+        raw_result = db.execute(pivot_statement(
+            company_id, dimensions, bucket, dialect, start, end, raw, only_matching=True
+        ))
+        extra = {tuple(row[:key_count]): row[key_count:] for row in raw_result}
+        defaults = tuple(RAW_MEASURE_DEFAULTS[name] for name in raw)
+        for row in rows:
+            row.update(zip(raw, extra.get(tuple(row[name] for name in columns[:key_count]), defaults)))
+
+    columns = columns[:key_count] + list(measures)
+    return [[row[name] for name in columns] for row in rows], columns
+
+
+def format_pivot_value(name: str, value):
+    if name == "status":
+        return "completed" if value == MaintenanceStage.REPAIRED else value.value
+    if name == "maintenanceType":
+        return value.value
+    if name == "avgCompletionDays":
+        return round(float(value), 1) if value is not None else None
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def pivot_data(rows, dimensions: list[str], bucket: Optional[str], columns: list[str]) -> dict:
+    """
+    Columnar result: one list per column, all of the same length, e.g.
+    {"teamName": ["A", "B"], "count": [4, 2], ...}.
+    """
+    return {
+        "groupBy": dimensions + ([bucket] if bucket else []),
+        "rowCount": len(rows),
+        "columns": {
+            name: [format_pivot_value(name, row[i]) for row in rows]
+            for i, name in enumerate(columns)
+        }
+    }
+
+
+def get_pivot_data(
+    db,
+    company_id: UUID,
+    dimensions: list[str],
+    bucket: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    measures: tuple = MEASURES,
+) -> dict:
+    dialect = db.get_bind().dialect.name
+    start, end = as_naive_utc(start), as_naive_utc(end)
+    if can_use_rollup(dimensions, measures, start, end) and rollup_covered(db, company_id):
+        rows, columns = rollup_pivot_rows(db, company_id, dimensions, bucket, dialect, start, end, measures)
+        return pivot_data(rows, dimensions, bucket, columns)
+    result = db.execute(pivot_statement(company_id, dimensions, bucket, dialect, start, end, measures))
+    return pivot_data(result.all(), dimensions, bucket, list(result.keys()))
@@ -0,0 +1,156 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, func, delete, Date
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.cache import TTLCache
+from app.models.base import Company, MaintenanceRequest, RequestDailyRollup, RequestRollupCoverage
+
+# Primary key of a rollup row, in column order
+ROLLUP_KEY = ("company_id", "day", "team_id", "category_id", "stage", "request_type")
+
+# Coverage only changes when rebuild_rollups.py runs, so a short-lived
+# per-process cache keeps the check off the hot path
+coverage_cache = TTLCache(max_entries=10_000, ttl_seconds=60)
+
+
+# --- INCREMENTAL MAINTENANCE ---
+
+def rollup_entry(req) -> Optional[tuple]:
+    """(rollup key, duration) a request contributes, or None when it isn't counted."""
+    if not req.is_active:
+        return None
+    key = (req.company_id, req.created_at.date(), req.team_id, req.category_id, req.stage, req.request_type)
+    return key, req.duration or 0
+
+
+def upsert_rollup_statement(dialect: str, rows: list):
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    stmt = insert(RequestDailyRollup).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            "request_count": RequestDailyRollup.request_count + stmt.excluded.request_count,
+            "duration_sum": RequestDailyRollup.duration_sum + stmt.excluded.duration_sum,
+        }
+    )
+
+
+def apply_rollup(db, added=(), removed=()):
+    """
+    Adds/subtracts rollup entries (see rollup_entry) in one multi-row upsert.
+    Runs in the caller's transaction, so call it before db.commit().
+    For an update, pass the entry taken before the change as removed and the
+    one after it as added; unchanged keys cancel out and cost nothing.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for entry, sign in [(e, 1) for e in added] + [(e, -1) for e in removed]:
+        if entry is None:
+            continue
+        key, duration = entry
+        deltas[key][0] += sign
+        deltas[key][1] += sign * duration
+
+    rows = [
+        {**dict(zip(ROLLUP_KEY, key)), "request_count": count, "duration_sum": duration}
+        for key, (count, duration) in deltas.items()
+        if count or duration
+    ]
+    if rows:
+        db.execute(upsert_rollup_statement(db.get_bind().dialect.name, rows))
+
+
+# --- COVERAGE ---
+
+def coverage_statement(company_id: UUID):
+    return select(RequestRollupCoverage.company_id).where(RequestRollupCoverage.company_id == company_id)
+
+
+def rollup_covered(db, company_id: UUID) -> bool:
+    covered = coverage_cache.get(company_id)
+    if covered is None:
+        covered = db.execute(coverage_statement(company_id)).first() is not None
+        coverage_cache.set(company_id, covered)
+    return covered
+
+
+async def rollup_covered_async(db, company_id: UUID) -> bool:
+    covered = coverage_cache.get(company_id)
+    if covered is None:
+        covered = (await db.execute(coverage_statement(company_id))).first() is not None
+        coverage_cache.set(company_id, covered)
+    return covered
+
+
+def is_whole_day(value: Optional[datetime]) -> bool:
+    # Rollups are per day, so range bounds inside a day need the raw table
+    return value is None or value == datetime.combine(value.date(), datetime.min.time())
+
+
+# --- REBUILD / CHECK ---
+
+def raw_rollup_statement(company_ids: Optional[list] = None):
+    """What the rollup should contain, computed from maintenance_requests."""
+    # Typed as Date so SQLite's 'YYYY-MM-DD' strings come back as dates
+    day = func.date(MaintenanceRequest.created_at, type_=Date)
+    keys = [
+        MaintenanceRequest.company_id, day, MaintenanceRequest.team_id,
+        MaintenanceRequest.category_id, MaintenanceRequest.stage, MaintenanceRequest.request_type
+    ]
+    stmt = select(
+        *keys,
+        func.count().label("request_count"),
+        func.coalesce(func.sum(MaintenanceRequest.duration), 0).label("duration_sum")
+    ).where(MaintenanceRequest.is_active == True)
+    if company_ids:
+        stmt = stmt.where(MaintenanceRequest.company_id.in_(company_ids))
+    return stmt.group_by(*keys)
+
+
+def rebuild_rollups(db, company_ids: Optional[list] = None) -> int:
+    """Replaces the rollup rows of the given companies (default: all) and marks them covered."""
+    if not company_ids:
+        company_ids = list(db.execute(select(Company.id)).scalars())
+
+    db.execute(delete(RequestDailyRollup).where(RequestDailyRollup.company_id.in_(company_ids)))
+    result = db.execute(
+        RequestDailyRollup.__table__.insert().from_select(
+            list(ROLLUP_KEY) + ["request_count", "duration_sum"],
+            raw_rollup_statement(company_ids)
+        )
+    )
+
+    db.execute(delete(RequestRollupCoverage).where(RequestRollupCoverage.company_id.in_(company_ids)))
+    db.add_all([RequestRollupCoverage(company_id=company_id) for company_id in company_ids])
+    db.commit()
+    coverage_cache.clear()
+    return result.rowcount
+
+
+def check_rollups(db, company_ids: Optional[list] = None) -> list:
+    """
+    Compares the rollup with fresh counts from maintenance_requests.
+    Returns (key, (raw count, raw duration), (rollup count, rollup duration)) per mismatch.
+    """
+    raw = {
+        tuple(row[:6]): (row.request_count, row.duration_sum)
+        for row in db.execute(raw_rollup_statement(company_ids))
+    }
+
+    stmt = select(RequestDailyRollup)
+    if company_ids:
+        stmt = stmt.where(RequestDailyRollup.company_id.in_(company_ids))
+    rolled = {}
+    for row in db.execute(stmt).scalars():
+        # Keys whose requests were all removed stay behind as zero rows
+        if row.request_count or row.duration_sum:
+            key = tuple(getattr(row, column) for column in ROLLUP_KEY)
+            rolled[key] = (row.request_count, row.duration_sum)
+    return [
+        (key, raw.get(key, (0, 0)), rolled.get(key, (0, 0)))
+        for key in sorted(set(raw) | set(rolled), key=str)
+        if raw.get(key, (0, 0)) != rolled.get(key, (0, 0))
+    ]
@@ -0,0 +1,217 @@
+import calendar
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import select, or_
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.core.config import settings
+from app.models.base import (
+    PRIORITY_REVERSE_MAP, Equipment, MaintenanceRequest, MaintenanceSchedule, MaintenanceStage, RequestType, ScheduleFrequency
+)
+from app.services.maintenance_logic import utc_now
+from app.services.rollup_logic import rollup_entry, apply_rollup
+from app.services.change_feed import record_changes
+
+# Rows buffered before each INSERT round (bounds memory for long horizons)
+INSERT_CHUNK_SIZE = 1000
+
+
+# --- RECURRENCE ---
+
+def add_months(value: datetime, months: int) -> datetime:
+    # Clamps to the end of shorter months: Jan 31 + 1 month -> Feb 28/29
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def nth_occurrence(schedule, n: int) -> datetime:
+    # Always computed from starts_at so month-end clamping never drifts
+    step = n * schedule.interval
+    if schedule.frequency == ScheduleFrequency.DAILY:
+        return schedule.starts_at + timedelta(days=step)
+    if schedule.frequency == ScheduleFrequency.WEEKLY:
+        return schedule.starts_at + timedelta(weeks=step)
+    if schedule.frequency == ScheduleFrequency.MONTHLY:
+        return add_months(schedule.starts_at, step)
+    return add_months(schedule.starts_at, 12 * step)
+
+
+def first_index_estimate(schedule, window_start: datetime) -> int:
+    """An occurrence index at or before the first one inside the window."""
+    if window_start <= schedule.starts_at:
+        return 0
+    if schedule.frequency in (ScheduleFrequency.DAILY, ScheduleFrequency.WEEKLY):
+        days = 1 if schedule.frequency == ScheduleFrequency.DAILY else 7
+        elapsed = (window_start - schedule.starts_at).days // (days * schedule.interval)
+    else:
+        months = 1 if schedule.frequency == ScheduleFrequency.MONTHLY else 12
+        month_diff = (window_start.year - schedule.starts_at.year) * 12 + window_start.month - schedule.starts_at.month
+        elapsed = month_diff // (months * schedule.interval)
+    return max(0, elapsed - 1)
+
+
+def schedule_occurrences(schedule, window_start: datetime, window_end: datetime) -> Iterator[datetime]:
+    """Occurrences in [window_start, window_end), honouring schedule.until."""
+    n = first_index_estimate(schedule, window_start)
+    while True:
+        at = nth_occurrence(schedule, n)
+        if at >= window_end or (schedule.until and at > schedule.until):
+            return
+        if at >= window_start:
+            yield at
+        n += 1
+
+
+# --- GENERATOR ---
+
+def insert_occurrences_statement(dialect: str):
+    """
+    INSERT that skips occurrences that already exist (unique schedule/equipment/date
+    index) and returns what the rollup and the change feed need. Executed with a list of rows, so
+    SQLAlchemy batches it into multi-row VALUES ("insertmanyvalues") while
+    compiling the statement only once.
+    """
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    table = MaintenanceRequest.__table__
+    return insert(table).on_conflict_do_nothing(
+        index_elements=["schedule_id", "equipment_id", "scheduled_date"]
+    ).returning(
+        table.c.id, table.c.company_id, table.c.created_at, table.c.team_id, table.c.category_id,
+        table.c.stage, table.c.request_type, table.c.duration, table.c.is_active
+    )
+
+
+def schedule_targets(db, schedules: list) -> dict:
+    """Equipment rows per schedule id, fetched with a single query."""
+    equipment_ids = {s.equipment_id for s in schedules if s.equipment_id}
+    category_ids = {s.category_id for s in schedules if s.category_id}
+    company_ids = {s.company_id for s in schedules}
+    if not equipment_ids and not category_ids:
+        return {}
+
+    rows = db.execute(
+        select(
+            Equipment.id, Equipment.company_id, Equipment.category_id,
+            Equipment.team_id, Equipment.technician_id
+        ).where(
+            Equipment.company_id.in_(company_ids),
+            Equipment.is_unusable == False,
+            or_(Equipment.id.in_(equipment_ids), Equipment.category_id.in_(category_ids))
+        )
+    ).all()
+
+    by_id = {row.id: row for row in rows}
+    by_category = {}
+    for row in rows:
+        by_category.setdefault((row.company_id, row.category_id), []).append(row)
+
+    targets = {}
+    for schedule in schedules:
+        if schedule.equipment_id:
+            equipment = by_id.get(schedule.equipment_id)
+            targets[schedule.id] = [equipment] if equipment and equipment.company_id == schedule.company_id else []
+        else:
+            targets[schedule.id] = by_category.get((schedule.company_id, schedule.category_id), [])
+    return targets
+
+
+def generate_schedule_requests(
+    db,
+    company_id: Optional[UUID] = None,
+    schedule_ids: Optional[list] = None,
+    horizon_days: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    Materializes every occurrence of the active schedules between now and
+    now + horizon_days as NEW preventive requests, in chunked bulk inserts.
+    Idempotent: occurrences that already have a request are skipped by the
+    unique index, so reruns only add what is missing. Commits once at the end.
+    """
+    now = now or utc_now()
+    horizon_end = now + timedelta(days=horizon_days or settings.SCHEDULE_HORIZON_DAYS)
+
+    query = select(MaintenanceSchedule).where(MaintenanceSchedule.is_active == True)
+    if company_id:
+        query = query.where(MaintenanceSchedule.company_id == company_id)
+    if schedule_ids:
+        query = query.where(MaintenanceSchedule.id.in_(schedule_ids))
+    schedules = db.execute(query).scalars().all()
+
+    targets = schedule_targets(db, schedules)
+    dialect = db.get_bind().dialect.name
+    stats = {"schedules": len(schedules), "occurrences": 0, "created": 0, "existing": 0, "skipped": 0}
+
+    def flush(rows):
+        inserted = db.execute(insert_occurrences_statement(dialect), rows).all()
+        apply_rollup(db, added=[rollup_entry(row) for row in inserted])
+        record_changes(db, "created", inserted)
+        stats["created"] += len(inserted)
+        # Rows dropped by ON CONFLICT: the occurrence already had a request
+        stats["existing"] += len(rows) - len(inserted)
+
+    pending = []
+    for schedule in schedules:
+        occurrences = list(schedule_occurrences(schedule, now, horizon_end))
+        for equipment in targets.get(schedule.id, []):
+            team_id = schedule.team_id or equipment.team_id
+            if not team_id or not equipment.category_id:
+                # Requests need a team and a category; nothing to fall back to
+                stats["skipped"] += len(occurrences)
+                continue
+
+            for at in occurrences:
+                pending.append({
+                    "id": uuid.uuid4(),
+                    "subject": schedule.subject,
+                    "instructions": schedule.instructions,
+                    "request_type": RequestType.PREVENTIVE,
+                    "stage": MaintenanceStage.NEW,
+                    "priority": schedule.priority,
+                    "scheduled_date": at,
+                    "duration": schedule.duration or 0,
+                    "equipment_id": equipment.id,
+                    "team_id": team_id,
+                    "category_id": equipment.category_id,
+                    "technician_id": schedule.technician_id or equipment.technician_id,
+                    "company_id": schedule.company_id,
+                    "created_by_id": schedule.created_by_id,
+                    "schedule_id": schedule.id,
+                    "created_at": now,
+                    "updated_at": now,
+                    "is_active": True,
+                    "is_blocked": False,
+                    "is_archived": False,
+                })
+                stats["occurrences"] += 1
+                if len(pending) >= INSERT_CHUNK_SIZE:
+                    flush(pending)
+                    pending = []
+
+    if pending:
+        flush(pending)
+    db.commit()
+    return stats
+
+
+def format_schedule(schedule) -> dict:
+    return {
+        "id": schedule.id,
+        "subject": schedule.subject,
+        "equipmentId": schedule.equipment_id,
+        "categoryId": schedule.category_id,
+        "frequency": schedule.frequency.value,
+        "interval": schedule.interval,
+        "startsAt": schedule.starts_at,
+        "until": schedule.until,
+        "duration": schedule.duration,
+        "priority": PRIORITY_REVERSE_MAP.get(schedule.priority, "medium"),
+        "teamId": schedule.team_id,
+        "technicianId": schedule.technician_id,
+        "isActive": schedule.is_active,
+        "createdAt": schedule.created_at,
+    }
@@ -0,0 +1,156 @@
+import operator
+from functools import reduce
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, func, or_, case, literal, union_all, String
+from sqlalchemy.exc import OperationalError
+
+from app.models.base import MaintenanceRequest, Equipment, Team, User
+from app.services.equipment_logic import like_escape
+
+SEARCH_TYPES = ("request", "equipment", "team", "user")
+
+# Terms shorter than this can't use the trigram indexes and match nearly
+# everything ("on", "2"); they are ignored, and a query made only of them
+# finds nothing rather than scanning every table
+SEARCH_MIN_TERM_LENGTH = 3
+SEARCH_MAX_TERMS = 5
+
+# Characters of a request description returned as the hit's subtitle
+SUBTITLE_LENGTH = 120
+
+
+def search_terms(q: str) -> list:
+    return [term for term in q.split() if len(term) >= SEARCH_MIN_TERM_LENGTH][:SEARCH_MAX_TERMS]
+
+
+def parse_types(types: Optional[str]) -> list:
+    if not types:
+        return list(SEARCH_TYPES)
+    names = [name.strip() for name in types.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SEARCH_TYPES]
+    if unknown or not names:
+        raise ValueError(f"Unknown search type(s): {', '.join(unknown)}. Use {', '.join(SEARCH_TYPES)}")
+    return names
+
+
+def term_match(columns: list, term: str):
+    pattern = f"%{like_escape(term)}%"
+    return or_(*(column.ilike(pattern, escape="\\") for column in columns))
+
+
+def match_rank(columns: list, q: str, terms: list, dialect: str):
+    """
+    Share of the terms found in any column (0..1) plus how well the whole query
+    matches the first (main) column: word_similarity on PostgreSQL, a prefix /
+    substring bonus elsewhere.
+    """
+    hits = [case((term_match(columns, term), 1.0), else_=0.0) for term in terms]
+    coverage = reduce(operator.add, hits) / len(terms)
+    if dialect == "postgresql":
+        closeness = func.word_similarity(q, func.coalesce(columns[0], ""))
+    else:
+        closeness = case(
+            (columns[0].ilike(f"{like_escape(q)}%", escape="\\"), 1.0),
+            (columns[0].ilike(f"%{like_escape(q)}%", escape="\\"), 0.5),
+            else_=0.0,
+        )
+    return coverage + closeness
+
+
+def search_branches(company_id: UUID) -> dict:
+    """type -> (id, title, subtitle, searched columns, scope conditions)"""
+    return {
+        "request": (
+            MaintenanceRequest.id, MaintenanceRequest.subject,
+            func.substr(MaintenanceRequest.description, 1, SUBTITLE_LENGTH),
+            [MaintenanceRequest.subject, MaintenanceRequest.description],
+            [MaintenanceRequest.company_id == company_id, MaintenanceRequest.is_active == True],
+        ),
+        "equipment": (
+            Equipment.id, Equipment.name, Equipment.serial_number,
+            [Equipment.name, Equipment.serial_number, Equipment.location],
+            [Equipment.company_id == company_id],
+        ),
+        "team": (
+            Team.id, Team.name, func.substr(Team.description, 1, SUBTITLE_LENGTH),
+            [Team.name],
+            [Team.company_id == company_id, Team.is_active == True],
+        ),
+        "user": (
+            User.id, User.full_name, User.email,
+            [User.full_name, User.email],
+            [User.company_id == company_id],
+        ),
+    }
+
+
+def search_statement(company_id: UUID, q: str, types: list, limit: int, dialect: str):
+    """
+    One UNION ALL with a ranked, limited branch per type, so the whole search
+    is a single round trip. Each branch filters with ILIKE '%term%' (any term
+    in any column), which PostgreSQL serves from the pg_trgm GIN indexes.
+    """
+    terms = search_terms(q)
+    branches = search_branches(company_id)
+    selects = []
+    for name in types:
+        id_column, title, subtitle, columns, scope = branches[name]
+        rank = match_rank(columns, q, terms, dialect)
+        branch = (
+            select(
+                literal(name, type_=String).label("type"),
+                id_column.label("id"),
+                title.label("title"),
+                subtitle.label("subtitle"),
+                rank.label("score"),
+            )
+            .where(*scope, or_(*(term_match(columns, term) for term in terms)))
+            .order_by(rank.desc(), title)
+            .limit(limit)
+        )
+        # Wrapped so every branch keeps its own ORDER BY/LIMIT (SQLite
+        # doesn't allow them on compound members directly)
+        subquery = branch.subquery()
+        selects.append(select(*subquery.c))
+    return union_all(*selects)
+
+
+def format_search_hit(row) -> dict:
+    return {
+        "type": row.type,
+        "id": row.id,
+        "title": row.title,
+        "subtitle": row.subtitle,
+        "score": round(float(row.score), 4),
+    }
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+def run_search(db, company_id: UUID, q: str, types: list, limit: int, timeout_ms: int) -> dict:
+    counts = {name: 0 for name in types}
+    if not search_terms(q):
+        return {"query": q, "hits": [], "counts": counts}
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Scoped to this transaction; the session is rolled back on close
+        db.execute(select(func.set_config("statement_timeout", str(int(timeout_ms)), True)))
+
+    try:
+        rows = db.execute(search_statement(company_id, q, types, limit, dialect)).all()
+    except OperationalError as e:
+        # 57014 = query_canceled (statement_timeout)
+        if getattr(e.orig, "pgcode", None) == "57014":
+            db.rollback()
+            raise SearchTimeout() from e
+        raise
+
+    hits = sorted((format_search_hit(row) for row in rows), key=lambda hit: -hit["score"])
+    for hit in hits:
+        counts[hit["type"]] += 1
+    return {"query": q, "hits": hits, "counts": counts}
@@ -0,0 +1,178 @@
+"""
+Bytes and CPU saved by ETag / If-None-Match on polled read endpoints.
+
+Seeds one company with N requests (20k by default) spread over a team of
+technicians, then polls the dashboard, category list, team members and a
+request detail `--polls` times each, as a client without validators
+(always 200) and as one that sends back the last ETag (304 until something
+changes). With --write-every K, every Kth poll round first updates a request,
+so the conditional client has to refetch once after each write.
+
+Requests go through the ASGI app in-process (TestClient), so CPU time is
+the whole process: server handler plus client. The difference between the
+two runs is what the server no longer spends on aggregation and JSON.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_conditional_get --requests 20000 --polls 200 [--write-every 50]
+
+Uses a throwaway SQLite file unless --database-url is given. The target
+database is reset with drop_all/create_all, so never point it at real data.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--technicians", type=int, default=20)
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--write-every", type=int, default=0, help="update a request every K poll rounds")
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def seed(db, requests: int, technicians: int):
+    from app.models.base import Company, Department, Team, EquipmentCategory, Equipment, User, UserRole
+    from app.services.maintenance_logic import bulk_create_requests
+
+    company = Company(id=uuid.uuid4(), name="Bench Plant")
+    department = Department(id=uuid.uuid4(), name="Production", company_id=company.id)
+    team = Team(id=uuid.uuid4(), name="Bench Team", company_id=company.id)
+    category = EquipmentCategory(id=uuid.uuid4(), name="Bench Machines")
+    manager = User(
+        id=uuid.uuid4(), full_name="Bench Manager", email="bench@example.com",
+        hashed_password="-", role=UserRole.MANAGER, company_id=company.id
+    )
+    techs = [
+        User(
+            id=uuid.uuid4(), full_name=f"Technician {i}", email=f"tech{i}@example.com",
+            hashed_password="-", role=UserRole.TECHNICIAN, company_id=company.id, team_id=team.id
+        )
+        for i in range(technicians)
+    ]
+    db.add(company)
+    db.flush()
+    db.add_all([department, team, category, manager, *techs])
+    db.flush()
+    machines = [
+        Equipment(
+            id=uuid.uuid4(), name=f"Machine {i}", serial_number=f"BENCH-{i:06d}",
+            category_id=category.id, department_id=department.id, company_id=company.id,
+            team_id=team.id, is_unusable=i % 25 == 0
+        )
+        for i in range(200)
+    ]
+    db.add_all(machines)
+    db.commit()
+
+    # Some overdue, some scheduled later, a third unscheduled
+    now = datetime.utcnow()
+    items = [
+        {
+            "subject": f"Request {i}",
+            "equipmentId": str(machines[i % len(machines)].id),
+            "technicianId": str(techs[i % len(techs)].id),
+            "priority": ("low", "medium", "high")[i % 3],
+            "scheduledDate": (now + timedelta(days=(i % 60) - 30)).isoformat() if i % 3 else None,
+            "duration": "02:00",
+        }
+        for i in range(requests)
+    ]
+    for start in range(0, len(items), 10_000):
+        bulk_create_requests(db, items[start:start + 10_000], company.id, manager.id)
+    return manager, team
+
+
+def poll(client, paths: list, headers: dict, rounds: int, conditional: bool, write=None, write_every: int = 0):
+    etags = {}
+    stats = {"responses": 0, "not_modified": 0, "bytes": 0}
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    for round_no in range(rounds):
+        if write and write_every and round_no and round_no % write_every == 0:
+            write()
+        for path in paths:
+            request_headers = dict(headers)
+            if conditional and path in etags:
+                request_headers["If-None-Match"] = etags[path]
+            response = client.get(path, headers=request_headers)
+            assert response.status_code in (200, 304), (path, response.status_code)
+            etags[path] = response.headers.get("etag", etags.get(path))
+            stats["responses"] += 1
+            stats["not_modified"] += response.status_code == 304
+            # Body plus header block, roughly what goes over the wire
+            stats["bytes"] += len(response.content) + sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+    stats["cpu"] = time.process_time() - cpu_started
+    stats["wall"] = time.perf_counter() - wall_started
+    return stats
+
+
+def main():
+    args = parse_args()
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_etag.db')}"
+    # Must be set before the app's engine is created
+    os.environ["DATABASE_URL"] = database_url
+
+    from fastapi.testclient import TestClient
+    from app.core.security import create_access_token
+    from app.db.session import engine, SessionLocal
+    from app.main import app
+    from app.models.base import Base, MaintenanceRequest
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    manager, team = seed(db, args.requests, args.technicians)
+    print(f"Seeded {args.requests} requests in {time.perf_counter() - started:.1f}s")
+    request_id = db.query(MaintenanceRequest.id).first().id
+
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(manager.id)}"}
+    paths = [
+        "/api/v1/dashboard/metrics",
+        "/api/v1/equipment-categories",
+        f"/api/v1/teams/{team.id}/members",
+        f"/api/v1/maintenance/requests/{request_id}",
+    ]
+    priorities = iter(["low", "medium", "high"] * args.polls)
+
+    def write():
+        client.patch(
+            f"/api/v1/maintenance/requests/{request_id}", json={"priority": next(priorities)}, headers=headers
+        )
+
+    # Warm-up: imports, caches, first compilation of every statement
+    poll(client, paths, headers, 3, conditional=True)
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"{len(paths)} endpoints x {args.polls} polls" + (f", a write every {args.write_every} rounds" if args.write_every else ""))
+    print(f"{'client':<14} {'responses':>9} {'304s':>6} {'KB':>10} {'CPU s':>8} {'wall s':>8} {'CPU ms/poll':>12}")
+    results = {}
+    for label, conditional in (("unconditional", False), ("If-None-Match", True)):
+        stats = poll(client, paths, headers, args.polls, conditional, write, args.write_every)
+        results[label] = stats
+        print(
+            f"{label:<14} {stats['responses']:>9} {stats['not_modified']:>6} {stats['bytes'] / 1024:>10.1f} "
+            f"{stats['cpu']:>8.2f} {stats['wall']:>8.2f} {stats['cpu'] * 1000 / stats['responses']:>12.2f}"
+        )
+
+    plain, conditional = results["unconditional"], results["If-None-Match"]
+    print(
+        f"saved: {100 * (1 - conditional['bytes'] / plain['bytes']):.0f}% bytes, "
+        f"{100 * (1 - conditional['cpu'] / plain['cpu']):.0f}% CPU"
+    )
+
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Sustained throughput of the read-heavy endpoints, sync vs async DB mode.
+
+Starts one uvicorn server per mode (DB_ASYNC=false / true) against the same
+DATABASE_URL, hammers it with concurrent clients for a fixed duration and
+prints requests per second for each endpoint.
+
+Usage (from backend/, after `python populate_db.py`):
+
+    python -m benchmarks.bench_db_modes --duration 10 --concurrency 64
+
+Works with SQLite (aiosqlite) or a local PostgreSQL (asyncpg).
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+ENDPOINTS = [
+    "/api/v1/dashboard/metrics",
+    "/api/v1/maintenance/requests?limit=50",
+    "/api/v1/equipment?limit=20",
+]
+
+
+def start_server(async_mode: bool, port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "DB_ASYNC": "true" if async_mode else "false"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+
+
+async def wait_until_up(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get("/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start")
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["data"]["token"]
+
+
+async def hammer(client: httpx.AsyncClient, path: str, duration: float, concurrency: int) -> dict:
+    done = 0
+    errors = 0
+    deadline = time.monotonic() + duration
+
+    async def worker():
+        nonlocal done, errors
+        while time.monotonic() < deadline:
+            response = await client.get(path)
+            if response.status_code == 200:
+                done += 1
+            else:
+                errors += 1
+
+    started = time.monotonic()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.monotonic() - started
+    return {"rps": done / elapsed, "errors": errors}
+
+
+async def run_mode(async_mode: bool, args) -> dict:
+    port = args.port + (1 if async_mode else 0)
+    base_url = f"http://127.0.0.1:{port}"
+    server = start_server(async_mode, port, args.workers)
+    try:
+        await wait_until_up(base_url)
+        limits = httpx.Limits(max_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            token = await login(client, args.email, args.password)
+            client.headers["Authorization"] = f"Bearer {token}"
+            # Warm up caches and connection pools
+            for path in ENDPOINTS:
+                await client.get(path)
+            return {path: await hammer(client, path, args.duration, args.concurrency) for path in ENDPOINTS}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per endpoint")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--email", default="admin@gearguard.com")
+    parser.add_argument("--password", default="password123")
+    args = parser.parse_args()
+
+    results = {mode: asyncio.run(run_mode(mode == "async", args)) for mode in ("sync", "async")}
+
+    print(f"\n{'endpoint':<45}{'sync rps':>12}{'async rps':>12}{'ratio':>8}")
+    for path in ENDPOINTS:
+        sync_rps = results["sync"][path]["rps"]
+        async_rps = results["async"][path]["rps"]
+        ratio = async_rps / sync_rps if sync_rps else float("nan")
+        print(f"{path:<45}{sync_rps:>12.1f}{async_rps:>12.1f}{ratio:>8.2f}")
+        for mode in ("sync", "async"):
+            if results[mode][path]["errors"]:
+                print(f"    {mode}: {results[mode][path]['errors']} non-200 responses")
+
+
+if __name__ == "__main__":
+    main()
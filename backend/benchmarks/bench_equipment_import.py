@@ -0,0 +1,99 @@
+"""
+Throughput and memory of the streaming equipment CSV import.
+
+Writes a CSV with N rows (100k by default) spread over a few categories,
+departments and teams, imports it, then imports it again to time the pass
+where every serial number collides and nothing is inserted.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_equipment_import --rows 100000 [--trace-memory]
+
+--trace-memory reports the peak of Python allocations during each import
+(tracemalloc slows the run down several times, so timings aren't comparable).
+
+Uses a throwaway SQLite file unless --database-url is given. The target
+database is reset with drop_all/create_all, so never point it at real data.
+"""
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--trace-memory", action="store_true")
+    return parser.parse_args()
+
+
+def write_csv(path: str, rows: int, categories: list, departments: list, teams: list):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "serialNumber", "category", "department", "team", "location", "purchaseDate"])
+        for i in range(rows):
+            writer.writerow([
+                f"Machine {i}", f"IMPORT-{i:07d}", categories[i % len(categories)],
+                departments[i % len(departments)], teams[i % len(teams)], f"Hall {i % 12}", "2025-03-01"
+            ])
+
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp()
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench_import.db')}"
+    # Must be set before the app's engine is created
+    os.environ["DATABASE_URL"] = database_url
+
+    from app.db.session import engine, SessionLocal
+    from app.models.base import Base, Company, Department, Team, EquipmentCategory
+    from app.services.equipment_logic import import_equipment_csv
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    company = Company(id=uuid.uuid4(), name="Bench Plant")
+    categories = [EquipmentCategory(id=uuid.uuid4(), name=f"Category {i}") for i in range(5)]
+    departments = [Department(id=uuid.uuid4(), name=f"Department {i}", company_id=company.id) for i in range(5)]
+    teams = [Team(id=uuid.uuid4(), name=f"Team {i}", company_id=company.id) for i in range(5)]
+    db.add(company)
+    db.flush()
+    db.add_all(categories + departments + teams)
+    db.commit()
+
+    path = os.path.join(workdir, "equipment.csv")
+    write_csv(path, args.rows, [c.name for c in categories], [d.name for d in departments], [t.name for t in teams])
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"CSV: {args.rows} rows, {os.path.getsize(path) / 1e6:.1f} MB")
+
+    for label in ("first run", "rerun (collisions)"):
+        if args.trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        with open(path, newline="", encoding="utf-8") as f:
+            stats = import_equipment_csv(db, f, company.id)
+        elapsed = time.perf_counter() - started
+        rate = stats["rows"] / elapsed if elapsed else 0
+        memory = ""
+        if args.trace_memory:
+            memory = f"  peak {tracemalloc.get_traced_memory()[1] / 1e6:6.1f} MB"
+            tracemalloc.stop()
+        print(
+            f"{label:<20} {stats['rows']:>8} rows  {stats['created']:>8} created  {stats['errorCount']:>8} errors  "
+            f"{elapsed:7.2f}s  {rate:>8.0f} rows/s{memory}"
+        )
+
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Latency of the equipment search box on a large table.
+
+Seeds one company with N assets (1M by default), then runs each search term
+through the list endpoint's statements (page + total count), ranked search vs
+the previous unranked '%term%' ILIKE on name/serial, and prints p50/p95.
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_equipment_search --assets 1000000 --repeat 20
+    python -m benchmarks.bench_equipment_search --database-url postgresql://... --skip-seed
+
+On PostgreSQL the ranked search is served by the pg_trgm GIN indexes (run
+ANALYZE after seeding, the script does it). SQLite has no trigram index, so
+both variants scan. Uses a throwaway SQLite file unless --database-url is
+given; seeding resets the database with drop_all/create_all, so never point
+it at real data.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+TERMS = ["lathe", "CNC/0004", "hydralic pump", "Hall 7", "Okuma Press"]
+
+KINDS = ["Lathe", "Milling Machine", "Hydraulic Pump", "Compressor", "Forklift", "Press", "Conveyor", "Welder"]
+BRANDS = ["Haas", "Mazak", "Bosch", "Atlas", "Kuka", "Trumpf", "Makino", "Okuma"]
+PREFIXES = ["CNC", "HYD", "CMP", "FLT", "PRS", "CNV", "WLD", "GEN"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--assets", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the assets of a previous run")
+    return parser.parse_args()
+
+
+def seed(db, engine, assets: int):
+    from app.models.base import Base, Company, Department, Team, EquipmentCategory, Equipment
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    company = Company(id=uuid.uuid4(), name="Bench Plant")
+    department = Department(id=uuid.uuid4(), name="Production", company_id=company.id)
+    team = Team(id=uuid.uuid4(), name="Bench Team", company_id=company.id)
+    category = EquipmentCategory(id=uuid.uuid4(), name="Bench Machines")
+    db.add(company)
+    db.flush()
+    db.add_all([department, team, category])
+    db.commit()
+
+    table = Equipment.__table__
+    for start in range(0, assets, 10_000):
+        db.execute(table.insert(), [
+            {
+                "id": uuid.uuid4(),
+                "name": f"{BRANDS[i % 8]} {KINDS[(i // 8) % 8]} {i}",
+                "serial_number": f"{PREFIXES[(i // 8) % 8]}/{i:07d}",
+                "location": f"Hall {i % 40}",
+                "category_id": category.id,
+                "department_id": department.id,
+                "company_id": company.id,
+                "team_id": team.id,
+                "is_unusable": False,
+            }
+            for i in range(start, min(start + 10_000, assets))
+        ])
+    db.commit()
+
+
+def timed(db, statements, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for stmt in statements:
+            db.execute(stmt).all()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    args = parse_args()
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_search.db')}"
+    # Must be set before the app's engine is created
+    os.environ["DATABASE_URL"] = database_url
+
+    from sqlalchemy import select, or_
+    from app.db.session import engine, SessionLocal
+    from app.models.base import Company, Equipment
+    from app.services.equipment_logic import (
+        equipment_list_filters, equipment_list_order, equipment_count_statement, equipment_page_statement
+    )
+
+    db = SessionLocal()
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed(db, engine, args.assets)
+        print(f"Seeded {args.assets} assets in {time.perf_counter() - started:.1f}s")
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+
+    dialect = engine.dialect.name
+    company_id = db.execute(select(Company.id).where(Company.name == "Bench Plant")).scalar_one()
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"{'term':<16} {'variant':<9} {'matches':>8} {'p50 ms':>9} {'p95 ms':>9}")
+
+    for term in TERMS:
+        # Ranked search as served by GET /equipment?search=
+        conditions = equipment_list_filters(company_id, search=term, dialect=dialect)
+        ranked = [
+            equipment_count_statement(conditions),
+            equipment_page_statement(conditions, 0, 20, equipment_list_order(term, dialect)),
+        ]
+        # What the endpoint did before: unranked substring match on name/serial
+        legacy_conditions = [
+            Equipment.company_id == company_id,
+            or_(Equipment.name.ilike(f"%{term}%"), Equipment.serial_number.ilike(f"%{term}%")),
+        ]
+        legacy = [
+            equipment_count_statement(legacy_conditions),
+            equipment_page_statement(legacy_conditions, 0, 20),
+        ]
+
+        for label, statements in (("ranked", ranked), ("legacy", legacy)):
+            matches = db.execute(statements[0]).scalar_one()
+            samples = timed(db, statements, args.repeat)
+            p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+            print(f"{term:<16} {label:<9} {matches:>8} {statistics.median(samples):>9.1f} {p95:>9.1f}")
+
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
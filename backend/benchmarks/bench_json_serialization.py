@@ -0,0 +1,151 @@
+"""
+Cost of turning one page of 10k maintenance requests into a JSON response.
+
+Builds the rows the list endpoint builds (format_request_item over
+request-shaped objects, UUIDs and naive datetimes included) once, then serves
+the same payload from a throwaway FastAPI app through each path:
+
+  response_model   MaintenanceListResponse validated and re-encoded by FastAPI,
+                   rendered with the stdlib JSONResponse (the default today)
+  + ORJSONResponse same route with ORJSONResponse as response class
+  encoder          no response_model: jsonable_encoder + JSONResponse, the path
+                   the equipment list takes
+  typed model      the items re-validated as List[RequestResponseItem] by a
+                   TypeAdapter compiled once, dumped to JSON by pydantic-core
+  prebuilt         FAST_JSON's prebuilt(): the dict goes to orjson as is
+
+Every body is checked to decode to the same JSON before timing. No database
+is involved, so the numbers are serialization only (plus the in-process
+TestClient round trip, which is the same for every path).
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_json_serialization --rows 10000 --repeat 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def make_rows(count: int):
+    from app.models.base import MaintenanceStage, RequestType
+
+    company_id, team_id, category_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    equipment = [uuid.uuid4() for _ in range(200)]
+    technicians = [uuid.uuid4() for _ in range(20)]
+    stages = list(MaintenanceStage)
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(), subject=f"Request {i}",
+            equipment_id=equipment[i % len(equipment)] if i % 10 else None,
+            team_id=team_id, technician_id=technicians[i % len(technicians)],
+            category_id=category_id, company_id=company_id,
+            workcenter_id=None if i % 10 else uuid.uuid4(),
+            request_type=RequestType.PREVENTIVE if i % 3 else RequestType.CORRECTIVE,
+            priority=i % 3 + 1, stage=stages[i % len(stages)],
+            created_at=now - timedelta(minutes=i),
+            scheduled_date=now + timedelta(days=i % 60 - 30) if i % 3 else None,
+            duration=120, description=f"Notes for request {i}", instructions=None,
+            is_blocked=i % 17 == 0, is_archived=False, is_active=True,
+            updated_at=now - timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def build_app(rows):
+    from fastapi import FastAPI, Response
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse, ORJSONResponse
+    from pydantic import TypeAdapter
+
+    from app.schemas.maintenance import MaintenanceListResponse, RequestResponseItem
+    from app.services.maintenance_logic import offset_list_data
+
+    payload = {"success": True, "data": offset_list_data(rows, 1, len(rows), len(rows))}
+    # Compiled once; validates the built items by field name, dumps them the same way
+    items_adapter = TypeAdapter(List[RequestResponseItem])
+    items, pagination = payload["data"]["requests"], payload["data"]["pagination"]
+
+    app = FastAPI()
+
+    @app.get("/response_model", response_model=MaintenanceListResponse)
+    def response_model():
+        return payload
+
+    @app.get("/response_model_orjson", response_model=MaintenanceListResponse, response_class=ORJSONResponse)
+    def response_model_orjson():
+        return payload
+
+    @app.get("/encoder")
+    def encoder():
+        return JSONResponse(jsonable_encoder(payload))
+
+    @app.get("/typed_model")
+    def typed_model():
+        requests = items_adapter.dump_json(items_adapter.validate_python(items, by_name=True))
+        body = b'{"success":true,"data":{"requests":' + requests + b',"pagination":' + json.dumps(pagination).encode() + b"}}"
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/prebuilt")
+    def prebuilt():
+        return ORJSONResponse(payload)
+
+    return app
+
+
+PATHS = [
+    ("response_model", "/response_model"),
+    ("+ ORJSONResponse", "/response_model_orjson"),
+    ("encoder", "/encoder"),
+    ("typed model", "/typed_model"),
+    ("prebuilt", "/prebuilt"),
+]
+
+
+def main():
+    args = parse_args()
+    # The app modules create an engine on import; nothing connects to it
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+    from fastapi.testclient import TestClient
+
+    rows = make_rows(args.rows)
+    client = TestClient(build_app(rows))
+
+    expected = None
+    for label, path in PATHS:
+        body = client.get(path).json()
+        expected = expected or body
+        assert body == expected, f"{label} renders different JSON"
+
+    print(f"{args.rows} requests per response, {args.repeat} responses per path")
+    print(f"{'path':<17} {'KB':>8} {'CPU ms/resp':>12} {'vs default':>11}")
+    baseline = None
+    for label, path in PATHS:
+        size = len(client.get(path).content)
+        started = time.process_time()
+        for _ in range(args.repeat):
+            client.get(path)
+        per_response = (time.process_time() - started) * 1000 / args.repeat
+        baseline = baseline or per_response
+        print(f"{label:<17} {size / 1024:>8.0f} {per_response:>12.1f} {baseline / per_response:>10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+"""
+Throughput of the recurring maintenance generator.
+
+Seeds one company with N pieces of equipment in a single category, attaches a
+weekly category schedule and materializes `occurrences / N` weeks ahead, i.e.
+100k requests by default. Then reruns the generator to time the idempotent
+pass (every occurrence already exists, nothing is inserted).
+
+Usage (from backend/):
+
+    python -m benchmarks.bench_schedule_generator --occurrences 100000 --equipment 1000
+
+Uses a throwaway SQLite file unless --database-url is given. The target
+database is reset with drop_all/create_all, so never point it at real data.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--occurrences", type=int, default=100_000)
+    parser.add_argument("--equipment", type=int, default=1000)
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    weeks = max(1, args.occurrences // args.equipment)
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_schedules.db')}"
+    # Must be set before the app's engine is created
+    os.environ["DATABASE_URL"] = database_url
+
+    from app.db.session import engine, SessionLocal
+    from app.models.base import (
+        Base, Company, Department, Team, EquipmentCategory, Equipment, User, UserRole,
+        MaintenanceSchedule, ScheduleFrequency
+    )
+    from app.services.schedule_logic import generate_schedule_requests
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    company = Company(id=uuid.uuid4(), name="Bench Plant")
+    department = Department(id=uuid.uuid4(), name="Production", company_id=company.id)
+    team = Team(id=uuid.uuid4(), name="Bench Team", company_id=company.id)
+    category = EquipmentCategory(id=uuid.uuid4(), name="Bench Machines")
+    manager = User(
+        id=uuid.uuid4(), full_name="Bench Manager", email="bench@example.com",
+        hashed_password="-", role=UserRole.MANAGER, company_id=company.id
+    )
+    db.add_all([company, department, team, category, manager])
+    db.flush()
+    db.add_all([
+        Equipment(
+            id=uuid.uuid4(), name=f"Machine {i}", serial_number=f"BENCH-{i:06d}",
+            category_id=category.id, department_id=department.id, company_id=company.id, team_id=team.id
+        )
+        for i in range(args.equipment)
+    ])
+    now = datetime(2026, 1, 5, 8, 0)
+    db.add(MaintenanceSchedule(
+        company_id=company.id, category_id=category.id, subject="Weekly inspection",
+        frequency=ScheduleFrequency.WEEKLY, interval=1, starts_at=now,
+        created_by_id=manager.id
+    ))
+    db.commit()
+
+    print(f"Database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"{args.equipment} equipment x {weeks} weekly occurrences")
+
+    for label in ("first run", "rerun (idempotent)"):
+        started = time.perf_counter()
+        stats = generate_schedule_requests(db, company_id=company.id, horizon_days=weeks * 7, now=now)
+        elapsed = time.perf_counter() - started
+        rate = stats["occurrences"] / elapsed if elapsed else 0
+        print(
+            f"{label:<20} {stats['occurrences']:>8} occurrences  {stats['created']:>8} created  "
+            f"{elapsed:7.2f}s  {rate:>10.0f} occurrences/s"
+        )
+
+    db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
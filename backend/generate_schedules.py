@@ -0,0 +1,45 @@
+import sys
+import uuid
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.schedule_logic import generate_schedule_requests
+
+USAGE = f"""Usage: python generate_schedules.py [--horizon-days N] [company_id ...]
+
+  Creates the preventive requests of every active maintenance schedule due
+  within the horizon (default {settings.SCHEDULE_HORIZON_DAYS} days), for all companies
+  unless some are given. Safe to rerun, e.g. from a nightly cron job.
+"""
+
+
+def main(argv):
+    horizon_days = settings.SCHEDULE_HORIZON_DAYS
+    company_ids = []
+    try:
+        args = iter(argv)
+        for arg in args:
+            if arg == "--horizon-days":
+                horizon_days = int(next(args))
+            else:
+                company_ids.append(uuid.UUID(arg))
+    except (ValueError, StopIteration):
+        print(USAGE)
+        return 1
+
+    db = SessionLocal()
+    try:
+        for company_id in company_ids or [None]:
+            stats = generate_schedule_requests(db, company_id=company_id, horizon_days=horizon_days)
+            print(
+                f"{company_id or 'all companies'}: {stats['schedules']} schedules, "
+                f"{stats['occurrences']} occurrences, {stats['created']} created, "
+                f"{stats['existing']} existing, {stats['skipped']} skipped"
+            )
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.db.session import engine, SessionLocal
+from app.db import migrations
 from app.models.base import (
     Base, Company, Department, EquipmentCategory, 
     Team, User, UserRole, Workcenter, Equipment
@@ -14,6 +15,8 @@ def init_db():
     print("Creating tables...")
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Fresh schema is already at the latest revision
+    migrations.stamp(engine)
 
     db = SessionLocal()
     try:
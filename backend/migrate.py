@@ -0,0 +1,113 @@
+import sys
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import event, select
+
+from app.db.session import engine
+from app.db import migrations
+from app.models.base import MaintenanceRequest
+from app.services.maintenance_logic import (
+    dashboard_counts_statement, next_overdue_statement, request_list_filters, calendar_statement, changes_statement, utc_now
+)
+
+USAGE = """Usage: python migrate.py [command]
+
+  upgrade [rev]   apply pending migrations (default)
+  current         print the applied revision
+  history         list all migrations
+  stamp [rev]     mark migrations as applied without running them
+  explain         check that the hot queries are served by indexes
+"""
+
+
+def hot_queries():
+    # Any company id will do: the planner only needs the query shape
+    company_id = uuid.uuid4()
+    return {
+        "request list": select(MaintenanceRequest).where(
+            *request_list_filters(company_id)
+        ).order_by(MaintenanceRequest.created_at.desc(), MaintenanceRequest.id.desc()).limit(50),
+        "dashboard": dashboard_counts_statement(company_id, utc_now()),
+        "overdue": select(MaintenanceRequest).where(
+            *request_list_filters(company_id, status="overdue")
+        ).limit(50),
+        "next overdue": next_overdue_statement(company_id, utc_now()),
+        "calendar": calendar_statement(company_id, utc_now(), utc_now() + timedelta(days=31)),
+        "delta sync": changes_statement(company_id, None, 200),
+    }
+
+
+def explain_plan(conn, stmt) -> list:
+    """
+    Query plan of stmt exactly as the app sends it: same SQL, same bound
+    parameters (an index predicate written with literals may not match them).
+    """
+    prefix = "EXPLAIN " if conn.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+
+    def add_explain(conn, cursor, statement, parameters, context, executemany):
+        return prefix + statement, parameters
+
+    event.listen(conn, "before_cursor_execute", add_explain, retval=True)
+    try:
+        # Raw cursor rows: the result's column processors expect stmt's columns
+        rows = conn.execute(stmt).cursor.fetchall()
+    finally:
+        event.remove(conn, "before_cursor_execute", add_explain)
+    return [row[0] if conn.dialect.name == "postgresql" else row[-1] for row in rows]
+
+
+def full_scans(dialect: str, plan: list) -> list:
+    if dialect == "postgresql":
+        return [line.strip() for line in plan if "Seq Scan" in line]
+    return [line for line in plan if line.startswith("SCAN") and "USING" not in line]
+
+
+def explain():
+    """
+    EXPLAIN every hot query and fail if one of them falls back to a full table scan.
+    On PostgreSQL sequential scans are disabled for the check, so tiny dev tables
+    still show whether a usable index exists.
+    """
+    dialect = engine.dialect.name
+    failures = 0
+    with engine.connect() as conn:
+        if dialect == "postgresql":
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        for name, stmt in hot_queries().items():
+            plan = explain_plan(conn, stmt)
+            scans = full_scans(dialect, plan)
+
+            print(f"--- {name}: {'FULL SCAN' if scans else 'ok'}")
+            for line in plan:
+                print(f"    {line}")
+            failures += bool(scans)
+    return failures
+
+
+def main(argv):
+    command = argv[0] if argv else "upgrade"
+    revision = int(argv[1]) if len(argv) > 1 else None
+
+    if command == "upgrade":
+        applied = migrations.upgrade(engine, revision)
+        print(f"Applied: {applied}" if applied else "Already up to date.")
+        print(f"Current revision: {migrations.current_revision(engine)}")
+    elif command == "current":
+        print(migrations.current_revision(engine))
+    elif command == "history":
+        for rev, description, _ in migrations.MIGRATIONS:
+            print(f"{rev:>4}  {description}")
+    elif command == "stamp":
+        migrations.stamp(engine, revision)
+        print(f"Current revision: {migrations.current_revision(engine)}")
+    elif command == "explain":
+        return 1 if explain() else 0
+    else:
+        print(USAGE)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,6 +2,8 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from app.db.session import engine, SessionLocal
+from app.db import migrations
+from app.services.rollup_logic import rebuild_rollups
 from app.models.base import (
     Base, Company, Department, EquipmentCategory, 
     Team, User, UserRole, Workcenter, Equipment, 
@@ -15,6 +17,8 @@ def populate():
     print("🚀 Resetting Database and Populating GearGuard Data...")
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Fresh schema is already at the latest revision
+    migrations.stamp(engine)
 
     db = SessionLocal()
     try:
@@ -114,6 +118,8 @@ def populate():
         ))
 
         db.commit()
+        # Seeded requests bypass the API, so build their report rollups here
+        rebuild_rollups(db)
         print("\n✅ Database Populated Successfully!")
         print(f"MANAGER: admin@gearguard.com / password123")
 
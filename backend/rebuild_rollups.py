@@ -0,0 +1,40 @@
+import sys
+import uuid
+
+from app.db.session import SessionLocal
+from app.services.rollup_logic import rebuild_rollups, check_rollups
+
+USAGE = """Usage: python rebuild_rollups.py [--check] [company_id ...]
+
+  (default)   rebuild the daily request rollups from maintenance_requests
+              and mark the companies as covered (all companies if none given)
+  --check     compare the rollups with raw counts and exit 1 on any mismatch
+"""
+
+
+def main(argv):
+    check = "--check" in argv
+    try:
+        company_ids = [uuid.UUID(arg) for arg in argv if arg != "--check"]
+    except ValueError:
+        print(USAGE)
+        return 1
+
+    db = SessionLocal()
+    try:
+        if check:
+            mismatches = check_rollups(db, company_ids or None)
+            for key, raw, rolled in mismatches:
+                print(f"MISMATCH {key}: raw count/duration {raw}, rollup {rolled}")
+            print(f"{len(mismatches)} mismatching rollup rows")
+            return 1 if mismatches else 0
+
+        rows = rebuild_rollups(db, company_ids or None)
+        print(f"Rebuilt {rows} rollup rows")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,81 @@
+"""
+Shared fixtures. Tests run against a throwaway SQLite file unless
+TEST_DATABASE_URL points at another database (its tables are dropped and
+recreated, so never point it at real data).
+"""
+import os
+import tempfile
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+# Must be set before the app's engine is created
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+)
+
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.db import migrations
+from app.db.session import engine, SessionLocal
+from app.main import app
+from app.models.base import Base, Company, Department, Team, EquipmentCategory, Equipment, User, UserRole
+
+
+@pytest.fixture(scope="session")
+def seed():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    migrations.stamp(engine)
+
+    db = SessionLocal()
+    company = Company(id=uuid.uuid4(), name="Test Plant")
+    department = Department(id=uuid.uuid4(), name="Production", company_id=company.id)
+    team = Team(id=uuid.uuid4(), name="Test Team", company_id=company.id)
+    category = EquipmentCategory(id=uuid.uuid4(), name="Test Machines")
+    manager = User(
+        id=uuid.uuid4(), full_name="Test Manager", email="manager@example.com",
+        hashed_password="-", role=UserRole.MANAGER, company_id=company.id, team_id=team.id
+    )
+    technician = User(
+        id=uuid.uuid4(), full_name="Test Technician", email="tech@example.com",
+        hashed_password="-", role=UserRole.TECHNICIAN, company_id=company.id, team_id=team.id
+    )
+    db.add(company)
+    db.flush()
+    db.add_all([department, team, category, manager, technician])
+    db.flush()
+    db.add_all([
+        Equipment(
+            id=uuid.uuid4(), name=f"Machine {i:03d}", serial_number=f"TEST-{i:06d}",
+            category_id=category.id, department_id=department.id, company_id=company.id,
+            team_id=team.id, technician_id=technician.id, employee_id=manager.id
+        )
+        for i in range(120)
+    ])
+    db.commit()
+    ids = SimpleNamespace(
+        company_id=company.id, team_id=team.id, category_id=category.id,
+        manager_id=manager.id, technician_id=technician.id
+    )
+    db.close()
+    return ids
+
+
+@pytest.fixture
+def db(seed):
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(seed):
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(seed):
+    return {"Authorization": f"Bearer {create_access_token(seed.manager_id)}"}
@@ -0,0 +1,29 @@
+from sqlalchemy import delete
+
+from app.models.base import Equipment
+from app.services import equipment_logic
+
+
+def test_duplicate_serials_are_caught_within_and_across_chunks(client, auth_headers, db, monkeypatch):
+    monkeypatch.setattr(equipment_logic, "IMPORT_CHUNK_SIZE", 3)
+    csv_text = "\n".join([
+        "name,serialNumber,category,department",
+        "Imported pump 1,IMP-1,Test Machines,Production",  # line 2
+        "Imported pump 2,IMP-2,Test Machines,Production",
+        "Imported pump 1 again,IMP-1,Test Machines,Production",  # same chunk as line 2
+        "Imported pump 3,IMP-3,Test Machines,Production",
+        "Imported pump 2 again,IMP-2,Test Machines,Production",  # later chunk
+        "Existing serial,TEST-000001,Test Machines,Production",
+    ])
+
+    try:
+        response = client.post(
+            "/api/v1/equipment/import", files={"file": ("equipment.csv", csv_text, "text/csv")}, headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        assert data["created"] == 3
+        assert [error["row"] for error in data["errors"]] == [4, 6, 7]
+    finally:
+        db.execute(delete(Equipment).where(Equipment.serial_number.like("IMP-%")))
+        db.commit()
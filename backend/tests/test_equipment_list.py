@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.db.session import engine
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_equipment_list_query_count_does_not_grow_with_page_size(client, auth_headers):
+    # Warm-up: the principal lookup is cached after the first request
+    assert client.get("/api/v1/equipment?limit=1", headers=auth_headers).status_code == 200
+
+    counts = {}
+    for limit in (1, 20, 100):
+        with count_statements() as statements:
+            response = client.get(f"/api/v1/equipment?limit={limit}", headers=auth_headers)
+        assert response.status_code == 200
+        assert len(response.json()["data"]["equipment"]) == limit
+        counts[limit] = len(statements)
+
+    # COUNT + page SELECT, whatever the page size
+    assert counts == {1: 2, 20: 2, 100: 2}, counts
@@ -0,0 +1,23 @@
+import uuid
+
+
+def test_team_membership_change_invalidates_members_etag(client, auth_headers, seed):
+    path = f"/api/v1/teams/{seed.team_id}/members"
+    etag = client.get(path, headers=auth_headers).headers["etag"]
+    assert client.get(path, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    # Unknown user: the only write is the bulk UPDATE that unlinks current members
+    response = client.patch(
+        f"/api/v1/teams/{seed.team_id}", json={"members": [{"userId": str(uuid.uuid4())}]}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    try:
+        refreshed = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.json()["data"]["members"] == []
+    finally:
+        client.patch(
+            f"/api/v1/teams/{seed.team_id}",
+            json={"members": [{"userId": str(seed.manager_id)}, {"userId": str(seed.technician_id)}]},
+            headers=auth_headers
+        )
@@ -0,0 +1,14 @@
+from app.core.config import settings
+
+
+def test_metrics_require_authentication(client):
+    assert client.get("/api/v1/metrics").status_code == 401
+
+
+def test_metrics_report_pool_gauges(client, auth_headers):
+    response = client.get("/api/v1/metrics", headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["gauges"]["db_pool"]["maxOverflow"] == settings.DB_MAX_OVERFLOW
+    assert data["counters"]["db_pool_checkouts_total"] > 0
+    assert data["timings"]["db_pool_checkout_seconds"]["count"] > 0
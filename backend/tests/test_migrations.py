@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+from sqlalchemy import create_engine, inspect
+
+from app.db import migrations
+from app.models.base import Base
+
+
+def test_upgrade_from_empty_database_builds_the_model_schema():
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'migrations.db')}")
+    assert migrations.upgrade(engine) == [revision for revision, _, _ in migrations.MIGRATIONS]
+
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        assert inspector.has_table(table.name), table.name
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert columns == set(table.c.keys()), table.name
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        # Trigram indexes are PostgreSQL only
+        expected = {index.name for index in table.indexes if not index.name.endswith("_trgm")}
+        assert expected <= indexes, (table.name, expected - indexes)
+        foreign_keys = {(tuple(fk["constrained_columns"]), fk["referred_table"]) for fk in inspector.get_foreign_keys(table.name)}
+        expected = {((fk.parent.name,), fk.column.table.name) for fk in table.foreign_keys}
+        assert foreign_keys == expected, table.name
+
+    # Already at head: nothing left to apply
+    assert migrations.upgrade(engine) == []
+
+
+def test_baseline_leaves_later_tables_to_their_migrations():
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'baseline.db')}")
+    migrations.upgrade(engine, target=1)
+
+    inspector = inspect(engine)
+    assert not inspector.has_table("maintenance_schedules")
+    assert not inspector.has_table("data_versions")
+    assert "schedule_id" not in {column["name"] for column in inspector.get_columns("maintenance_requests")}
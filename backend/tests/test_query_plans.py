@@ -0,0 +1,26 @@
+import pytest
+
+import migrate
+from app.db.session import engine
+
+
+@pytest.fixture
+def conn(seed):
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # Tiny test tables would otherwise always be scanned
+            conn.exec_driver_sql("SET enable_seqscan = off")
+        yield conn
+
+
+@pytest.mark.parametrize("name", list(migrate.hot_queries()))
+def test_hot_query_uses_an_index(conn, name):
+    plan = migrate.explain_plan(conn, migrate.hot_queries()[name])
+    assert not migrate.full_scans(conn.dialect.name, plan), plan
+
+
+@pytest.mark.parametrize("name", ["overdue", "next overdue"])
+def test_open_request_queries_match_the_partial_index(conn, name):
+    # The predicate is stage IN ('NEW', 'IN_PROGRESS'); a bound stage list can't be matched
+    plan = migrate.explain_plan(conn, migrate.hot_queries()[name])
+    assert any("ix_maintenance_requests_open_scheduled" in line for line in plan), plan
@@ -0,0 +1,72 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, event
+
+from app.db.session import engine
+from app.models.base import MaintenanceRequest, MaintenanceStage, RequestType
+from app.services.report_logic import MEASURES, pivot_statement, pivot_data, parse_group_by
+from app.services.rollup_logic import rebuild_rollups
+
+STAGES = list(MaintenanceStage)
+
+
+@pytest.fixture
+def report_requests(db, seed):
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    db.add_all([
+        MaintenanceRequest(
+            id=uuid.uuid4(), subject=f"Report request {i}", company_id=seed.company_id,
+            team_id=seed.team_id, category_id=seed.category_id, created_by_id=seed.manager_id,
+            request_type=RequestType.PREVENTIVE if i % 2 else RequestType.CORRECTIVE,
+            stage=STAGES[i % len(STAGES)], duration=i % 5,
+            created_at=today - timedelta(days=i % 10, hours=i % 7),
+            scheduled_date=today - timedelta(days=i % 4 - 1) if i % 3 else None,
+            updated_at=today - timedelta(hours=i % 9),
+        )
+        for i in range(60)
+    ])
+    db.commit()
+    rebuild_rollups(db, [seed.company_id])
+    yield today
+    db.execute(delete(MaintenanceRequest).where(MaintenanceRequest.subject.like("Report request %")))
+    db.commit()
+    rebuild_rollups(db, [seed.company_id])
+
+
+# What frontend/src/features/reporting/hooks/use-reporting-data.ts asks for
+FRONTEND_QUERIES = [("team", True), ("category", True), ("", True), ("", False)]
+
+
+@pytest.mark.parametrize("group_by,ranged", FRONTEND_QUERIES)
+def test_frontend_reports_read_the_rollup(client, auth_headers, db, seed, report_requests, group_by, ranged):
+    today = report_requests
+    params = {"groupBy": group_by}
+    if ranged:
+        # reports-service.ts sends whole days, the end day included
+        start, end = today - timedelta(days=7), today + timedelta(days=1)
+        params.update(start=f"{start:%Y-%m-%d}", end=f"{end:%Y-%m-%d}")
+    else:
+        start = end = None
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/v1/reports/pivot", params=params, headers=auth_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+
+    # Groups and counts from the rollup; the raw table only for overdue and completion time
+    assert any("FROM request_daily_rollups" in statement for statement in statements)
+    raw_reads = [statement for statement in statements if "FROM maintenance_requests" in statement]
+    assert len(raw_reads) == 1
+    assert "AS overdue" in raw_reads[0] and "AS count" not in raw_reads[0]
+
+    dimensions, bucket = parse_group_by(group_by)
+    result = db.execute(pivot_statement(seed.company_id, dimensions, bucket, db.get_bind().dialect.name, start, end, MEASURES))
+    assert response.json()["data"] == pivot_data(result.all(), dimensions, bucket, list(result.keys()))
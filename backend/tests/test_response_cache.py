@@ -0,0 +1,45 @@
+import asyncio
+import threading
+
+from app.core.cache import LocalCacheBackend, RedisCacheBackend, ResponseCache
+
+
+class RecordingClient:
+    """redis-py shaped stand-in that remembers which thread called it."""
+
+    def __init__(self):
+        self.values = {}
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.threads.add(threading.get_ident())
+        self.values[key] = value
+
+
+def test_local_backend_hands_out_copies():
+    cache = ResponseCache("test", LocalCacheBackend(max_entries=10, ttl_seconds=60), ttl_seconds=60)
+    data = {"counts": {"open": 1}}
+    cache.set("key", data)
+    data["counts"]["open"] = 2
+
+    first = cache.get("key")
+    first["counts"]["open"] = 3
+    assert cache.get("key") == {"counts": {"open": 1}}
+
+
+def test_async_access_keeps_blocking_backends_off_the_event_loop():
+    client = RecordingClient()
+    cache = ResponseCache("test", RedisCacheBackend(client), ttl_seconds=60)
+
+    async def roundtrip():
+        loop_thread = threading.get_ident()
+        await cache.set_async("key", {"open": 1})
+        return loop_thread, await cache.get_async("key")
+
+    loop_thread, value = asyncio.run(roundtrip())
+    assert value == {"open": 1}
+    assert client.threads and loop_thread not in client.threads
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from app.models.base import Equipment
+from app.services.rollup_logic import rebuild_rollups, check_rollups
+
+
+def test_writes_keep_the_rollup_in_step(client, auth_headers, db, seed):
+    rebuild_rollups(db, [seed.company_id])
+    equipment = db.execute(
+        select(Equipment.id).where(Equipment.company_id == seed.company_id).order_by(Equipment.name)
+    ).scalars().all()[:3]
+    requests_path = "/api/v1/maintenance/requests"
+
+    def post(path, body):
+        response = client.post(path, json=body, headers=auth_headers)
+        assert response.status_code in (200, 201), response.text
+        return response.json()["data"]
+
+    def send(method, path, body=None):
+        response = client.request(method, path, json=body, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        return response.json()["data"]
+
+    schedule = None
+    try:
+        # Single and bulk create
+        single = post(requests_path, {"subject": "Rollup single", "equipmentId": str(equipment[0]), "duration": "02:00"})
+        bulk = post(f"{requests_path}/bulk", {"items": [
+            {"subject": f"Rollup bulk {i}", "equipmentId": str(equipment[i % 3]), "duration": f"0{i}:30",
+             "maintenanceType": "preventive" if i % 2 else "corrective"}
+            for i in range(6)
+        ]})
+        bulk_ids = [str(item["id"]) for item in bulk["created"]]
+
+        # Stage moves, one at a time and in bulk, then scrap
+        send("PATCH", f"{requests_path}/{single['id']}", {"status": "in-progress"})
+        send("PATCH", f"{requests_path}/bulk", {"ids": bulk_ids[:4], "changes": {"status": "completed"}})
+        send("PATCH", f"{requests_path}/{bulk_ids[4]}", {"status": "scrap"})
+
+        # Soft delete, one at a time and in bulk
+        send("DELETE", f"{requests_path}/{single['id']}")
+        send("DELETE", f"{requests_path}/bulk", {"ids": bulk_ids[:2]})
+
+        # Schedule generation
+        schedule = post("/api/v1/maintenance/schedules", {
+            "subject": "Rollup schedule", "equipmentId": str(equipment[0]), "frequency": "weekly",
+            "startsAt": f"{datetime.utcnow():%Y-%m-%dT08:00:00}", "duration": 3
+        })
+        assert post("/api/v1/maintenance/schedules/generate", {
+            "horizonDays": 30, "scheduleIds": [schedule["id"]]
+        })["created"] > 0
+
+        assert check_rollups(db, [seed.company_id]) == []
+    finally:
+        if schedule:
+            client.delete(f"/api/v1/maintenance/schedules/{schedule['id']}", headers=auth_headers)
+        # Scrapping marks the equipment unusable
+        db.execute(update(Equipment).where(Equipment.id.in_(equipment)).values(is_unusable=False))
+        db.commit()
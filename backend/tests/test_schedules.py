@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.models.base import Equipment
+
+
+def test_generate_counts_add_up_on_rerun(client, auth_headers, db, seed):
+    equipment_id = db.execute(select(Equipment.id).where(Equipment.company_id == seed.company_id)).scalars().first()
+    schedule = client.post("/api/v1/maintenance/schedules", json={
+        "subject": "Weekly inspection", "equipmentId": str(equipment_id),
+        "frequency": "weekly", "startsAt": f"{datetime.utcnow():%Y-%m-%dT08:00:00}"
+    }, headers=auth_headers).json()["data"]
+    generate = {"horizonDays": 60, "scheduleIds": [schedule["id"]]}
+
+    try:
+        first = client.post("/api/v1/maintenance/schedules/generate", json=generate, headers=auth_headers).json()["data"]
+        assert first["created"] == first["occurrences"] > 0
+        assert first["existing"] == 0
+
+        again = client.post("/api/v1/maintenance/schedules/generate", json=generate, headers=auth_headers).json()["data"]
+        assert again["occurrences"] == first["occurrences"]
+        assert again["created"] == 0
+        assert again["existing"] == again["occurrences"]
+    finally:
+        client.delete(f"/api/v1/maintenance/schedules/{schedule['id']}", headers=auth_headers)
@@ -0,0 +1,12 @@
+def test_query_without_indexable_term_returns_no_hits(client, auth_headers):
+    response = client.get("/api/v1/search", params={"q": "ma 0"}, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["hits"] == []
+    assert data["counts"] == {"request": 0, "equipment": 0, "team": 0, "user": 0}
+
+
+def test_short_words_are_ignored_next_to_indexable_ones(client, auth_headers):
+    response = client.get("/api/v1/search", params={"q": "machine 0", "types": "equipment"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["data"]["counts"]["equipment"] == 5
@@ -0,0 +1,23 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.deps import get_stream_principal
+from app.core.security import create_access_token
+
+
+def test_stream_ticket_opens_streams_only(client, auth_headers, seed):
+    response = client.post("/api/v1/maintenance/requests/events/ticket", headers=auth_headers)
+    assert response.status_code == 200
+    ticket = response.json()["data"]["ticket"]
+
+    assert get_stream_principal(header_token=None, ticket=ticket).id == seed.manager_id
+    # Not a bearer token for the rest of the API
+    assert client.get("/api/v1/maintenance/requests", headers={"Authorization": f"Bearer {ticket}"}).status_code == 401
+
+
+def test_stream_rejects_access_token_in_query_string(seed):
+    with pytest.raises(HTTPException) as exc:
+        get_stream_principal(header_token=None, ticket=create_access_token(seed.manager_id))
+    assert exc.value.status_code == 401
+
+    assert get_stream_principal(header_token=create_access_token(seed.manager_id), ticket=None).id == seed.manager_id
@@ -1,7 +1,7 @@
+import { reportsService, pivotRows, type PivotResult } from '@/services/reports-service'
 import { useEquipmentStore } from '@/stores/equipment-store'
-import { useMaintenanceStore } from '@/stores/maintenance-store'
 import { useTeamsStore } from '@/stores/teams-store'
-import { useMemo, useState } from 'react'
+import { useEffect, useMemo, useState } from 'react'
 
 export interface TeamWorkloadMetric {
   teamId: string
@@ -40,46 +40,49 @@ export function useReportingData() {
     return { start, end }
   })
 
-  const requests = useMaintenanceStore((state) => state.requests)
   const equipment = useEquipmentStore((state) => state.equipment)
   const teams = useTeamsStore((state) => state.teams)
 
-  // Filter requests by date range
-  const filteredRequests = useMemo(() => {
-    return requests.filter((req) => {
-      if (!req.isActive) return false
-      const reqDate = new Date(req.createdAt)
-      return reqDate >= dateRange.start && reqDate <= dateRange.end
-    })
-  }, [requests, dateRange])
+  // Request metrics are aggregated by the backend (GET /reports/pivot)
+  const [byTeam, setByTeam] = useState<PivotResult | null>(null)
+  const [byCategory, setByCategory] = useState<PivotResult | null>(null)
+  const [inRange, setInRange] = useState<PivotResult | null>(null)
+  const [allTime, setAllTime] = useState<PivotResult | null>(null)
+
+  useEffect(() => {
+    const range = { start: dateRange.start, end: dateRange.end }
+    Promise.all([
+      reportsService.getPivot({ groupBy: ['team'], ...range }),
+      reportsService.getPivot({ groupBy: ['category'], ...range }),
+      reportsService.getPivot({ groupBy: [], ...range }),
+    ])
+      .then(([team, category, totals]) => {
+        setByTeam(team)
+        setByCategory(category)
+        setInRange(totals)
+      })
+      .catch((error) => console.error('Failed to load report data:', error))
+  }, [dateRange])
+
+  useEffect(() => {
+    // Overdue is reported over all requests, not just the selected range
+    reportsService
+      .getPivot({ groupBy: [] })
+      .then(setAllTime)
+      .catch((error) => console.error('Failed to load report data:', error))
+  }, [])
 
   // Calculate team workload
   const teamWorkload = useMemo((): TeamWorkloadMetric[] => {
-    return teams.map((team) => {
-      const teamRequests = filteredRequests.filter((req) => req.teamId === team.id)
-      const totalRequests = teamRequests.length
-      const activeRequests = teamRequests.filter((req) => req.status === 'in-progress').length
-      const completedRequests = teamRequests.filter((req) => req.status === 'completed').length
-      const overdueRequests = teamRequests.filter((req) => {
-        if (req.status === 'completed' || !req.scheduledDate) return false
-        const scheduled = new Date(req.scheduledDate)
-        return scheduled < new Date()
-      }).length
+    const rows = new Map(byTeam ? pivotRows(byTeam).map((row) => [row.teamId, row]) : [])
 
-      // Calculate average completion time (using updatedAt as completion date)
-      const completedWithDates = teamRequests.filter(
-        (req) => req.status === 'completed' && req.scheduledDate
-      )
-      const avgCompletionTime =
-        completedWithDates.length > 0
-          ? completedWithDates.reduce((sum, req) => {
-              if (!req.scheduledDate) return sum
-              const start = new Date(req.scheduledDate)
-              const end = new Date(req.updatedAt)
-              const days = (end.getTime() - start.getTime()) / (1000 * 60 * 60 * 24)
-              return sum + Math.max(0, days)
-            }, 0) / completedWithDates.length
-          : 0
+    return teams.map((team) => {
+      const row = rows.get(team.id)
+      const totalRequests = Number(row?.count ?? 0)
+      const activeRequests = Number(row?.inProgress ?? 0)
+      const completedRequests = Number(row?.completed ?? 0)
+      const overdueRequests = Number(row?.overdue ?? 0)
+      const avgCompletionTime = Number(row?.avgCompletionDays ?? 0)
 
       // Determine workload level
       let workloadLevel: 'healthy' | 'busy' | 'overloaded' = 'healthy'
@@ -93,47 +96,32 @@ export function useReportingData() {
         activeRequests,
         completedRequests,
         overdueRequests,
-        avgCompletionTime: Math.round(avgCompletionTime * 10) / 10,
+        avgCompletionTime,
         workloadLevel,
       }
     })
-  }, [teams, filteredRequests])
+  }, [teams, byTeam])
 
   // Calculate category distribution
   const categoryDistribution = useMemo((): CategoryMetric[] => {
-    const categoryMap = new Map<string, number>()
-
-    filteredRequests.forEach((req) => {
-      const equip = equipment.find((e) => e.id === req.equipmentId)
-      if (equip) {
-        const count = categoryMap.get(equip.category) || 0
-        categoryMap.set(equip.category, count + 1)
-      }
-    })
-
-    const total = filteredRequests.length || 1 // Avoid division by zero
-    const metrics: CategoryMetric[] = Array.from(categoryMap.entries()).map(
-      ([categoryName, count], index) => ({
-        categoryId: categoryName,
-        categoryName,
-        requestCount: count,
-        percentage: Math.round((count / total) * 100),
-        trend: 'stable' as const, // TODO: Calculate trend when we have historical data
-        color: COLORS[index % COLORS.length],
-      })
-    )
+    if (!byCategory) return []
+
+    const rows = pivotRows(byCategory)
+    const total = rows.reduce((sum, row) => sum + Number(row.count), 0) || 1 // Avoid division by zero
+    const metrics: CategoryMetric[] = rows.map((row, index) => ({
+      categoryId: String(row.categoryId),
+      categoryName: String(row.categoryName ?? 'General'),
+      requestCount: Number(row.count),
+      percentage: Math.round((Number(row.count) / total) * 100),
+      trend: 'stable' as const, // TODO: Calculate trend when we have historical data
+      color: COLORS[index % COLORS.length],
+    }))
 
     return metrics.sort((a, b) => b.requestCount - a.requestCount)
-  }, [filteredRequests, equipment])
+  }, [byCategory])
 
   // Calculate overdue count
-  const overdueCount = useMemo(() => {
-    return requests.filter((req) => {
-      if (!req.isActive || req.status === 'completed' || !req.scheduledDate) return false
-      const scheduled = new Date(req.scheduledDate)
-      return scheduled < new Date()
-    }).length
-  }, [requests])
+  const overdueCount = Number(allTime?.columns.overdue?.[0] ?? 0)
 
   // Calculate scrapped trend (last 12 months)
   const scrappedTrend = useMemo((): MonthlyScrapData[] => {
@@ -166,30 +154,15 @@ export function useReportingData() {
 
   // Summary metrics
   const summaryMetrics = useMemo(() => {
-    const totalRequests = filteredRequests.length
-    const activeRequests = filteredRequests.filter((req) => req.status === 'in-progress').length
-    
-    const completedWithDates = filteredRequests.filter(
-      (req) => req.status === 'completed' && req.scheduledDate
-    )
-    const avgCompletionTime =
-      completedWithDates.length > 0
-        ? completedWithDates.reduce((sum, req) => {
-            if (!req.scheduledDate) return sum
-            const start = new Date(req.scheduledDate)
-            const end = new Date(req.updatedAt)
-            const days = (end.getTime() - start.getTime()) / (1000 * 60 * 60 * 24)
-            return sum + Math.max(0, days)
-          }, 0) / completedWithDates.length
-        : 0
+    const totals = inRange ? pivotRows(inRange)[0] : undefined
 
     return {
-      totalRequests,
-      activeRequests,
+      totalRequests: Number(totals?.count ?? 0),
+      activeRequests: Number(totals?.inProgress ?? 0),
       overdueRequests: overdueCount,
-      avgCompletionTime: Math.round(avgCompletionTime * 10) / 10,
+      avgCompletionTime: Number(totals?.avgCompletionDays ?? 0),
     }
-  }, [filteredRequests, overdueCount])
+  }, [inRange, overdueCount])
 
   return {
     dateRange,
@@ -2,6 +2,16 @@
 import api from '@/lib/api'
 import type { MaintenancePriority, MaintenanceRequest, MaintenanceStatus } from '@/stores/maintenance-store'
 
+export interface RequestChangeEvent {
+  seq: number
+  action: 'created' | 'updated' | 'deleted'
+  id: string
+  teamId: string | null
+  status: string
+  isActive: boolean
+  at: string
+}
+
 // Priority mapping: Frontend (string) ↔ Backend (number)
 const PRIORITY_MAP: Record<MaintenancePriority, number> = {
   low: 1,
@@ -121,6 +131,120 @@ export const maintenanceService = {
     }
   },
 
+  // Get scheduled preventive requests in [start, end) for the calendar
+  async getCalendarEvents(start: Date, end: Date, filters?: { teamId?: string; technicianId?: string }) {
+    const params = new URLSearchParams()
+    params.append('start', start.toISOString())
+    params.append('end', end.toISOString())
+    if (filters?.teamId) {
+      params.append('teamId', filters.teamId)
+    }
+    if (filters?.technicianId) {
+      params.append('technicianId', filters.technicianId)
+    }
+
+    const response = await api.get(`/maintenance/requests/calendar?${params.toString()}`)
+    return response.data.data.events as Array<{
+      id: string
+      subject: string
+      scheduledDate: string
+      duration: number | null
+      priority: MaintenancePriority
+      status: string
+      equipmentId: string | null
+      technicianId: string | null
+    }>
+  },
+
+  // Requests created, updated or deleted (isActive: false) since the last sync.
+  // Keep calling with nextToken while hasMore; rows may repeat, upsert by id.
+  async getChanges(since?: string, limit?: number) {
+    const params = new URLSearchParams()
+    if (since) params.append('since', since)
+    if (limit) params.append('limit', String(limit))
+
+    const response = await api.get(`/maintenance/requests/changes?${params.toString()}`)
+    return response.data.data as { requests: any[]; nextToken: string; hasMore: boolean }
+  },
+
+  // Download every matching request (streamed by the backend) as CSV or NDJSON
+  async exportRequests(format: 'csv' | 'ndjson' = 'csv', filters?: Omit<MaintenanceFilters, 'page' | 'limit'>) {
+    const params = new URLSearchParams({ format })
+    if (filters?.status) params.append('status', filters.status)
+    if (filters?.priority) params.append('priority', filters.priority)
+    if (filters?.equipmentId) params.append('equipmentId', filters.equipmentId)
+    if (filters?.teamId) params.append('teamId', filters.teamId)
+    if (filters?.isActive !== undefined) params.append('isActive', String(filters.isActive))
+
+    const response = await api.get(`/maintenance/requests/export?${params.toString()}`, { responseType: 'blob' })
+    return response.data as Blob
+  },
+
+  // Live board updates (server-sent events). `since` is the last seen seq;
+  // on a "reset" event the list must be refetched.
+  // EventSource can't send the Authorization header, so each connection opens
+  // with a short-lived stream ticket instead of the access token (URLs end up
+  // in proxy logs). The ticket may have expired by the time the browser
+  // retries, so reconnects are done here with a fresh one.
+  subscribeToChanges(
+    handlers: {
+      onChange: (event: RequestChangeEvent) => void
+      onReset?: (seq: number) => void
+      onReady?: (seq: number) => void
+    },
+    options?: { teamId?: string; since?: number }
+  ) {
+    let source: EventSource | null = null
+    let retryTimer: ReturnType<typeof setTimeout> | undefined
+    let closed = false
+    let lastSeq = options?.since
+
+    const connect = async () => {
+      try {
+        const response = await api.post('/maintenance/requests/events/ticket')
+        if (closed) return
+
+        const params = new URLSearchParams()
+        params.append('ticket', response.data.data.ticket)
+        if (options?.teamId) params.append('teamId', options.teamId)
+        if (lastSeq !== undefined) params.append('since', String(lastSeq))
+
+        source = new EventSource(`${api.defaults.baseURL}/maintenance/requests/events?${params.toString()}`)
+        source.addEventListener('change', (e) => {
+          const event: RequestChangeEvent = JSON.parse((e as MessageEvent).data)
+          lastSeq = event.seq
+          handlers.onChange(event)
+        })
+        source.addEventListener('reset', (e) => {
+          lastSeq = JSON.parse((e as MessageEvent).data).seq
+          handlers.onReset?.(lastSeq as number)
+        })
+        source.addEventListener('ready', (e) => {
+          lastSeq = JSON.parse((e as MessageEvent).data).seq
+          handlers.onReady?.(lastSeq as number)
+        })
+        source.onerror = () => {
+          source?.close()
+          reconnect()
+        }
+      } catch {
+        reconnect()
+      }
+    }
+
+    const reconnect = () => {
+      if (closed) return
+      retryTimer = setTimeout(connect, 3000) // same delay as the server's `retry:`
+    }
+
+    connect()
+    return () => {
+      closed = true
+      clearTimeout(retryTimer)
+      source?.close()
+    }
+  },
+
   // Get single maintenance request
   async getRequest(id: string) {
     const response = await api.get(`/maintenance/requests/${id}`)
@@ -0,0 +1,47 @@
+import api from '@/lib/api'
+
+export type PivotDimension = 'team' | 'category' | 'stage' | 'requestType' | 'technician'
+export type PivotBucket = 'day' | 'week' | 'month'
+
+export interface PivotResult {
+  groupBy: string[]
+  rowCount: number
+  // Column name -> one value per grouped row
+  columns: Record<string, Array<string | number | null>>
+}
+
+// Calendar day as YYYY-MM-DD (local date, no time part)
+function formatDay(date: Date): string {
+  const pad = (n: number) => String(n).padStart(2, '0')
+  return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}`
+}
+
+export const reportsService = {
+  // Aggregated request counts grouped on the server. The range is sent as
+  // whole days (start day up to and including the end day), which the
+  // server answers from its daily rollups instead of scanning requests.
+  async getPivot(filters: {
+    groupBy: Array<PivotDimension | PivotBucket>
+    start?: Date
+    end?: Date
+  }): Promise<PivotResult> {
+    const params = new URLSearchParams()
+    params.append('groupBy', filters.groupBy.join(','))
+    if (filters.start) params.append('start', formatDay(filters.start))
+    if (filters.end) {
+      const dayAfter = new Date(filters.end)
+      dayAfter.setDate(dayAfter.getDate() + 1)
+      params.append('end', formatDay(dayAfter))
+    }
+
+    const response = await api.get(`/reports/pivot?${params.toString()}`)
+    return response.data.data
+  },
+}
+
+// Turn the columnar payload into one object per row
+export function pivotRows(result: PivotResult): Array<Record<string, string | number | null>> {
+  return Array.from({ length: result.rowCount }, (_, i) =>
+    Object.fromEntries(Object.entries(result.columns).map(([name, values]) => [name, values[i]]))
+  )
+}
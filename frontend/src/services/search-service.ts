@@ -0,0 +1,30 @@
+import api from '@/lib/api'
+
+export type SearchType = 'request' | 'equipment' | 'team' | 'user'
+
+export interface SearchHit {
+  type: SearchType
+  id: string
+  title: string
+  subtitle: string | null
+  score: number
+}
+
+export interface SearchResult {
+  query: string
+  // Best first, across all types
+  hits: SearchHit[]
+  counts: Partial<Record<SearchType, number>>
+}
+
+export const searchService = {
+  // One call for requests, equipment, teams and users (ranked on the server)
+  async search(q: string, options?: { types?: SearchType[]; limit?: number }): Promise<SearchResult> {
+    const params = new URLSearchParams({ q })
+    if (options?.types?.length) params.append('types', options.types.join(','))
+    if (options?.limit) params.append('limit', String(options.limit))
+
+    const response = await api.get(`/search?${params.toString()}`)
+    return response.data.data
+  },
+}